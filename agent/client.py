@@ -5,21 +5,35 @@ from claude_agent_sdk import ClaudeSDKClient, ClaudeAgentOptions, create_sdk_mcp
 from typing import Optional, AsyncIterator, Dict, Any
 import uuid
 import json
+import time
 from .memory import MemoryManager
+from .permissions import PermissionPolicy, PromptFn, terminal_prompt, ALLOW
+from .events import Event, normalize, TEXT, TOOL_USE, TOOL_RESULT, RESULT, SYSTEM
+from .pipeline import StreamPipeline, SPILL, DROP
+from .tracing import tracer, trace_tools, current_session
 from .prompts import get_system_prompt
+from .replay import StreamRecorder
 from tools.research import ResearchTools
+from tools.parse_pool import shared_pool
 from tools.memory import MemoryTools
 from tools.google_services import GoogleTools
 
 
 class AssistantClient:
-    def __init__(self, session_id: Optional[str] = None, resume: bool = False):
+    def __init__(self, session_id: Optional[str] = None, resume: bool = False,
+                 record_to: Optional[str] = None,
+                 permission_prompt: Optional[PromptFn] = terminal_prompt):
         self.memory = MemoryManager()
         self.session_id = session_id  # Our custom session ID for DB tracking
         self.claude_session_id: Optional[str] = None  # Claude SDK's session ID for transcripts
         self.resume = resume
         self.client: Optional[ClaudeSDKClient] = None
         self.research_tools = None
+        self.record_to = record_to  # Optional fixture file capturing SDK streams
+        self.permission_prompt = permission_prompt  # None = headless, deny unapproved Bash
+        self.permissions: Optional[PermissionPolicy] = None
+        self.persist_queue_size = 256
+        self._pending_pipeline: Optional[StreamPipeline] = None
 
     async def initialize(self):
         """Initialize memory and determine session"""
@@ -41,30 +55,14 @@ class AssistantClient:
 
     async def _permission_handler(self, tool_name: str, input_data: Dict[str, Any],
                                   context: Any) -> Dict[str, Any]:
-        """Custom permission handler with terminal prompts"""
-        # Auto-approve MCP tools (our custom tools)
-        if tool_name.startswith("mcp__"):
-            return {"behavior": "allow", "updatedInput": input_data}
+        """Permission handler backed by the rule engine (never blocks the loop)"""
+        if self.permissions is None:
+            self.permissions = PermissionPolicy(self.memory, prompt=self.permission_prompt)
 
-        # Prompt for Bash commands
-        if tool_name == "Bash":
-            command = input_data.get("command", "")
-            print(f"\n{'='*60}")
-            print(f"[PERMISSION] Bash command requested:")
-            print(f"  {command}")
-            print(f"{'='*60}")
-
-            while True:
-                response = input("Approve? (y/n): ").strip().lower()
-                if response in ('y', 'yes'):
-                    return {"behavior": "allow", "updatedInput": input_data}
-                elif response in ('n', 'no'):
-                    return {"behavior": "deny", "message": "User denied bash execution"}
-                else:
-                    print("[WARN] Please enter 'y' or 'n'")
-
-        # Auto-approve other tools (Read, Write, Edit, etc.)
-        return {"behavior": "allow", "updatedInput": input_data}
+        decision = await self.permissions.decide(tool_name, input_data, self.session_id)
+        if decision == ALLOW:
+            return {"behavior": "allow", "updatedInput": input_data}
+        return {"behavior": "deny", "message": f"{tool_name} denied by permission policy"}
 
     async def setup_client(self) -> ClaudeSDKClient:
         """Configure and create SDK client with tools"""
@@ -73,7 +71,7 @@ class AssistantClient:
         custom_memories = await self.memory.get_all_memories_formatted()
 
         # Initialize tool instances
-        self.research_tools = ResearchTools(self.memory, self.session_id)
+        self.research_tools = ResearchTools(self.memory, self.session_id, parse_pool=shared_pool())
         memory_tools = MemoryTools(self.memory, self.session_id)
         google_tools = GoogleTools()
 
@@ -82,6 +80,7 @@ class AssistantClient:
         all_tools.extend(self.research_tools.get_tools())
         all_tools.extend(memory_tools.get_tools())
         all_tools.extend(google_tools.get_tools())
+        trace_tools(all_tools)
 
         # Create MCP server with tools
         mcp_server = create_sdk_mcp_server(
@@ -109,6 +108,10 @@ class AssistantClient:
                 # Research
                 "mcp__assistant__web_search",
                 "mcp__assistant__fetch_url",
+                "mcp__assistant__fetch_urls",
+                "mcp__assistant__read_page",
+                "mcp__assistant__search_fetched",
+                "mcp__assistant__crawl_site",
                 "mcp__assistant__analyze_research",
                 # Google Services
                 "mcp__assistant__list_drive_files",
@@ -127,110 +130,200 @@ class AssistantClient:
                 "WebSearch"  # Built-in web search
             ],
             setting_sources=["user", "project"],  # Load skills from filesystem
-            can_use_tool=self._permission_handler,  # Custom permission handler with terminal prompts
+            can_use_tool=self._permission_handler,  # Rule engine with async terminal prompts
             cwd="."
             # Note: ClaudeSDKClient maintains conversation context automatically within same instance
         )
 
         return ClaudeSDKClient(options=options)
 
-    async def send_message(self, prompt: str) -> AsyncIterator[Dict[str, Any]]:
-        """Send message and stream responses"""
-        try:
-            if not self.client:
-                self.client = await self.setup_client()
-                # Connect on first use only
-                await self.client.connect()
-
-            # Save user message
-            await self.memory.save_message(self.session_id, "user", prompt)
-
-            # Get previous cost to calculate delta
-            session_stats = await self.memory.get_session_stats(self.session_id)
-            previous_cost = session_stats['total_cost_usd'] if session_stats else 0.0
+    async def send_message(self, prompt: str) -> AsyncIterator[Event]:
+        """Send message and stream typed events
+
+        Each SDK message is normalized once into events (see agent.events);
+        events are yielded to the caller as soon as they arrive. Persistence
+        runs in a background consumer fed through a bounded queue, so disk
+        speed never delays rendering.
+        """
+        # Previous turn must be fully persisted before this one starts
+        await self.flush()
+
+        if not self.client:
+            self.client = await self.setup_client()
+            # Connect on first use only
+            await self.client.connect()
+            if self.record_to:
+                self.client = StreamRecorder(self.client, self.record_to)
+
+        pipeline = StreamPipeline()
+        persister = _TurnPersister(self.memory, self.session_id, prompt)
+        pipeline.add_consumer(
+            "persistence",
+            persister.handle,
+            maxsize=self.persist_queue_size,
+            policy=SPILL,
+            on_close=persister.finish
+        )
+        turn_stats = _TurnTracer(self.memory)
+        pipeline.add_consumer(
+            "tracing",
+            turn_stats.handle,
+            maxsize=self.persist_queue_size,
+            policy=DROP,
+            on_close=turn_stats.finish
+        )
+        current_session.set(self.session_id)
+        pipeline.start()
+        self._pending_pipeline = pipeline
 
+        turn_start = time.perf_counter()
+        first_token = None
+        try:
             # Send query
             await self.client.query(prompt)
 
-            # Stream responses
-            assistant_response = []
-            tool_messages = []
-            last_cost = None
-
+            index = 0
             async for message in self.client.receive_response():
-                yield message
-
-                # Capture Claude's session ID on first message
-                if hasattr(message, 'session_id') and not self.claude_session_id:
-                    self.claude_session_id = message.session_id
-
-                # Save tool_use messages
-                if hasattr(message, 'type') and message.type == 'tool_use':
-                    tool_data = {
-                        'type': 'tool_use',
-                        'name': getattr(message, 'name', ''),
-                        'input': getattr(message, 'input', {})
-                    }
-                    tool_messages.append(json.dumps(tool_data))
-
-                # Save tool_result messages
-                elif hasattr(message, 'type') and message.type == 'tool_result':
-                    tool_data = {
-                        'type': 'tool_result',
-                        'content': getattr(message, 'content', '')
-                    }
-                    tool_messages.append(json.dumps(tool_data))
-
-                # Collect text responses
-                elif hasattr(message, 'content'):
-                    if isinstance(message.content, str):
-                        assistant_response.append(message.content)
-                    elif isinstance(message.content, list):
-                        for block in message.content:
-                            if hasattr(block, 'text'):
-                                assistant_response.append(block.text)
-
-                # Track last cost
-                if hasattr(message, 'total_cost_usd'):
-                    last_cost = message.total_cost_usd
-
-            # Update session with cost delta after response completes
-            if last_cost is not None:
-                cost_delta = last_cost - previous_cost
-                await self.memory.update_session(
-                    self.session_id,
-                    cost_usd=cost_delta,
-                    message_count=2  # user + assistant
-                )
-
-            # Save tool messages
-            for tool_msg in tool_messages:
-                await self.memory.save_message(
-                    self.session_id,
-                    "tool",
-                    tool_msg
-                )
-
-            # Save assistant response
-            if assistant_response:
-                await self.memory.save_message(
-                    self.session_id,
-                    "assistant",
-                    "\n".join(assistant_response)
-                )
+                for event in normalize(message, index):
+                    kind = event.kind
+                    if first_token is None and kind == TEXT:
+                        first_token = time.perf_counter()
+                        tracer.record("model.ttft", "model", (first_token - turn_start) * 1000)
+
+                    yield event
+
+                    # Capture Claude's session ID
+                    if not self.claude_session_id:
+                        if kind == RESULT:
+                            self.claude_session_id = event.session_id
+                        elif kind == SYSTEM:
+                            self.claude_session_id = event.data.get('session_id')
+
+                    await pipeline.publish(event)
+                index += 1
         finally:
-            # Cleanup happens in close() method
-            pass
+            turn_stats.duration_ms = (time.perf_counter() - turn_start) * 1000
+            # Consumers keep draining in the background
+            await pipeline.close()
+
+    async def flush(self):
+        """Wait until the last turn's messages are persisted"""
+        pipeline = self._pending_pipeline
+        if pipeline is not None:
+            self._pending_pipeline = None
+            await pipeline.join()
+            for consumer in pipeline.consumers:
+                for error in consumer.errors:
+                    print(f"[WARN] {consumer.name} consumer failed: {error}")
 
     async def get_session_summary(self) -> Optional[Dict[str, Any]]:
         """Get current session statistics"""
+        await self.flush()
         return await self.memory.get_session_stats(self.session_id)
 
+    async def get_perf_summary(self) -> list:
+        """Latency percentiles per component across all recorded traces"""
+        await self.flush()
+        await tracer.flush(self.memory)
+        return await self.memory.get_trace_percentiles()
+
     async def close(self):
         """Clean up resources"""
         try:
+            await self.flush()
             if self.client:
                 await self.client.disconnect()
         finally:
             if self.research_tools:
                 await self.research_tools.close()
+
+
+class _TurnTracer:
+    """Analytics consumer: records the turn span and flushes buffered spans"""
+
+    def __init__(self, memory: MemoryManager):
+        self.memory = memory
+        self.duration_ms = 0.0
+        self.output_bytes = 0
+        self.events = 0
+
+    async def handle(self, event: Event):
+        self.events += 1
+        if event.kind == TEXT:
+            self.output_bytes += len(event.text.encode('utf-8'))
+
+    async def finish(self):
+        tracer.record("model.turn", "model", self.duration_ms,
+                      bytes=self.output_bytes, events=self.events)
+        await tracer.flush(self.memory)
+
+
+class _TurnPersister:
+    """Persistence consumer for one conversation turn"""
+
+    def __init__(self, memory: MemoryManager, session_id: str, prompt: str):
+        self.memory = memory
+        self.session_id = session_id
+        self.prompt = prompt
+        self.previous_cost: Optional[float] = None
+        self.assistant_response = []
+        self.last_cost = None
+        self._started = False
+
+    async def _start(self):
+        self._started = True
+        # Save user message
+        await self.memory.save_message(self.session_id, "user", self.prompt)
+
+        # Get previous cost to calculate delta
+        session_stats = await self.memory.get_session_stats(self.session_id)
+        self.previous_cost = session_stats['total_cost_usd'] if session_stats else 0.0
+
+    async def handle(self, event: Event):
+        if not self._started:
+            await self._start()
+
+        kind = event.kind
+        if kind == TEXT:
+            # Injected user-role text (skill prompts) is not part of the reply
+            if event.role == "assistant":
+                self.assistant_response.append(event.text)
+
+        elif kind == TOOL_USE:
+            tool_data = {
+                'type': 'tool_use',
+                'name': event.name,
+                'input': event.input
+            }
+            await self.memory.save_message(self.session_id, "tool", json.dumps(tool_data))
+
+        elif kind == TOOL_RESULT:
+            tool_data = {
+                'type': 'tool_result',
+                'content': event.content
+            }
+            await self.memory.save_message(self.session_id, "tool", json.dumps(tool_data, default=str))
+
+        elif kind == RESULT:
+            self.last_cost = event.total_cost_usd
+
+    async def finish(self):
+        if not self._started:
+            await self._start()
+
+        # Update session with cost delta after response completes
+        if self.last_cost is not None:
+            cost_delta = self.last_cost - self.previous_cost
+            await self.memory.update_session(
+                self.session_id,
+                cost_usd=cost_delta,
+                message_count=2  # user + assistant
+            )
+
+        # Save assistant response
+        if self.assistant_response:
+            await self.memory.save_message(
+                self.session_id,
+                "assistant",
+                "\n".join(self.assistant_response)
+            )
@@ -0,0 +1,142 @@
+# ABOUTME: Typed stream events normalized once from SDK messages
+# ABOUTME: Compact __slots__ dataclasses every front end, persister and tracer dispatches on
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, Dict, List, Optional
+
+import claude_agent_sdk
+
+TEXT = "text"
+TOOL_USE = "tool_use"
+TOOL_RESULT = "tool_result"
+RESULT = "result"
+SYSTEM = "system"
+
+
+@dataclass(slots=True)
+class TextEvent:
+    """Text block; message_index groups blocks of one SDK message"""
+    kind: ClassVar[str] = TEXT
+    text: str
+    role: str = "assistant"
+    message_index: int = 0
+
+
+@dataclass(slots=True)
+class ToolUseEvent:
+    kind: ClassVar[str] = TOOL_USE
+    id: Optional[str]
+    name: str
+    input: Dict[str, Any]
+
+
+@dataclass(slots=True)
+class ToolResultEvent:
+    kind: ClassVar[str] = TOOL_RESULT
+    tool_use_id: Optional[str]
+    content: Any
+    is_error: bool = False
+
+
+@dataclass(slots=True)
+class ResultEvent:
+    """End of turn with cumulative cost"""
+    kind: ClassVar[str] = RESULT
+    total_cost_usd: Optional[float]
+    session_id: Optional[str] = None
+    is_error: bool = False
+    duration_ms: Optional[int] = None
+    usage: Optional[Dict[str, Any]] = None
+
+
+@dataclass(slots=True)
+class SystemEvent:
+    kind: ClassVar[str] = SYSTEM
+    subtype: str
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+Event = Any  # One of the event classes above
+
+
+def _blocks(content: Any, role: str, index: int) -> List[Event]:
+    events = []
+    for block in content:
+        if isinstance(block, claude_agent_sdk.TextBlock):
+            if block.text:
+                events.append(TextEvent(block.text, role, index))
+        elif isinstance(block, claude_agent_sdk.ToolUseBlock):
+            events.append(ToolUseEvent(block.id, block.name, block.input))
+        elif isinstance(block, claude_agent_sdk.ToolResultBlock):
+            events.append(ToolResultEvent(block.tool_use_id, block.content, bool(block.is_error)))
+        elif isinstance(block, dict):
+            if block.get("type") == "text" and block.get("text"):
+                events.append(TextEvent(block["text"], role, index))
+            elif block.get("type") == "tool_use":
+                events.append(ToolUseEvent(block.get("id"), block.get("name", ""), block.get("input", {})))
+            elif block.get("type") == "tool_result":
+                events.append(ToolResultEvent(block.get("tool_use_id"), block.get("content"),
+                                              bool(block.get("is_error"))))
+        elif getattr(block, "text", None):
+            events.append(TextEvent(block.text, role, index))
+    return events
+
+
+def _assistant(message, index: int) -> List[Event]:
+    return _blocks(message.content, "assistant", index)
+
+
+def _user(message, index: int) -> List[Event]:
+    if isinstance(message.content, str):
+        return [TextEvent(message.content, "user", index)] if message.content else []
+    return _blocks(message.content, "user", index)
+
+
+def _system(message, index: int) -> List[Event]:
+    return [SystemEvent(message.subtype, message.data or {})]
+
+
+def _result(message, index: int) -> List[Event]:
+    return [ResultEvent(message.total_cost_usd, message.session_id, message.is_error,
+                        message.duration_ms, message.usage)]
+
+
+_CONVERTERS: Dict[type, Callable[[Any, int], List[Event]]] = {
+    claude_agent_sdk.AssistantMessage: _assistant,
+    claude_agent_sdk.UserMessage: _user,
+    claude_agent_sdk.SystemMessage: _system,
+    claude_agent_sdk.ResultMessage: _result,
+}
+
+
+def _duck(message: Any, index: int) -> List[Event]:
+    """Fallback for objects that only look like SDK messages"""
+    events = []
+    content = getattr(message, "content", None)
+    if isinstance(content, str):
+        if content:
+            events.append(TextEvent(content, "assistant", index))
+    elif isinstance(content, list):
+        events.extend(_blocks(content, "assistant", index))
+    cost = getattr(message, "total_cost_usd", None)
+    if cost is not None:
+        events.append(ResultEvent(cost, getattr(message, "session_id", None)))
+    return events
+
+
+def normalize(message: Any, index: int = 0) -> List[Event]:
+    """Convert one SDK message into events (exact type lookup, no attribute probing)"""
+    converter = _CONVERTERS.get(type(message))
+    if converter is None:
+        if isinstance(message, claude_agent_sdk.StreamEvent):
+            return []
+        converter = _duck
+    return converter(message, index)
+
+
+def event_to_dict(event: Event) -> Dict[str, Any]:
+    """Plain dict with a "type" key (for JSON protocols)"""
+    data = {"type": event.kind}
+    for name in event.__slots__:
+        data[name] = getattr(event, name)
+    return data
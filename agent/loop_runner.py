@@ -0,0 +1,193 @@
+# ABOUTME: Long-lived asyncio loop on a background thread for synchronous front ends
+# ABOUTME: Runs coroutines, streams async generators to sync code, keeps clients alive across reruns
+
+import asyncio
+import concurrent.futures
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from .client import AssistantClient
+
+T = TypeVar("T")
+
+ClientFactory = Callable[[Optional[str]], Awaitable[AssistantClient]]
+
+
+async def default_client_factory(session_id: Optional[str]) -> AssistantClient:
+    """Web client: no terminal, so unapproved Bash commands are denied"""
+    client = AssistantClient(session_id=session_id, permission_prompt=None)
+    await client.initialize()
+    return client
+
+
+class _Done:
+    """End-of-stream marker"""
+
+
+class _Failed:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class BackgroundLoop:
+    """One event loop per process, owned by a daemon thread
+
+    Synchronous code (e.g. Streamlit reruns) submits work with run() and
+    stream(). The loop is never torn down between calls, so SDK clients
+    and HTTP connections created on it stay valid.
+    """
+
+    def __init__(self, name: str = "agent-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Run a coroutine on the loop and wait for its result"""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def stream(self, agen: AsyncIterator[T]) -> Iterator[T]:
+        """Iterate an async generator from synchronous code
+
+        Items are handed over as soon as the loop produces them. Closing
+        the returned iterator early (e.g. a Streamlit rerun) cancels the
+        producer on the loop.
+        """
+        # Unbounded: put() must never block the loop thread
+        items: queue.Queue = queue.Queue()
+
+        async def pump():
+            try:
+                async for item in agen:
+                    items.put(item)
+            except Exception as e:
+                items.put(_Failed(e))
+            else:
+                items.put(_Done())
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self.loop)
+        try:
+            while True:
+                item = items.get()
+                if isinstance(item, _Done):
+                    return
+                if isinstance(item, _Failed):
+                    raise item.error
+                yield item
+        finally:
+            future.cancel()
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+
+class ClientRegistry:
+    """Connected AssistantClients keyed by session id, living on one loop
+
+    Browser sessions are often abandoned without "New Session", so
+    clients unused for `idle_timeout` seconds, and the least recently
+    used beyond `max_clients`, are closed whenever get() runs. New
+    clients connect outside the registry lock; concurrent get() calls
+    for the same session wait on one pending future.
+    """
+
+    def __init__(self, runner: BackgroundLoop, factory: ClientFactory = default_client_factory,
+                 max_clients: int = 16, idle_timeout: float = 1800.0):
+        self.runner = runner
+        self.factory = factory
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        # Least recently used first
+        self._clients: "OrderedDict[str, AssistantClient]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        self._pending: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: Optional[str] = None) -> AssistantClient:
+        """Existing client for session_id, or a newly initialized one"""
+        with self._lock:
+            if session_id and session_id in self._clients:
+                self._clients.move_to_end(session_id)
+                self._last_used[session_id] = time.monotonic()
+                return self._clients[session_id]
+            pending = self._pending.get(session_id) if session_id else None
+            owner = pending is None
+            if owner:
+                pending = concurrent.futures.Future()
+                if session_id:
+                    self._pending[session_id] = pending
+
+        if not owner:
+            return pending.result()
+
+        try:
+            client = self.runner.run(self.factory(session_id))
+        except BaseException as e:
+            with self._lock:
+                self._pending.pop(session_id, None)
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            self._pending.pop(session_id, None)
+            self._clients[client.session_id] = client
+            self._clients.move_to_end(client.session_id)
+            self._last_used[client.session_id] = time.monotonic()
+            evicted = self._take_evictable(keep=client.session_id)
+        pending.set_result(client)
+        self._close_clients(evicted)
+        return client
+
+    def _take_evictable(self, keep: str) -> List[AssistantClient]:
+        """Remove idle and over-limit clients; caller holds the lock"""
+        cutoff = time.monotonic() - self.idle_timeout
+        evicted = []
+        for session_id in list(self._clients):
+            if session_id == keep:
+                continue
+            if len(self._clients) > self.max_clients or self._last_used[session_id] < cutoff:
+                evicted.append(self._clients.pop(session_id))
+                del self._last_used[session_id]
+        return evicted
+
+    def _close_clients(self, clients: List[AssistantClient]):
+        for client in clients:
+            try:
+                self.runner.run(client.close())
+            except Exception as e:
+                print(f"[WARN] Closing idle session {client.session_id[:8]} failed: {e}")
+
+    def evict_idle(self) -> int:
+        """Close clients idle longer than idle_timeout; returns how many"""
+        with self._lock:
+            evicted = self._take_evictable(keep="")
+        self._close_clients(evicted)
+        return len(evicted)
+
+    def close(self, session_id: str):
+        """Disconnect and forget a session's client"""
+        with self._lock:
+            client = self._clients.pop(session_id, None)
+            self._last_used.pop(session_id, None)
+        if client is not None:
+            self.runner.run(client.close())
+
+    def close_all(self):
+        for session_id in list(self._clients):
+            self.close(session_id)
+
+    def __len__(self) -> int:
+        return len(self._clients)
@@ -5,13 +5,16 @@ import aiosqlite
 import json
 from datetime import datetime, UTC
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, AsyncIterator
+from .tracing import traced, percentile_rank
 
 
 class MemoryManager:
     def __init__(self, db_path: str = "storage/agent.db"):
         self.db_path = db_path
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # Set by initialize() when SQLite has FTS5 with the trigram tokenizer
+        self.fts_enabled = False
 
     async def initialize(self):
         """Create database schema"""
@@ -37,6 +40,11 @@ class MemoryManager:
                 )
             """)
 
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_messages_session ON messages(session_id, id)
+            """)
+
+            await self._create_message_index(db)
 
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS research (
@@ -82,8 +90,75 @@ class MemoryManager:
                 CREATE INDEX IF NOT EXISTS idx_memory_category ON custom_memory(category)
             """)
 
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS permission_decisions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    tool_name TEXT NOT NULL,
+                    subject TEXT NOT NULL,
+                    decision TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    UNIQUE(tool_name, subject)
+                )
+            """)
+
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS traces (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT,
+                    component TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    started_at REAL NOT NULL,
+                    duration_ms REAL NOT NULL,
+                    bytes INTEGER DEFAULT 0,
+                    attributes TEXT
+                )
+            """)
+
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_traces_name_duration
+                ON traces(component, name, duration_ms)
+            """)
+
             await db.commit()
 
+    async def _create_message_index(self, db):
+        """Full-text index over message content, kept in sync by triggers
+
+        The trigram tokenizer keeps case-insensitive substring semantics
+        for queries of 3+ characters. Without FTS5 searches fall back to LIKE.
+        """
+        cursor = await db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'"
+        )
+        existed = await cursor.fetchone() is not None
+        try:
+            await db.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                    content, content='messages', content_rowid='id', tokenize='trigram'
+                )
+            """)
+        except aiosqlite.OperationalError:
+            self.fts_enabled = False
+            return
+
+        await db.executescript("""
+            CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+                INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+                INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS messages_fts_update AFTER UPDATE ON messages BEGIN
+                INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+                INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+            END;
+        """)
+        if not existed:
+            # Index messages written before the index existed
+            await db.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+        self.fts_enabled = True
+
+    @traced("db")
     async def create_session(self, session_id: str) -> str:
         """Create new session"""
         now = datetime.now(UTC).isoformat()
@@ -95,6 +170,7 @@ class MemoryManager:
             await db.commit()
         return session_id
 
+    @traced("db")
     async def get_last_session_id(self) -> Optional[str]:
         """Get most recent session ID"""
         async with aiosqlite.connect(self.db_path) as db:
@@ -104,6 +180,7 @@ class MemoryManager:
             row = await cursor.fetchone()
             return row[0] if row else None
 
+    @traced("db")
     async def update_session(self, session_id: str, cost_usd: float = 0.0, message_count: int = 0):
         """Update session stats"""
         now = datetime.now(UTC).isoformat()
@@ -118,6 +195,7 @@ class MemoryManager:
             )
             await db.commit()
 
+    @traced("db")
     async def save_message(self, session_id: str, role: str, content: str, message_type: str = "text"):
         """Save conversation message
 
@@ -135,6 +213,7 @@ class MemoryManager:
             )
             await db.commit()
 
+    @traced("db")
     async def get_session_history(self, session_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Retrieve conversation history"""
         async with aiosqlite.connect(self.db_path) as db:
@@ -152,6 +231,7 @@ class MemoryManager:
                 for r in reversed(rows)
             ]
 
+    @traced("db")
     async def list_all_sessions(self, limit: int = 20) -> List[Dict[str, Any]]:
         """List all sessions with metadata"""
         async with aiosqlite.connect(self.db_path) as db:
@@ -174,6 +254,7 @@ class MemoryManager:
                 for r in rows
             ]
 
+    @traced("db")
     async def search_all_messages(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
         """Search messages across all sessions"""
         async with aiosqlite.connect(self.db_path) as db:
@@ -198,7 +279,115 @@ class MemoryManager:
                 for r in rows
             ]
 
+    @traced("db")
+    async def get_messages(self, session_id: str, limit: int = 50, offset: int = 0,
+                           roles: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Page of a session's messages, oldest first
+
+        Args:
+            session_id: Session identifier
+            limit: Page size
+            offset: Messages to skip, counted back from the newest
+            roles: Only these roles (default: all)
+
+        Returns:
+            List of message dictionaries with id, timestamp, role, content
+        """
+        sql = "SELECT id, timestamp, role, content FROM messages WHERE session_id = ?"
+        params: List[Any] = [session_id]
+        if roles:
+            sql += f" AND role IN ({', '.join('?' for _ in roles)})"
+            params.extend(roles)
+        sql += " ORDER BY id DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(sql, params)
+            rows = await cursor.fetchall()
+            return [
+                {"id": r[0], "timestamp": r[1], "role": r[2], "content": r[3]}
+                for r in reversed(rows)
+            ]
+
+    async def iter_messages(self, session_id: str, batch_size: int = 500,
+                            roles: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a session's messages oldest first in bounded batches
+
+        Keyset pagination on id: memory stays at one batch whatever the
+        session size.
+        """
+        sql = "SELECT id, timestamp, role, content FROM messages WHERE session_id = ? AND id > ?"
+        role_params: List[Any] = []
+        if roles:
+            sql += f" AND role IN ({', '.join('?' for _ in roles)})"
+            role_params = list(roles)
+        sql += " ORDER BY id LIMIT ?"
+
+        last_id = 0
+        async with aiosqlite.connect(self.db_path) as db:
+            while True:
+                cursor = await db.execute(sql, [session_id, last_id, *role_params, batch_size])
+                rows = await cursor.fetchall()
+                for r in rows:
+                    yield {"id": r[0], "timestamp": r[1], "role": r[2], "content": r[3]}
+                if len(rows) < batch_size:
+                    return
+                last_id = rows[-1][0]
+
+    @traced("db")
+    async def search_messages(self, session_id: str, query: str, limit: int = 10,
+                              offset: int = 0) -> List[Dict[str, Any]]:
+        """Case-insensitive substring search within a session, newest first"""
+        if self.fts_enabled and len(query) >= 3:
+            sql = """SELECT m.id, m.timestamp, m.role, m.content
+                     FROM messages_fts f
+                     JOIN messages m ON m.id = f.rowid
+                     WHERE messages_fts MATCH ? AND m.session_id = ?
+                     ORDER BY m.id DESC
+                     LIMIT ? OFFSET ?"""
+            params = ('"' + query.replace('"', '""') + '"', session_id, limit, offset)
+        else:
+            sql = """SELECT id, timestamp, role, content
+                     FROM messages
+                     WHERE session_id = ? AND content LIKE ? ESCAPE '\\'
+                     ORDER BY id DESC
+                     LIMIT ? OFFSET ?"""
+            escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params = (session_id, f"%{escaped}%", limit, offset)
+
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(sql, params)
+            rows = await cursor.fetchall()
+            return [
+                {"id": r[0], "timestamp": r[1], "role": r[2], "content": r[3]}
+                for r in rows
+            ]
+
+    @traced("db")
+    async def get_message_stats(self, session_id: str) -> Dict[str, Any]:
+        """Per-role message counts and user/assistant character total"""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                """SELECT COUNT(*),
+                          COALESCE(SUM(role = 'user'), 0),
+                          COALESCE(SUM(role = 'assistant'), 0),
+                          COALESCE(SUM(role = 'tool'), 0),
+                          COALESCE(SUM(CASE WHEN role IN ('user', 'assistant')
+                                            THEN LENGTH(content) ELSE 0 END), 0)
+                   FROM messages
+                   WHERE session_id = ?""",
+                (session_id,)
+            )
+            row = await cursor.fetchone()
+            return {
+                "total_messages": row[0],
+                "user_messages": row[1],
+                "assistant_messages": row[2],
+                "tool_messages": row[3],
+                "total_characters": row[4]
+            }
 
+    @traced("db")
     async def save_research(self, query: str, sources: List[str],
                            analysis: str, session_id: Optional[str] = None) -> int:
         """Save research results"""
@@ -214,6 +403,7 @@ class MemoryManager:
             return cursor.lastrowid
 
 
+    @traced("db")
     async def save_document(self, filename: str, file_type: str, file_path: str,
                            description: Optional[str] = None,
                            session_id: Optional[str] = None) -> int:
@@ -228,6 +418,7 @@ class MemoryManager:
             await db.commit()
             return cursor.lastrowid
 
+    @traced("db")
     async def list_documents(self, file_type: Optional[str] = None,
                             session_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """List documents with optional filters"""
@@ -277,6 +468,7 @@ class MemoryManager:
                 for r in rows
             ]
 
+    @traced("db")
     async def get_session_stats(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get session statistics"""
         async with aiosqlite.connect(self.db_path) as db:
@@ -295,6 +487,7 @@ class MemoryManager:
                 "message_count": row[3]
             }
 
+    @traced("db")
     async def save_memory(self, category: str, key: str, value: str,
                          session_id: Optional[str] = None) -> None:
         """Save or update custom memory fact
@@ -318,6 +511,7 @@ class MemoryManager:
             )
             await db.commit()
 
+    @traced("db")
     async def get_memories(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
         """Retrieve custom memories
 
@@ -355,6 +549,7 @@ class MemoryManager:
                 for r in rows
             ]
 
+    @traced("db")
     async def delete_memory(self, category: str, key: str) -> bool:
         """Delete specific memory entry
 
@@ -369,6 +564,7 @@ class MemoryManager:
             await db.commit()
             return cursor.rowcount > 0
 
+    @traced("db")
     async def get_all_memories_formatted(self) -> str:
         """Get all memories formatted for system prompt"""
         memories = await self.get_memories()
@@ -387,3 +583,92 @@ class MemoryManager:
             sections.append(f"{cat.upper()}:\n" + "\n".join(items))
 
         return "\n\n".join(sections)
+
+    @traced("db")
+    async def save_permission_decision(self, tool_name: str, subject: str, decision: str) -> None:
+        """Persist an "always" / "never" permission answer"""
+        now = datetime.now(UTC).isoformat()
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute(
+                """INSERT INTO permission_decisions (tool_name, subject, decision, created_at)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT(tool_name, subject) DO UPDATE SET
+                       decision = excluded.decision,
+                       created_at = excluded.created_at""",
+                (tool_name, subject, decision, now)
+            )
+            await db.commit()
+
+    @traced("db")
+    async def get_permission_decisions(self) -> List[Dict[str, Any]]:
+        """All persisted permission decisions"""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                "SELECT tool_name, subject, decision FROM permission_decisions"
+            )
+            rows = await cursor.fetchall()
+            return [
+                {"tool_name": r[0], "subject": r[1], "decision": r[2]}
+                for r in rows
+            ]
+
+    async def save_traces(self, spans: List[Any]) -> None:
+        """Persist tracing spans (not traced itself)"""
+        rows = [
+            (s.session_id, s.component, s.name, s.start, s.duration_ms, s.bytes,
+             json.dumps(s.attributes) if s.attributes else None)
+            for s in spans
+        ]
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.executemany(
+                """INSERT INTO traces
+                   (session_id, component, name, started_at, duration_ms, bytes, attributes)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                rows
+            )
+            await db.commit()
+
+    async def get_trace_percentiles(self, session_id: Optional[str] = None,
+                                    percentiles: tuple = (50, 95, 99)) -> List[Dict[str, Any]]:
+        """Latency percentiles per traced operation, computed in SQL
+
+        Args:
+            session_id: Optional session filter
+            percentiles: Percentiles to report
+
+        Returns:
+            One row per (component, name) with count, p50/p95/p99 and bytes
+        """
+        where = "WHERE session_id = ?" if session_id else ""
+        params = (session_id,) if session_id else ()
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                f"""SELECT component, name, COUNT(*), AVG(bytes)
+                    FROM traces {where}
+                    GROUP BY component, name
+                    ORDER BY component, name""",
+                params
+            )
+            groups = await cursor.fetchall()
+
+            results = []
+            for component, name, count, avg_bytes in groups:
+                row = {
+                    "component": component,
+                    "name": name,
+                    "count": count,
+                    "avg_bytes": avg_bytes or 0
+                }
+                for pct in percentiles:
+                    cursor = await db.execute(
+                        f"""SELECT duration_ms FROM traces
+                            WHERE component = ? AND name = ?
+                            {"AND session_id = ?" if session_id else ""}
+                            ORDER BY duration_ms
+                            LIMIT 1 OFFSET ?""",
+                        (component, name, *params, percentile_rank(count, pct))
+                    )
+                    value = await cursor.fetchone()
+                    row[f"p{pct}"] = value[0] if value else 0.0
+                results.append(row)
+            return results
@@ -0,0 +1,191 @@
+# ABOUTME: Rule-based permission policy for built-in tools
+# ABOUTME: Compiled allow/deny patterns, persisted decisions, per-session cache, async prompts
+
+import asyncio
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+ALLOW = "allow"
+DENY = "deny"
+
+# Built-in defaults; storage/permissions.json can extend them
+DEFAULT_RULES: Dict[str, Dict[str, List[str]]] = {
+    "deny": {
+        "Bash": [
+            r"\brm\s+-[a-zA-Z]*[rf][a-zA-Z]*\s+(/|~|\*)(\s|$)",
+            r"\bsudo\b",
+            r"\bmkfs(\.\w+)?\b",
+            r"\bdd\s+.*\bof=/dev/",
+            r"(curl|wget)\b[^|]*\|\s*(ba|z)?sh\b",
+            r":\(\)\s*\{\s*:\|:&\s*\};:",
+        ],
+        "path": [
+            r"(^|/)\.ssh(/|$)",
+            r"^/etc/",
+            r"(^|/)google_token\.json$",
+        ],
+    },
+    "allow": {
+        # Whole single-line commands only: arguments are separated by spaces and
+        # may not contain other whitespace or shell metacharacters
+        "Bash": [
+            r"\A(ls|pwd|whoami|date|echo|which)(?: +[^\s;&|`$<>]+)* *\Z",
+            r"\Agit +(status|diff|log|show)(?!.*--output)(?: +[^\s;&|`$<>]+)* *\Z",
+        ],
+        "path": [],
+    },
+}
+
+# Tools whose subject is a file path
+PATH_TOOLS = ("Read", "Write", "Edit", "MultiEdit", "NotebookEdit")
+
+PromptFn = Callable[[str], Awaitable[str]]
+
+
+async def terminal_prompt(message: str) -> str:
+    """Ask on the terminal without blocking the event loop
+
+    prompt_toolkit's reader stops with its task, so a Ctrl+C during a
+    permission prompt leaves nothing blocked on stdin to swallow the next
+    line typed at "You:". Piped stdin has no terminal for prompt_toolkit
+    and no user to interrupt it, so it is read on a thread.
+    """
+    if not sys.stdin.isatty():
+        return await asyncio.to_thread(input, message)
+    from prompt_toolkit import PromptSession
+    return await PromptSession().prompt_async(message)
+
+
+def _compile(patterns: List[str]) -> Optional[re.Pattern]:
+    """Fold patterns into one alternation so each check is a single scan"""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+
+class PermissionPolicy:
+    """Decide tool permissions from rules, saved decisions and the user
+
+    Order: MCP tools are always allowed, then deny rules, allow rules,
+    persisted "always" decisions, this session's earlier answers, and
+    finally an async prompt. Without a prompt function unmatched Bash
+    commands are denied (headless mode).
+    """
+
+    def __init__(self, memory, prompt: Optional[PromptFn] = terminal_prompt,
+                 rules: Optional[Dict[str, Dict[str, List[str]]]] = None,
+                 rules_path: str = "storage/permissions.json"):
+        self.memory = memory
+        self.prompt = prompt
+        merged = self._merge_rules(rules or DEFAULT_RULES, rules_path)
+        self._deny = {kind: _compile(p) for kind, p in merged["deny"].items()}
+        self._allow = {kind: _compile(p) for kind, p in merged["allow"].items()}
+        self._persisted: Optional[Dict[Tuple[str, str], str]] = None
+        self._session_cache: Dict[str, Dict[Tuple[str, str], str]] = {}
+        # One prompt on screen at a time; cached decisions never wait on it
+        self._prompt_lock = asyncio.Lock()
+
+    @staticmethod
+    def _merge_rules(rules, rules_path: str) -> Dict[str, Dict[str, List[str]]]:
+        merged = {
+            action: {kind: list(patterns) for kind, patterns in rules.get(action, {}).items()}
+            for action in (DENY, ALLOW)
+        }
+        path = Path(rules_path)
+        if path.exists():
+            try:
+                extra = json.loads(path.read_text(encoding="utf-8"))
+                for action in (DENY, ALLOW):
+                    for kind, patterns in extra.get(action, {}).items():
+                        merged[action].setdefault(kind, []).extend(patterns)
+            except (OSError, ValueError) as e:
+                print(f"[WARN] Ignoring invalid {rules_path}: {e}")
+        return merged
+
+    @staticmethod
+    def subject(tool_name: str, input_data: Dict[str, Any]) -> Tuple[str, str]:
+        """Rule kind and the string rules match against"""
+        if tool_name == "Bash":
+            return "Bash", input_data.get("command", "").strip()
+        if tool_name in PATH_TOOLS:
+            path = input_data.get("file_path") or input_data.get("notebook_path") or ""
+            return "path", path
+        return tool_name, ""
+
+    def match_rules(self, kind: str, subject: str) -> Optional[str]:
+        """Static rule decision, or None when no rule matches"""
+        deny = self._deny.get(kind)
+        if deny is not None and deny.search(subject):
+            return DENY
+        allow = self._allow.get(kind)
+        # A newline starts another command, so multi-line subjects are never auto-allowed
+        if allow is not None and "\n" not in subject and "\r" not in subject and allow.search(subject):
+            return ALLOW
+        return None
+
+    async def _load_persisted(self):
+        if self._persisted is None:
+            rows = await self.memory.get_permission_decisions()
+            self._persisted = {(r["tool_name"], r["subject"]): r["decision"] for r in rows}
+
+    async def decide(self, tool_name: str, input_data: Dict[str, Any],
+                     session_id: Optional[str] = None) -> str:
+        """Return allow or deny for a tool call"""
+        if tool_name.startswith("mcp__"):
+            return ALLOW
+
+        kind, subject = self.subject(tool_name, input_data)
+        decision = self.match_rules(kind, subject)
+        if decision:
+            return decision
+
+        # Non-Bash tools without a matching rule keep the permissive default
+        if kind != "Bash":
+            return ALLOW
+
+        key = (tool_name, subject)
+        await self._load_persisted()
+        if key in self._persisted:
+            return self._persisted[key]
+
+        cache = self._session_cache.setdefault(session_id or "", {})
+        if key in cache:
+            return cache[key]
+
+        if self.prompt is None:
+            return DENY
+
+        async with self._prompt_lock:
+            # Another task may have answered the same question meanwhile
+            if key in cache:
+                return cache[key]
+            if key in self._persisted:
+                return self._persisted[key]
+            decision, remember = await self._ask(tool_name, subject)
+
+        cache[key] = decision
+        if remember:
+            self._persisted[key] = decision
+            await self.memory.save_permission_decision(tool_name, subject, decision)
+        return decision
+
+    async def _ask(self, tool_name: str, subject: str) -> Tuple[str, bool]:
+        print(f"\n{'='*60}")
+        print(f"[PERMISSION] {tool_name} command requested:")
+        print(f"  {subject}")
+        print(f"{'='*60}")
+
+        while True:
+            response = (await self.prompt("Approve? (y)es / (n)o / (a)lways / ne(v)er: ")).strip().lower()
+            if response in ('y', 'yes'):
+                return ALLOW, False
+            if response in ('n', 'no'):
+                return DENY, False
+            if response in ('a', 'always'):
+                return ALLOW, True
+            if response in ('v', 'never'):
+                return DENY, True
+            print("[WARN] Please enter 'y', 'n', 'a' or 'v'")
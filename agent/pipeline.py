@@ -0,0 +1,231 @@
+# ABOUTME: Bounded producer/consumer pipeline for streamed responses
+# ABOUTME: Fans stream events out to background consumers with backpressure policies
+
+import asyncio
+import pickle
+import tempfile
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Overflow policies for a full consumer queue
+BLOCK = "block"  # Wait for space (explicit backpressure on the producer)
+DROP = "drop"    # Discard the event and count it
+SPILL = "spill"  # Buffer the event in memory (on disk past a cap) and replay it in order later
+
+POLICIES = (BLOCK, DROP, SPILL)
+
+# Overflow events kept in memory before spilling to disk; writes past this
+# run inline on the event loop, so it only guards against runaway memory
+SPILL_MEMORY_EVENTS = 10000
+
+
+class _Close:
+    """End-of-stream marker (compared by type so it survives spilling)"""
+
+
+_CLOSE = _Close()
+
+
+class _SpillBuffer:
+    """Overflow for events that did not fit in the queue, in publish order
+
+    The first `memory_events` wait in a deque, so a lagging consumer costs
+    the producer no disk I/O; only beyond that are events pickled to an
+    append-only temp file. Memory always holds the older events.
+    """
+
+    def __init__(self, memory_events: int = SPILL_MEMORY_EVENTS):
+        self.memory_events = memory_events
+        self._memory: deque = deque()
+        self._file = None
+        self._read_offset = 0
+        self.on_disk = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._memory) + self.on_disk
+
+    def append(self, event: Any):
+        if not self.on_disk and len(self._memory) < self.memory_events:
+            self._memory.append(event)
+            return
+        if self._file is None:
+            self._file = tempfile.TemporaryFile()
+        self._file.seek(0, 2)
+        pickle.dump(event, self._file)
+        self.on_disk += 1
+
+    def pop(self) -> Any:
+        if self._memory:
+            return self._memory.popleft()
+        self._file.seek(self._read_offset)
+        event = pickle.load(self._file)
+        self._read_offset = self._file.tell()
+        self.on_disk -= 1
+        if self.on_disk == 0:
+            # Reader caught up - reuse the file from the start
+            self._file.seek(0)
+            self._file.truncate()
+            self._read_offset = 0
+        return event
+
+    def close(self):
+        self._memory.clear()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class Consumer:
+    """Single background consumer fed through a bounded queue"""
+
+    def __init__(self, name: str, handler: Callable[[Any], Awaitable[None]],
+                 maxsize: int = 256, policy: str = BLOCK,
+                 on_close: Optional[Callable[[], Awaitable[None]]] = None,
+                 spill_memory_events: int = SPILL_MEMORY_EVENTS):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.name = name
+        self.handler = handler
+        self.on_close = on_close
+        self.policy = policy
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.spill = _SpillBuffer(spill_memory_events) if policy == SPILL else None
+        self.dropped = 0
+        self.spilled = 0
+        self.errors: List[Exception] = []
+        self.task: Optional[asyncio.Task] = None
+
+    async def put(self, event: Any):
+        """Enqueue event according to overflow policy"""
+        if self.policy == BLOCK:
+            await self.queue.put(event)
+            return
+
+        # Once spilling started, keep spilling until the reader catches up
+        # so events are still handled in publish order
+        if self.spill is not None and self.spill.pending:
+            self.spill.append(event)
+            self.spilled += 1
+            return
+
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            if self.policy == DROP:
+                self.dropped += 1
+            else:
+                self.spill.append(event)
+                self.spilled += 1
+
+    async def close(self):
+        """Signal end of stream (never dropped or spilled)"""
+        if self.spill is not None and self.spill.pending:
+            self.spill.append(_CLOSE)
+        else:
+            await self.queue.put(_CLOSE)
+
+    async def run(self):
+        try:
+            while True:
+                event = await self.queue.get()
+                if isinstance(event, _Close):
+                    break
+                await self._handle(event)
+
+                if self.spill is not None and self.queue.empty():
+                    closed = False
+                    while self.spill.pending:
+                        spilled = self.spill.pop()
+                        if isinstance(spilled, _Close):
+                            closed = True
+                            break
+                        await self._handle(spilled)
+                    if closed:
+                        break
+
+            if self.on_close:
+                await self._call(self.on_close)
+        finally:
+            if self.spill is not None:
+                self.spill.close()
+
+    async def _handle(self, event: Any):
+        await self._call(self.handler, event)
+
+    async def _call(self, fn, *args):
+        # A failing consumer must never break the stream or other consumers
+        try:
+            await fn(*args)
+        except Exception as e:
+            self.errors.append(e)
+
+
+class StreamPipeline:
+    """Fan out streamed events from one producer to background consumers
+
+    The producer yields to the UI first and then calls publish(); consumers
+    such as persistence and tracing drain their own bounded queues in
+    separate tasks, so rendering never waits on disk.
+    """
+
+    def __init__(self):
+        self.consumers: List[Consumer] = []
+        self._started = False
+
+    def add_consumer(self, name: str, handler: Callable[[Any], Awaitable[None]],
+                     maxsize: int = 256, policy: str = BLOCK,
+                     on_close: Optional[Callable[[], Awaitable[None]]] = None,
+                     spill_memory_events: int = SPILL_MEMORY_EVENTS) -> Consumer:
+        """Register consumer before start()
+
+        Args:
+            name: Consumer name (for stats)
+            handler: Async callable invoked once per event
+            maxsize: Queue bound
+            policy: Overflow policy - block, drop or spill
+            on_close: Async callable invoked after the last event
+            spill_memory_events: Spilled events held in memory before any go to disk
+        """
+        consumer = Consumer(name, handler, maxsize=maxsize, policy=policy, on_close=on_close,
+                            spill_memory_events=spill_memory_events)
+        self.consumers.append(consumer)
+        return consumer
+
+    def start(self):
+        """Start consumer tasks"""
+        if self._started:
+            return
+        for consumer in self.consumers:
+            consumer.task = asyncio.create_task(consumer.run())
+        self._started = True
+
+    async def publish(self, event: Any):
+        """Hand event to every consumer"""
+        for consumer in self.consumers:
+            await consumer.put(event)
+
+    async def close(self):
+        """Signal end of stream without waiting for consumers"""
+        for consumer in self.consumers:
+            await consumer.close()
+
+    async def join(self):
+        """Wait for all consumers to finish draining"""
+        tasks = [c.task for c in self.consumers if c.task]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-consumer queue depth, drop and spill counters"""
+        return {
+            c.name: {
+                "queued": c.queue.qsize(),
+                "spill_pending": c.spill.pending if c.spill else 0,
+                "spill_on_disk": c.spill.on_disk if c.spill else 0,
+                "dropped": c.dropped,
+                "spilled": c.spilled,
+                "errors": len(c.errors)
+            }
+            for c in self.consumers
+        }
@@ -54,6 +54,10 @@ ASSISTANT_SYSTEM_PROMPT = """You are a personal assistant AI specializing in web
 **Research:**
 - `web_search` - DuckDuckGo search (URLs + snippets)
 - `fetch_url` - Parse web content (clean HTML)
+- `fetch_urls` - Fetch several sources at once in parallel (one call instead of many fetch_url calls)
+- `read_page` - Continue reading a fetched page by chunk number or query (no refetch)
+- `search_fetched` - Search every page fetched so far, offline (check before searching the web again)
+- `crawl_site` - Crawl a documentation site breadth-first and store its pages for search_fetched
 - `analyze_research` - Save findings with sources to database
 
 **Google Services:**
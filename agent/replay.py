@@ -0,0 +1,171 @@
+# ABOUTME: Record and replay of SDK message streams
+# ABOUTME: Capture receive_response() output with timing, re-emit it offline
+
+import asyncio
+import dataclasses
+import json
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+import claude_agent_sdk
+
+FORMAT_VERSION = 1
+
+# SDK types a recording may contain (looked up by class name on replay)
+_SDK_TYPES = {
+    name: getattr(claude_agent_sdk, name)
+    for name in (
+        "AssistantMessage", "UserMessage", "SystemMessage", "ResultMessage",
+        "StreamEvent", "TextBlock", "ThinkingBlock", "ToolUseBlock", "ToolResultBlock"
+    )
+    if hasattr(claude_agent_sdk, name)
+}
+
+
+def serialize_message(obj: Any) -> Any:
+    """Convert SDK message/block dataclasses into tagged JSON-safe data"""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {
+            "__type__": type(obj).__name__,
+            "fields": {
+                f.name: serialize_message(getattr(obj, f.name))
+                for f in dataclasses.fields(obj)
+            }
+        }
+    if isinstance(obj, (list, tuple)):
+        return [serialize_message(item) for item in obj]
+    if isinstance(obj, dict):
+        return {str(k): serialize_message(v) for k, v in obj.items()}
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    return str(obj)
+
+
+def deserialize_message(data: Any) -> Any:
+    """Rebuild SDK dataclasses from serialize_message() output"""
+    if isinstance(data, dict) and "__type__" in data:
+        cls = _SDK_TYPES.get(data["__type__"])
+        fields = {k: deserialize_message(v) for k, v in data["fields"].items()}
+        if cls is None:
+            raise ValueError(f"Unknown SDK type in recording: {data['__type__']}")
+        known = {f.name for f in dataclasses.fields(cls)}
+        return cls(**{k: v for k, v in fields.items() if k in known})
+    if isinstance(data, list):
+        return [deserialize_message(item) for item in data]
+    if isinstance(data, dict):
+        return {k: deserialize_message(v) for k, v in data.items()}
+    return data
+
+
+def load_recording(path: Union[str, Path]) -> Dict[str, Any]:
+    """Load recording file"""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported recording version: {data.get('version')}")
+    return data
+
+
+class StreamRecorder:
+    """Wrap a ClaudeSDKClient and capture every turn to a fixture file
+
+    Each turn stores the prompt and every message from receive_response()
+    with its offset in seconds from query(). The file is rewritten after
+    every completed turn, so a crash loses at most the current turn.
+    """
+
+    def __init__(self, client: Any, path: Union[str, Path]):
+        self._client = client
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.turns: List[Dict[str, Any]] = []
+        self._prompt: Optional[str] = None
+        self._query_time = 0.0
+
+    def __getattr__(self, name):
+        # connect, disconnect, interrupt... pass through untouched
+        return getattr(self._client, name)
+
+    async def query(self, prompt: str, *args, **kwargs):
+        self._prompt = prompt
+        self._query_time = time.perf_counter()
+        return await self._client.query(prompt, *args, **kwargs)
+
+    async def receive_response(self) -> AsyncIterator[Any]:
+        messages = []
+        try:
+            async for message in self._client.receive_response():
+                messages.append({
+                    "t": round(time.perf_counter() - self._query_time, 6),
+                    "message": serialize_message(message)
+                })
+                yield message
+        finally:
+            self.turns.append({"prompt": self._prompt, "messages": messages})
+            self.save()
+
+    def save(self):
+        """Write all recorded turns"""
+        data = {"version": FORMAT_VERSION, "turns": self.turns}
+        self.path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+class ReplaySDKClient:
+    """ClaudeSDKClient stand-in that re-emits a recording
+
+    Args:
+        recording: Path to a recording file or an already loaded recording
+        speed: Playback speed multiplier; 0 replays with no delays at all
+        loop: Start over after the last turn instead of raising
+    """
+
+    def __init__(self, recording: Union[str, Path, Dict[str, Any]],
+                 speed: float = 1.0, loop: bool = True):
+        data = recording if isinstance(recording, dict) else load_recording(recording)
+        self.turns = [
+            [(entry["t"], deserialize_message(entry["message"])) for entry in turn["messages"]]
+            for turn in data["turns"]
+        ]
+        if not self.turns:
+            raise ValueError("Recording has no turns")
+        self.speed = speed
+        self.loop = loop
+        self.prompts: List[str] = []
+        self.connected = False
+        self._next_turn = 0
+        self._current: Optional[list] = None
+        self._interrupted = False
+
+    async def connect(self, *args, **kwargs):
+        self.connected = True
+
+    async def disconnect(self):
+        self.connected = False
+
+    async def interrupt(self):
+        self._interrupted = True
+
+    async def query(self, prompt: str, *args, **kwargs):
+        if self._next_turn >= len(self.turns):
+            if not self.loop:
+                raise RuntimeError("Recording exhausted")
+            self._next_turn = 0
+        self.prompts.append(prompt)
+        self._current = self.turns[self._next_turn]
+        self._next_turn += 1
+        self._interrupted = False
+
+    async def receive_response(self) -> AsyncIterator[Any]:
+        turn, self._current = self._current or [], None
+        start = time.perf_counter()
+        for offset, message in turn:
+            if self._interrupted:
+                break
+            if self.speed:
+                delay = offset / self.speed - (time.perf_counter() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                # Still let other sessions run between messages
+                await asyncio.sleep(0)
+            yield message
@@ -0,0 +1,44 @@
+# ABOUTME: Streaming filter hiding skill loading chatter from front ends
+# ABOUTME: Classifies each SDK message once with a precompiled matcher, then passes its chunks through
+
+import re
+from typing import Optional
+
+from .events import Event, TEXT
+
+# Skill status lines and leaked skill files; checked once per message
+SKILL_MARKERS = re.compile(
+    r"skill is (?:running|loading)"
+    r"|ABOUTME:"
+    r"|\ABase directory for this skill:"
+    r"|\A---\s*\nname:",  # SKILL.md frontmatter
+    re.IGNORECASE
+)
+
+
+class SkillFilter:
+    """Decide which text events a front end should display
+
+    Only assistant text is shown (user-role text is skill prompt injection).
+    The first chunk of each message decides for the whole message, so
+    later chunks cost one integer comparison and Markdown headers inside
+    replies are never dropped. Use one filter per turn.
+    """
+
+    def __init__(self, markers: re.Pattern = SKILL_MARKERS):
+        self.markers = markers
+        self._index: Optional[int] = None
+        self._hidden = False
+
+    def accept(self, event: Event) -> bool:
+        """True when a TEXT event should be displayed"""
+        if event.kind != TEXT or event.role != "assistant":
+            return False
+        if event.message_index != self._index:
+            self._index = event.message_index
+            self._hidden = self.markers.search(event.text) is not None
+        return not self._hidden
+
+    def reset(self):
+        self._index = None
+        self._hidden = False
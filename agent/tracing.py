@@ -0,0 +1,207 @@
+# ABOUTME: Lightweight latency tracing for turns, tools and database calls
+# ABOUTME: Span context managers, SQLite persistence and OTLP-compatible JSON export
+
+import asyncio
+import contextvars
+import functools
+import json
+import math
+import os
+import secrets
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# Session the current task is working for (tagged onto every span)
+current_session: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "current_session", default=None
+)
+
+
+class Span:
+    """Single timed operation"""
+
+    __slots__ = ("name", "component", "start", "duration_ms", "bytes",
+                 "session_id", "attributes")
+
+    def __init__(self, name: str, component: str, session_id: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.component = component
+        self.start = time.time()
+        self.duration_ms = 0.0
+        self.bytes = 0
+        self.session_id = session_id
+        self.attributes = attributes or {}
+
+
+class OTLPJsonExporter:
+    """Append spans as OTLP/JSON ExportTraceServiceRequest lines"""
+
+    def __init__(self, path: str, service_name: str = "personal-assistant"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.service_name = service_name
+        self._trace_id = secrets.token_hex(16)
+
+    @staticmethod
+    def _attr(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def export(self, spans: List[Span]):
+        otlp_spans = []
+        for span in spans:
+            start_ns = int(span.start * 1e9)
+            attrs = [
+                self._attr("component", span.component),
+                self._attr("bytes", span.bytes),
+            ]
+            if span.session_id:
+                attrs.append(self._attr("session.id", span.session_id))
+            attrs.extend(self._attr(k, v) for k, v in span.attributes.items())
+            otlp_spans.append({
+                "traceId": self._trace_id,
+                "spanId": secrets.token_hex(8),
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(start_ns),
+                "endTimeUnixNano": str(start_ns + int(span.duration_ms * 1e6)),
+                "attributes": attrs
+            })
+
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": [self._attr("service.name", self.service_name)]},
+                "scopeSpans": [{"scope": {"name": "agent.tracing"}, "spans": otlp_spans}]
+            }]
+        }
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(request) + "\n")
+
+
+class Tracer:
+    """Collects spans in memory until flushed to the traces table"""
+
+    def __init__(self, max_buffer: int = 10000):
+        self.enabled = True
+        self.exporters: List[Any] = []
+        self._buffer: deque = deque(maxlen=max_buffer)
+
+        otlp_path = os.environ.get("AGENT_TRACE_FILE")
+        if otlp_path:
+            self.exporters.append(OTLPJsonExporter(otlp_path))
+
+    @contextmanager
+    def span(self, name: str, component: str, **attributes) -> Iterator[Span]:
+        """Time the enclosed block; caller may set span.bytes / attributes"""
+        span = Span(name, component, current_session.get(), attributes)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes["error"] = type(e).__name__
+            raise
+        finally:
+            span.duration_ms = (time.perf_counter() - start) * 1000
+            if self.enabled:
+                self._buffer.append(span)
+
+    def record(self, name: str, component: str, duration_ms: float,
+               bytes: int = 0, **attributes) -> Span:
+        """Record an already measured span"""
+        span = Span(name, component, current_session.get(), attributes)
+        span.start -= duration_ms / 1000
+        span.duration_ms = duration_ms
+        span.bytes = bytes
+        if self.enabled:
+            self._buffer.append(span)
+        return span
+
+    def drain(self) -> List[Span]:
+        """Remove and return buffered spans"""
+        spans = list(self._buffer)
+        self._buffer.clear()
+        return spans
+
+    async def flush(self, memory) -> int:
+        """Write buffered spans to the traces table and exporters"""
+        spans = self.drain()
+        if not spans:
+            return 0
+        await memory.save_traces(spans)
+        for exporter in self.exporters:
+            try:
+                await asyncio.to_thread(exporter.export, spans)
+            except Exception as e:
+                print(f"[WARN] Trace export failed: {e}")
+        return len(spans)
+
+
+# Process-wide tracer
+tracer = Tracer()
+
+
+def traced(component: str, name: Optional[str] = None):
+    """Decorator timing an async function as a span"""
+    def decorator(fn):
+        span_name = name or f"{component}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with tracer.span(span_name, component):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _result_bytes(result: Any) -> int:
+    """Size of text returned by an MCP tool handler"""
+    if not isinstance(result, dict):
+        return 0
+    total = 0
+    for item in result.get("content", []):
+        if isinstance(item, dict):
+            total += len(str(item.get("text", "")).encode("utf-8"))
+    return total
+
+
+def trace_tools(tools: List[Any]) -> List[Any]:
+    """Wrap MCP tool handlers so every call records a tool span"""
+    for sdk_tool in tools:
+        handler = sdk_tool.handler
+        span_name = f"tool.{sdk_tool.name}"
+
+        async def wrapped(args, _handler=handler, _name=span_name):
+            with tracer.span(_name, "tool") as span:
+                result = await _handler(args)
+                span.bytes = _result_bytes(result)
+                if isinstance(result, dict) and result.get("isError"):
+                    span.attributes["error"] = "tool_error"
+                return result
+
+        sdk_tool.handler = wrapped
+    return tools
+
+
+def percentile_rank(count: int, pct: float) -> int:
+    """Zero-based nearest-rank index of a percentile in a sorted sample
+
+    The smallest rank covering pct percent of the sample, i.e.
+    ceil(pct / 100 * count); multiplying first keeps 7% of 100 at rank 7.
+    """
+    return max(0, min(count - 1, math.ceil(pct * count / 100) - 1))
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[percentile_rank(len(sorted_values), pct)]
@@ -0,0 +1,259 @@
+# ABOUTME: Headless batch runner for many prompts
+# ABOUTME: Pooled clients, bounded concurrency, streaming JSONL results with resume
+
+import asyncio
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from agent.client import AssistantClient
+from agent.events import Event, TEXT, TOOL_USE, RESULT
+
+ClientFactory = Callable[[], Awaitable[AssistantClient]]
+
+
+async def default_client_factory() -> AssistantClient:
+    """Headless client: unapproved Bash commands are denied, never prompted"""
+    client = AssistantClient(permission_prompt=None)
+    await client.initialize()
+    return client
+
+
+def load_prompts(path: str) -> List[Dict[str, Any]]:
+    """Read prompts from JSONL
+
+    Each line is either {"id": ..., "prompt": ...} or a bare JSON string.
+    Lines without an id get their line number.
+    """
+    prompts = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if isinstance(item, str):
+                item = {"prompt": item}
+            item.setdefault("id", str(line_no))
+            item["id"] = str(item["id"])
+            prompts.append(item)
+    return prompts
+
+
+def completed_ids(output_path: str) -> Set[str]:
+    """Ids already finished successfully (the results file is the checkpoint)"""
+    done = set()
+    path = Path(output_path)
+    if not path.exists():
+        return done
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue  # Partially written line from a killed run
+            if result.get("status") == "ok":
+                done.add(str(result["id"]))
+    return done
+
+
+class ClientPool:
+    """Fixed-size pool of connected AssistantClients
+
+    Clients keep their conversation context between prompts, so each is
+    recycled after `recycle_after` prompts to bound context growth.
+    Callers must limit concurrent acquire() calls to `size`.
+    """
+
+    def __init__(self, size: int, factory: ClientFactory, recycle_after: int = 10):
+        self.size = size
+        self.factory = factory
+        self.recycle_after = recycle_after
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._created = 0
+        self._uses: Dict[int, int] = {}
+        self._cost_seen: Dict[int, float] = {}
+        self._all: List[AssistantClient] = []
+
+    async def acquire(self) -> AssistantClient:
+        if self._idle.empty() and self._created < self.size:
+            self._created += 1
+            client = await self.factory()
+            self._all.append(client)
+            return client
+        return await self._idle.get()
+
+    async def release(self, client: AssistantClient, broken: bool = False):
+        uses = self._uses.get(id(client), 0) + 1
+        self._uses[id(client)] = uses
+        if broken or uses >= self.recycle_after:
+            # Replacement is created lazily by the next acquire()
+            await self._discard(client)
+            self._created -= 1
+            return
+        await self._idle.put(client)
+
+    def cost_delta(self, client: AssistantClient, cumulative: Optional[float]) -> float:
+        """SDK cost is cumulative per client; return this prompt's share"""
+        if cumulative is None:
+            return 0.0
+        previous = self._cost_seen.get(id(client), 0.0)
+        self._cost_seen[id(client)] = cumulative
+        return max(0.0, cumulative - previous)
+
+    async def _discard(self, client: AssistantClient):
+        if client in self._all:
+            self._all.remove(client)
+        self._uses.pop(id(client), None)
+        self._cost_seen.pop(id(client), None)
+        try:
+            await client.close()
+        except Exception as e:
+            print(f"[WARN] Failed to close client: {e}", file=sys.stderr)
+
+    async def close(self):
+        for client in list(self._all):
+            await self._discard(client)
+
+
+def _collect(event: Event, result: Dict[str, Any]):
+    """Accumulate reply text, tool names and cost from one stream event"""
+    kind = event.kind
+    if kind == TEXT:
+        if event.role == "assistant":
+            result["text"].append(event.text)
+    elif kind == TOOL_USE:
+        result["tools"].append(event.name)
+    elif kind == RESULT and event.total_cost_usd is not None:
+        result["cumulative_cost"] = event.total_cost_usd
+
+
+async def _run_one(pool: ClientPool, item: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+    client = await pool.acquire()
+    start = time.perf_counter()
+    collected = {"text": [], "tools": [], "cumulative_cost": None}
+    broken = False
+    try:
+        async def consume():
+            async for event in client.send_message(item["prompt"]):
+                _collect(event, collected)
+
+        await asyncio.wait_for(consume(), timeout=timeout)
+        return {
+            "id": item["id"],
+            "status": "ok",
+            "response": "\n".join(collected["text"]),
+            "tools": collected["tools"],
+            "cost_usd": pool.cost_delta(client, collected["cumulative_cost"]),
+            "duration_s": round(time.perf_counter() - start, 3),
+            "session_id": client.session_id
+        }
+    except Exception as e:
+        broken = True
+        return {
+            "id": item["id"],
+            "status": "error",
+            "error": f"{type(e).__name__}: {e}",
+            "duration_s": round(time.perf_counter() - start, 3),
+            "session_id": client.session_id
+        }
+    finally:
+        await pool.release(client, broken=broken)
+
+
+async def run_batch(input_path: str, output_path: str, concurrency: int = 4,
+                    resume: bool = True, timeout: Optional[float] = None,
+                    recycle_after: int = 10,
+                    client_factory: ClientFactory = default_client_factory) -> Dict[str, Any]:
+    """Run all prompts and append results to output_path as they finish
+
+    Returns:
+        Aggregate summary (counts, cost, throughput)
+    """
+    prompts = load_prompts(input_path)
+    if resume:
+        done = completed_ids(output_path)
+        pending = [p for p in prompts if p["id"] not in done]
+    else:
+        done = set()
+        pending = prompts
+        Path(output_path).unlink(missing_ok=True)
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    pool = ClientPool(concurrency, client_factory, recycle_after=recycle_after)
+    semaphore = asyncio.Semaphore(concurrency)
+    summary = {"total": len(prompts), "skipped": len(prompts) - len(pending),
+               "ok": 0, "errors": 0, "cost_usd": 0.0}
+    start = time.perf_counter()
+
+    with open(output_path, "a+", encoding="utf-8") as out:
+        # Terminate a line torn by a killed run before appending
+        if out.tell() > 0:
+            out.seek(out.tell() - 1)
+            if out.read(1) != "\n":
+                out.write("\n")
+
+        async def worker(item):
+            async with semaphore:
+                result = await _run_one(pool, item, timeout)
+            # One complete line per result, synced so a killed run can resume
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+
+            if result["status"] == "ok":
+                summary["ok"] += 1
+                summary["cost_usd"] += result["cost_usd"]
+            else:
+                summary["errors"] += 1
+            finished = summary["ok"] + summary["errors"]
+            print(f"[{finished}/{len(pending)}] {result['id']}: {result['status']} "
+                  f"({result['duration_s']}s)", file=sys.stderr)
+
+        try:
+            await asyncio.gather(*(worker(item) for item in pending))
+        finally:
+            await pool.close()
+
+    elapsed = time.perf_counter() - start
+    summary["elapsed_s"] = round(elapsed, 3)
+    summary["prompts_per_s"] = round((summary["ok"] + summary["errors"]) / elapsed, 3) if elapsed else 0.0
+    return summary
+
+
+def main():
+    """Parse arguments and run batch"""
+    parser = argparse.ArgumentParser(description="Run prompts from JSONL headlessly")
+    parser.add_argument("input", help="JSONL file with {\"id\", \"prompt\"} per line")
+    parser.add_argument("-o", "--output", default="storage/exports/batch_results.jsonl",
+                        help="JSONL results file (also the resume checkpoint)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Parallel clients")
+    parser.add_argument("--timeout", type=float, help="Per-prompt timeout in seconds")
+    parser.add_argument("--recycle-after", type=int, default=10,
+                        help="Prompts per client before it is replaced (bounds context)")
+    parser.add_argument("--restart", action="store_true", help="Ignore previous results")
+    args = parser.parse_args()
+
+    try:
+        summary = asyncio.run(run_batch(
+            args.input, args.output,
+            concurrency=args.concurrency,
+            resume=not args.restart,
+            timeout=args.timeout,
+            recycle_after=args.recycle_after
+        ))
+    except KeyboardInterrupt:
+        print("\n[INFO] Interrupted - rerun the same command to resume", file=sys.stderr)
+        sys.exit(130)
+
+    print(f"[OK] {summary['ok']} ok, {summary['errors']} failed, {summary['skipped']} skipped "
+          f"of {summary['total']}", file=sys.stderr)
+    print(f"[INFO] Cost: ${summary['cost_usd']:.4f} | {summary['elapsed_s']}s | "
+          f"{summary['prompts_per_s']} prompts/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# ABOUTME: Offline benchmarks and load tests
+# ABOUTME: Run with python -m bench.<name>
@@ -0,0 +1,135 @@
+# ABOUTME: Benchmark HTML extraction speed and quality on an offline page corpus
+# ABOUTME: BeautifulSoup fallback chain versus lxml fixed selection and text-density scoring
+
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import lxml.html
+from tools.extract import NUMPY_AVAILABLE, extract_tree
+
+# Saved pages (*.html) next to the expected main text (*.txt)
+DEFAULT_CORPUS = Path(__file__).parent.parent / "tests" / "fixtures" / "pages"
+# Unmodified real-world pages; expected text is each page's own <main> (see SOURCES.md)
+REAL_CORPUS = DEFAULT_CORPUS / "real"
+
+_WORD = re.compile(r"\w+")
+
+
+def legacy_extract_text(html: str) -> str:
+    """Main text as fetch_url extracted it before tools.extract"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'lxml')
+    for script in soup(["script", "style", "nav", "footer", "header"]):
+        script.decompose()
+    article = (
+        soup.find('article') or
+        soup.find('main') or
+        soup.find('div', class_='content') or
+        soup.find('div', id='content') or
+        soup.body
+    )
+    text = (article or soup).get_text(separator='\n', strip=True)
+    return '\n'.join(line.strip() for line in text.split('\n') if line.strip())
+
+
+def token_f1(extracted: str, expected: str) -> float:
+    """Bag-of-words F1 between extracted and expected text"""
+    got = Counter(_WORD.findall(extracted.lower()))
+    want = Counter(_WORD.findall(expected.lower()))
+    overlap = sum((got & want).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(got.values())
+    recall = overlap / sum(want.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def load_corpus(corpus: Path = DEFAULT_CORPUS) -> List[Dict[str, str]]:
+    pages = []
+    for path in sorted(corpus.glob("*.html")):
+        pages.append({
+            "name": path.stem,
+            "html": path.read_text(encoding="utf-8"),
+            "expected": path.with_suffix(".txt").read_text(encoding="utf-8"),
+        })
+    if not pages:
+        raise ValueError(f"No pages in {corpus}")
+    return pages
+
+
+def _lxml_engine(engine: str, use_numpy: Optional[bool] = None) -> Callable[[str], str]:
+    def extract(html: str) -> str:
+        return extract_tree(lxml.html.document_fromstring(html), engine, use_numpy)["text"]
+    return extract
+
+
+def engines() -> Dict[str, Callable[[str], str]]:
+    available = {}
+    try:
+        import bs4  # noqa: F401
+        available["bs4_chain"] = legacy_extract_text
+    except ImportError:
+        pass
+    available["lxml_fixed"] = _lxml_engine("fixed")
+    if NUMPY_AVAILABLE:
+        available["density_numpy"] = _lxml_engine("density", use_numpy=True)
+    available["density_python"] = _lxml_engine("density", use_numpy=False)
+    # What fetch_url runs: NumPy only on large pages
+    available["density_auto"] = _lxml_engine("density")
+    return available
+
+
+def run_bench(corpus: Path = DEFAULT_CORPUS, repeat: int = 20) -> Dict[str, Any]:
+    """Best-of-`repeat` milliseconds per page and mean F1 for each engine"""
+    pages = load_corpus(corpus)
+    report: Dict[str, Any] = {"pages": len(pages), "bytes": sum(len(p["html"]) for p in pages)}
+    for name, extract in engines().items():
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for page in pages:
+                extract(page["html"])
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        scores = {page["name"]: round(token_f1(extract(page["html"]), page["expected"]), 3) for page in pages}
+        report[name] = {
+            "ms_per_page": round(best * 1000 / len(pages), 3),
+            "f1": round(sum(scores.values()) / len(scores), 3),
+            "pages": scores,
+        }
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="HTML extraction speed and quality on a saved page corpus")
+    parser.add_argument("--corpus", type=Path, action="append",
+                        help="Directory of page.html / page.txt pairs (repeatable; "
+                             "default: the hand-written and the real page corpus)")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the corpus (best is reported)")
+    parser.add_argument("--json", action="store_true", help="Print JSON report")
+    args = parser.parse_args(argv)
+
+    reports = {str(corpus): run_bench(corpus, args.repeat) for corpus in args.corpus or (DEFAULT_CORPUS, REAL_CORPUS)}
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return reports
+    for corpus, report in reports.items():
+        print(f"[OK] {corpus}: {report['pages']} pages, {report['bytes']} bytes")
+        for name, r in report.items():
+            if isinstance(r, dict):
+                worst = min(r["pages"], key=r["pages"].get)
+                print(f"  {name:<15} {r['ms_per_page']:>8.3f} ms/page  F1 {r['f1']:.3f}  "
+                      f"(worst {worst} {r['pages'][worst]:.3f})")
+    return reports
+
+
+if __name__ == "__main__":
+    main()
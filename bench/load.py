@@ -0,0 +1,264 @@
+# ABOUTME: Synthetic load generator for concurrent assistant sessions
+# ABOUTME: Drives AssistantClient, MemoryManager and MCP tools without the API
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import aiosqlite
+from claude_agent_sdk import (AssistantMessage, UserMessage, ResultMessage, SystemMessage,
+                              TextBlock, ToolUseBlock, ToolResultBlock)
+from agent.client import AssistantClient
+from agent.memory import MemoryManager
+from agent.tracing import tracer, trace_tools, percentile
+from tools.memory import MemoryTools
+
+MODEL = "synthetic"
+
+_WORDS = ("the agent fetched sources and compared findings across several pages "
+          "before writing a short summary with citations and next steps").split()
+
+
+def _rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class SyntheticSDKClient:
+    """Fake ClaudeSDKClient generating realistic turns
+
+    Tool calls run the real MCP tool handlers, so each tool turn exercises
+    the tool layer and its database writes like a live session would.
+    """
+
+    def __init__(self, tools: List[Any], session_id: str, rng: random.Random,
+                 tool_ratio: float = 0.5, text_chunks: int = 8, token_delay: float = 0.0):
+        self.tools = {t.name: t for t in tools}
+        self.session_id = session_id
+        self.rng = rng
+        self.tool_ratio = tool_ratio
+        self.text_chunks = text_chunks
+        self.token_delay = token_delay
+        self.cost = 0.0
+        self._prompt = ""
+
+    async def connect(self, *args, **kwargs):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def interrupt(self):
+        pass
+
+    async def query(self, prompt: str, *args, **kwargs):
+        self._prompt = prompt
+
+    def _text(self, words: int) -> str:
+        return " ".join(self.rng.choice(_WORDS) for _ in range(words))
+
+    def _tool_call(self):
+        choice = self.rng.random()
+        if choice < 0.4:
+            return "save_memory", {
+                "category": "technical",
+                "key": f"fact_{self.rng.randrange(50)}",
+                "value": self._text(6)
+            }
+        if choice < 0.7:
+            return "search_history", {"query": self.rng.choice(_WORDS), "limit": 5}
+        if choice < 0.9:
+            return "list_memories", {}
+        return "list_sessions", {"limit": 5}
+
+    async def _pause(self):
+        if self.token_delay:
+            await asyncio.sleep(self.token_delay * self.rng.uniform(0.5, 1.5))
+        else:
+            await asyncio.sleep(0)
+
+    async def receive_response(self):
+        yield SystemMessage(subtype="init", data={"session_id": self.session_id})
+
+        if self.rng.random() < self.tool_ratio:
+            name, args = self._tool_call()
+            tool_id = f"toolu_{self.rng.randrange(1 << 32):08x}"
+            yield AssistantMessage(
+                content=[ToolUseBlock(id=tool_id, name=f"mcp__assistant__{name}", input=args)],
+                model=MODEL
+            )
+            result = await self.tools[name].handler(args)
+            yield UserMessage(content=[ToolResultBlock(
+                tool_use_id=tool_id, content=result["content"], is_error=result.get("isError", False)
+            )])
+
+        for _ in range(self.text_chunks):
+            await self._pause()
+            yield AssistantMessage(content=[TextBlock(text=self._text(12) + " ")], model=MODEL)
+
+        self.cost += 0.002
+        yield ResultMessage(
+            subtype="success", duration_ms=0, duration_api_ms=0, is_error=False,
+            num_turns=1, session_id=self.session_id, total_cost_usd=self.cost
+        )
+
+
+_DB_WRITES = ("db.save_message", "db.update_session", "db.save_memory", "db.create_session")
+
+
+async def _db_spans(memory: MemoryManager) -> List[tuple]:
+    async with aiosqlite.connect(memory.db_path) as db:
+        cursor = await db.execute(
+            "SELECT name, duration_ms, attributes FROM traces WHERE component = 'db'"
+        )
+        return await cursor.fetchall()
+
+
+async def _run_session(index: int, memory: MemoryManager, turns: int, args,
+                       latencies: List[float], first_tokens: List[float], errors: List[str]):
+    rng = random.Random(args.seed + index)
+    client = AssistantClient(session_id=f"load-{index:04d}")
+    client.memory = memory
+    await memory.create_session(client.session_id)
+
+    tools = trace_tools(MemoryTools(memory, client.session_id).get_tools())
+    client.client = SyntheticSDKClient(
+        tools, client.session_id, rng,
+        tool_ratio=args.tool_ratio, text_chunks=args.chunks, token_delay=args.token_delay
+    )
+
+    try:
+        for turn in range(turns):
+            start = time.perf_counter()
+            first = None
+            async for _ in client.send_message(f"turn {turn}: {' '.join(rng.sample(_WORDS, 5))}"):
+                if first is None:
+                    first = time.perf_counter() - start
+            await client.flush()
+            latencies.append(time.perf_counter() - start)
+            first_tokens.append(first or 0.0)
+            if args.think_time:
+                await asyncio.sleep(args.think_time * rng.uniform(0.5, 1.5))
+    except Exception as e:
+        errors.append(f"session {index}: {e}")
+    finally:
+        await client.close()
+
+
+async def run_load(args) -> Dict[str, Any]:
+    """Run the load test and return the report"""
+    temp_dir = None
+    db_path = args.db
+    if not db_path:
+        temp_dir = tempfile.TemporaryDirectory()
+        db_path = str(Path(temp_dir.name) / "load.db")
+
+    memory = MemoryManager(db_path=db_path)
+    await memory.initialize()
+    tracer.drain()
+
+    latencies: List[float] = []
+    first_tokens: List[float] = []
+    errors: List[str] = []
+
+    rss_start = _rss_bytes()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _run_session(i, memory, args.turns, args, latencies, first_tokens, errors)
+        for i in range(args.sessions)
+    ))
+    elapsed = time.perf_counter() - start
+    rss_end = _rss_bytes()
+
+    # Turns flush their spans to the traces table; collect the remainder too
+    await tracer.flush(memory)
+    db_spans = await _db_spans(memory)
+    db_writes = sorted(d for name, d, _ in db_spans if name in _DB_WRITES)
+    db_reads = sorted(d for name, d, _ in db_spans if name not in _DB_WRITES)
+    db_errors = sum(1 for _, _, attrs in db_spans if attrs and "error" in attrs)
+
+    latencies.sort()
+    first_tokens.sort()
+    ms = lambda values, pct: round(percentile(values, pct) * 1000, 2)
+    report = {
+        "sessions": args.sessions,
+        "turns": len(latencies),
+        "elapsed_s": round(elapsed, 3),
+        "turns_per_s": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "turn_latency_ms": {f"p{p}": ms(latencies, p) for p in (50, 95, 99)},
+        "first_message_ms": {f"p{p}": ms(first_tokens, p) for p in (50, 95, 99)},
+        # Write latency includes time spent waiting on SQLite's write lock
+        "db_write_ms": {f"p{p}": round(percentile(db_writes, p), 2) for p in (50, 95, 99)},
+        "db_read_ms": {f"p{p}": round(percentile(db_reads, p), 2) for p in (50, 95, 99)},
+        # Total time writes spent above the median write. Lock waits, slow
+        # disk and GC pauses all count; sqlite3 does not expose lock waits
+        "db_write_excess_ms": round(sum(max(0.0, d - percentile(db_writes, 50)) for d in db_writes), 1),
+        "db_errors": db_errors,
+        "rss_start_mb": round(rss_start / 1e6, 1),
+        "rss_end_mb": round(rss_end / 1e6, 1),
+        "rss_growth_mb": round((rss_end - rss_start) / 1e6, 1),
+        "errors": errors
+    }
+
+    if temp_dir:
+        temp_dir.cleanup()
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    """Human-readable report"""
+    print(f"[OK] {report['turns']} turns across {report['sessions']} sessions "
+          f"in {report['elapsed_s']}s ({report['turns_per_s']} turns/s)")
+    for key, label in (("turn_latency_ms", "Turn latency"),
+                       ("first_message_ms", "First message"),
+                       ("db_write_ms", "DB writes"),
+                       ("db_read_ms", "DB reads")):
+        p = report[key]
+        print(f"  {label:<14} p50 {p['p50']:>8.2f} ms  p95 {p['p95']:>8.2f} ms  p99 {p['p99']:>8.2f} ms")
+    print(f"  DB write excess {report['db_write_excess_ms']} ms above median write, "
+          f"{report['db_errors']} failed calls")
+    print(f"  RSS            {report['rss_start_mb']} MB -> {report['rss_end_mb']} MB "
+          f"(+{report['rss_growth_mb']} MB)")
+    for error in report["errors"]:
+        print(f"[ERROR] {error}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Synthetic load test for concurrent sessions")
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent sessions")
+    parser.add_argument("--turns", type=int, default=20, help="Turns per session")
+    parser.add_argument("--chunks", type=int, default=8, help="Text messages per turn")
+    parser.add_argument("--tool-ratio", type=float, default=0.5, help="Share of turns with a tool call")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Seconds between text messages")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Seconds between turns")
+    parser.add_argument("--db", help="Database path (default: temporary file)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print JSON report")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_load(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# ABOUTME: Benchmark query latency of the fetched-page index
+# ABOUTME: FTS5 BM25 versus the LIKE fallback over a store filled from the page corpus
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench.extraction import DEFAULT_CORPUS, load_corpus
+from tools.extract import extract_html
+from tools.page_store import PageStore
+
+QUERIES = (
+    "container gardening watering",
+    "task group cancellation timeout",
+    "cycle lanes council",
+    "turntable belt motor",
+    "sourdough starter bacteria",
+    "laptop fan indexing",
+    "hydration bladder pack",
+    "fresnel lens lighthouse keepers",
+)
+
+
+async def fill_store(store: PageStore, corpus: Path, copies: int) -> int:
+    pages = [extract_html(page["html"]) for page in load_corpus(corpus)]
+    for i in range(copies):
+        for n, page in enumerate(pages):
+            await store.put(f"https://site{i}.example/page{n}", page["title"], page["text"])
+    return copies * len(pages)
+
+
+async def _latencies(store: PageStore, repeat: int) -> Dict[str, float]:
+    samples: List[float] = []
+    for _ in range(repeat):
+        for query in QUERIES:
+            start = time.perf_counter()
+            await store.search(query, 5)
+            samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 2),
+    }
+
+
+async def run_bench(corpus: Path = DEFAULT_CORPUS, copies: int = 50, repeat: int = 5) -> Dict[str, Any]:
+    """Store `copies` of every corpus page, then time each query path"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PageStore(str(Path(tmp) / "pages.db"), chunk_chars=1000)
+        pages = await fill_store(store, corpus, copies)
+        report: Dict[str, Any] = {"pages": pages, **(await store.stats())}
+        if store.fts_enabled:
+            report["fts"] = await _latencies(store, repeat)
+        store.fts_enabled = False
+        report["like"] = await _latencies(store, repeat)
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Query latency of search_fetched over stored pages")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS,
+                        help="Directory of page.html / page.txt pairs")
+    parser.add_argument("--copies", type=int, default=50, help="Copies of each corpus page to store")
+    parser.add_argument("--repeat", type=int, default=5, help="Passes over the query set")
+    parser.add_argument("--json", action="store_true", help="Print JSON report")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_bench(args.corpus, args.copies, args.repeat))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"[OK] {report['pages']} pages, {report['chunks']} chunks")
+        for mode in ("fts", "like"):
+            if mode in report:
+                r = report[mode]
+                print(f"  {mode:<5} p50 {r['p50_ms']:>8.2f} ms  p95 {r['p95_ms']:>8.2f} ms")
+    return report
+
+
+if __name__ == "__main__":
+    main()
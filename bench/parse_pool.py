@@ -0,0 +1,100 @@
+# ABOUTME: Benchmark inline versus process-pool page extraction
+# ABOUTME: Wall time and worst event-loop stall while extracting many large pages at once
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench.extraction import DEFAULT_CORPUS, load_corpus
+from tools.extract import extract_body
+from tools.parse_pool import ParsePool, default_workers
+
+
+def build_pages(corpus: Path, count: int, copies: int) -> List[bytes]:
+    """Corpus pages with their main content repeated `copies` times"""
+    pages = []
+    for page in load_corpus(corpus):
+        html = page["html"]
+        body = html[html.index("<body"):html.rindex("</body>")]
+        pages.append(html.replace(body, body * copies).encode())
+    return [pages[i % len(pages)] for i in range(count)]
+
+
+async def _measure(pool: ParsePool, pages: List[bytes]) -> Dict[str, Any]:
+    stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal stall
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            stall = max(stall, time.perf_counter() - start - 0.005)
+
+    async def extract(body: bytes):
+        if pool.enabled:
+            return await pool.extract(body, "text/html")
+        # Inline: the parse runs on the event loop thread
+        await asyncio.sleep(0)
+        return extract_body(body, "text/html")
+
+    watcher = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(extract(body) for body in pages))
+    wall = time.perf_counter() - start
+    done = True
+    await watcher
+    return {"wall_s": round(wall, 3), "max_stall_ms": round(stall * 1000, 1)}
+
+
+async def run_bench(corpus: Path = DEFAULT_CORPUS, pages: int = 32, copies: int = 40,
+                    workers: Optional[int] = None) -> Dict[str, Any]:
+    """Extract `pages` large pages concurrently, inline and through the pool"""
+    bodies = build_pages(corpus, pages, copies)
+    workers = workers if workers is not None else max(1, default_workers())
+    report: Dict[str, Any] = {"pages": len(bodies), "mean_kb": round(sum(map(len, bodies)) / len(bodies) / 1024, 1),
+                              "workers": workers}
+
+    report["inline"] = await _measure(ParsePool(workers=0), bodies)
+
+    pool = ParsePool(workers=workers, min_bytes=0)
+    pool.warm()
+    # Wait for the workers to finish starting, as a long-running client would
+    await pool.extract(bodies[0], "text/html")
+    report["pool"] = await _measure(pool, bodies)
+    await pool.close()
+
+    report["speedup"] = round(report["inline"]["wall_s"] / report["pool"]["wall_s"], 2)
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Inline versus process-pool extraction of large pages")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS,
+                        help="Directory of page.html / page.txt pairs")
+    parser.add_argument("--pages", type=int, default=32, help="Pages extracted concurrently")
+    parser.add_argument("--copies", type=int, default=40, help="Times each page body is repeated")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: cores - 1)")
+    parser.add_argument("--json", action="store_true", help="Print JSON report")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_bench(args.corpus, args.pages, args.copies, args.workers))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"[OK] {report['pages']} pages of ~{report['mean_kb']} KB, {report['workers']} worker(s)")
+        for mode in ("inline", "pool"):
+            r = report[mode]
+            print(f"  {mode:<7} {r['wall_s']:>7.3f} s  worst loop stall {r['max_stall_ms']:>7.1f} ms")
+        print(f"  Speedup {report['speedup']}x")
+    return report
+
+
+if __name__ == "__main__":
+    main()
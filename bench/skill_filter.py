@@ -0,0 +1,104 @@
+# ABOUTME: Micro-benchmark for the streaming skill-message filter
+# ABOUTME: Replays a recorded stream as small text chunks and times per-chunk filtering
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agent.events import normalize, TextEvent, TEXT
+from agent.replay import load_recording, deserialize_message
+from agent.skill_filter import SkillFilter
+
+DEFAULT_RECORDING = Path(__file__).parent.parent / "tests" / "fixtures" / "streams" / "research_turn.json"
+
+
+def legacy_is_skill_message(text: str) -> bool:
+    """The per-chunk check the front ends used before SkillFilter"""
+    if not isinstance(text, str):
+        return False
+    skill_indicators = ["skill is running", "skill is loading", "ABOUTME:", "# "]
+    text_lower = text.lower().strip()
+    for indicator in skill_indicators:
+        if indicator.lower() in text_lower:
+            return True
+    if text.strip().startswith("#") and len(text) > 100:
+        return True
+    return False
+
+
+def build_stream(recording: Path, chunks: int, chunk_size: int = 16) -> List[TextEvent]:
+    """Text events of a recording, split into token-sized chunks and repeated"""
+    messages = [deserialize_message(entry["message"])
+                for turn in load_recording(recording)["turns"] for entry in turn["messages"]]
+    base = []
+    for message_index, message in enumerate(messages):
+        for event in normalize(message, message_index):
+            if event.kind != TEXT:
+                continue
+            for start in range(0, len(event.text), chunk_size):
+                base.append((event.text[start:start + chunk_size], event.role, message_index))
+    if not base:
+        raise ValueError(f"No text in {recording}")
+
+    stream = []
+    offset = 0
+    while len(stream) < chunks:
+        for text, role, index in base:
+            stream.append(TextEvent(text, role, offset + index))
+        offset += len(messages)
+    return stream[:chunks]
+
+
+def run_bench(recording: Path = DEFAULT_RECORDING, chunks: int = 200_000,
+              repeat: int = 5) -> Dict[str, Any]:
+    """Best-of-`repeat` nanoseconds per chunk for both filters"""
+    stream = build_stream(recording, chunks)
+
+    def legacy():
+        return sum(1 for event in stream if event.role == "assistant" and not legacy_is_skill_message(event.text))
+
+    def streaming():
+        skill_filter = SkillFilter()
+        return sum(1 for event in stream if skill_filter.accept(event))
+
+    report = {"chunks": len(stream)}
+    for name, fn in (("legacy", legacy), ("streaming", streaming)):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            shown = fn()
+            elapsed = time.perf_counter_ns() - start
+            best = elapsed if best is None else min(best, elapsed)
+        report[name] = {"ns_per_chunk": round(best / len(stream), 1), "shown": shown}
+    report["speedup"] = round(report["legacy"]["ns_per_chunk"] / report["streaming"]["ns_per_chunk"], 2)
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Per-chunk cost of skill-message filtering")
+    parser.add_argument("--recording", type=Path, default=DEFAULT_RECORDING,
+                        help="Stream recorded with --record")
+    parser.add_argument("--chunks", type=int, default=200_000, help="Chunks to filter")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per filter (best is reported)")
+    parser.add_argument("--json", action="store_true", help="Print JSON report")
+    args = parser.parse_args(argv)
+
+    report = run_bench(args.recording, args.chunks, args.repeat)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"[OK] {report['chunks']} chunks")
+        for name in ("legacy", "streaming"):
+            r = report[name]
+            print(f"  {name:<10} {r['ns_per_chunk']:>8.1f} ns/chunk  ({r['shown']} shown)")
+        print(f"  Speedup    {report['speedup']}x")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# ABOUTME: Benchmark terminal write syscalls and CPU for streamed replies
+# ABOUTME: Per-chunk print(flush=True) versus the coalescing writer and the rich renderer
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rich.console import Console
+from bench.skill_filter import DEFAULT_RECORDING, build_stream
+from cli.output import CoalescingWriter
+from cli.rich_display import MarkdownStream
+
+
+class CountingSink(io.RawIOBase):
+    """Raw file that counts write() calls (one per syscall on a real fd)"""
+
+    def __init__(self):
+        self.writes = 0
+        self.bytes = 0
+        self._devnull = os.open(os.devnull, os.O_WRONLY)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.writes += 1
+        self.bytes += len(data)
+        return os.write(self._devnull, data)
+
+    def close(self):
+        if not self.closed:
+            os.close(self._devnull)
+        super().close()
+
+
+def _terminal(sink: CountingSink) -> io.TextIOWrapper:
+    # Line buffered like stdout on a tty
+    return io.TextIOWrapper(io.BufferedWriter(sink), encoding="utf-8", line_buffering=True)
+
+
+async def _replay(chunks: List[str], rate: float, write):
+    """Feed chunks at `rate` chunks per second"""
+    interval = 1.0 / rate if rate else 0.0
+    start = time.perf_counter()
+    for i, chunk in enumerate(chunks):
+        write(chunk)
+        if interval:
+            delay = start + (i + 1) * interval - time.perf_counter()
+            await asyncio.sleep(max(0.0, delay))
+        else:
+            await asyncio.sleep(0)
+
+
+async def _measure(chunks: List[str], rate: float, mode: str) -> Dict[str, Any]:
+    sink = CountingSink()
+    stream = _terminal(sink)
+    cpu = time.process_time()
+    wall = time.perf_counter()
+
+    if mode == "print":
+        await _replay(chunks, rate, lambda text: print(text, end="", flush=True, file=stream))
+    elif mode == "coalesced":
+        out = CoalescingWriter(stream)
+        await _replay(chunks, rate, out.write)
+        out.flush()
+    else:
+        console = Console(file=stream, force_terminal=True, width=100)
+        md = MarkdownStream(console)
+        md.start()
+        await _replay(chunks, rate, md.feed)
+        md.finish()
+
+    stream.flush()
+    result = {
+        "syscalls": sink.writes,
+        "bytes": sink.bytes,
+        "cpu_ms": round((time.process_time() - cpu) * 1000, 1),
+        "wall_s": round(time.perf_counter() - wall, 2),
+    }
+    stream.close()
+    return result
+
+
+async def run_bench(recording: Path = DEFAULT_RECORDING, chunks: int = 5000,
+                    rate: float = 1000.0) -> Dict[str, Any]:
+    """Replay a recorded reply through each output path"""
+    texts = [event.text for event in build_stream(recording, chunks) if event.role == "assistant"]
+    report: Dict[str, Any] = {"chunks": len(texts), "rate": rate}
+    for mode in ("print", "coalesced", "rich"):
+        report[mode] = await _measure(texts, rate, mode)
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Terminal output syscalls and CPU per streamed reply")
+    parser.add_argument("--recording", type=Path, default=DEFAULT_RECORDING,
+                        help="Stream recorded with --record")
+    parser.add_argument("--chunks", type=int, default=5000, help="Chunks to replay")
+    parser.add_argument("--rate", type=float, default=1000.0,
+                        help="Chunks per second (0 = as fast as possible)")
+    parser.add_argument("--json", action="store_true", help="Print JSON report")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_bench(args.recording, args.chunks, args.rate))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"[OK] {report['chunks']} chunks at {report['rate']:g}/s")
+        for mode in ("print", "coalesced", "rich"):
+            r = report[mode]
+            print(f"  {mode:<10} {r['syscalls']:>7} writes  {r['cpu_ms']:>8.1f} ms CPU  "
+                  f"{r['bytes']:>9} bytes  {r['wall_s']} s")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+# ABOUTME: Streaming conversation exporter (Markdown, JSONL, HTML)
+# ABOUTME: Writes rows in chunks as they are read, optional gzip, parallel multi-session export
+
+import argparse
+import asyncio
+import gzip
+import html
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from agent.memory import MemoryManager
+
+FORMATS = ("md", "jsonl", "html")
+
+# (session_id, messages written, total messages)
+ProgressFn = Callable[[str, int, int], None]
+
+_HTML_STYLE = """
+body { font-family: system-ui, sans-serif; max-width: 860px; margin: 2em auto; color: #222; }
+.msg { border-left: 4px solid #ccc; margin: 1em 0; padding: 0.5em 1em; }
+.user { border-color: #3b82f6; } .assistant { border-color: #22c55e; } .tool { border-color: #aaa; }
+.meta { color: #777; font-size: 0.85em; }
+pre { white-space: pre-wrap; word-wrap: break-word; font-family: inherit; margin: 0.5em 0 0; }
+details pre { font-family: monospace; font-size: 0.85em; }
+"""
+
+
+class _MarkdownFormat:
+    suffix = ".md"
+
+    def header(self, session_id: str, total: int) -> str:
+        return (f"# Conversation Export\n\n"
+                f"**Session ID:** {session_id}\n"
+                f"**Exported:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f"**Total Messages:** {total}\n\n"
+                f"---\n\n")
+
+    def row(self, session_id: str, msg: Dict[str, Any]) -> str:
+        role = msg['role']
+        if role == 'user':
+            title = "👤 User"
+        elif role == 'assistant':
+            title = "🤖 Assistant"
+        elif role == 'tool':
+            # Skip tool messages in export (too verbose)
+            return ""
+        else:
+            title = role
+        return f"### {title} ({msg['timestamp']})\n\n{msg['content']}\n\n---\n\n"
+
+    def footer(self) -> str:
+        return ""
+
+
+class _JsonlFormat:
+    suffix = ".jsonl"
+
+    def header(self, session_id: str, total: int) -> str:
+        return ""
+
+    def row(self, session_id: str, msg: Dict[str, Any]) -> str:
+        return json.dumps({"session_id": session_id, **msg}, ensure_ascii=False) + "\n"
+
+    def footer(self) -> str:
+        return ""
+
+
+class _HtmlFormat:
+    """Self-contained page: inline CSS, no scripts or external assets"""
+    suffix = ".html"
+
+    def header(self, session_id: str, total: int) -> str:
+        title = html.escape(f"Conversation {session_id}")
+        return (f"<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+                f"<title>{title}</title>\n<style>{_HTML_STYLE}</style>\n</head>\n<body>\n"
+                f"<h1>Conversation Export</h1>\n"
+                f"<p class=\"meta\">Session {html.escape(session_id)} &middot; "
+                f"exported {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} &middot; "
+                f"{total} messages</p>\n")
+
+    def row(self, session_id: str, msg: Dict[str, Any]) -> str:
+        role = html.escape(msg['role'])
+        content = html.escape(msg['content'])
+        meta = f"<div class=\"meta\">{role} &middot; {html.escape(msg['timestamp'])}</div>"
+        if msg['role'] == 'tool':
+            body = f"<details><summary>tool call</summary><pre>{content}</pre></details>"
+        else:
+            body = f"<pre>{content}</pre>"
+        return f"<div class=\"msg {role}\">{meta}{body}</div>\n"
+
+    def footer(self) -> str:
+        return "</body>\n</html>\n"
+
+
+_FORMATTERS = {"md": _MarkdownFormat, "jsonl": _JsonlFormat, "html": _HtmlFormat}
+
+
+class ConversationExporter:
+    """Export sessions without holding them in memory
+
+    Rows are streamed from MemoryManager.iter_messages, formatted, and
+    written in `chunk_bytes` chunks from a worker thread so several
+    exports can run on one event loop.
+    """
+
+    def __init__(self, memory: MemoryManager, chunk_bytes: int = 65536, batch_size: int = 500):
+        self.memory = memory
+        self.chunk_bytes = chunk_bytes
+        self.batch_size = batch_size
+
+    @staticmethod
+    def default_path(session_id: str, fmt: str, compress: bool = False,
+                     directory: str = "storage/exports") -> Path:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix = _FORMATTERS[fmt].suffix + (".gz" if compress else "")
+        return Path(directory) / f"conversation_{session_id[:8]}_{timestamp}{suffix}"
+
+    async def export_session(self, session_id: str, output_path: Optional[str] = None,
+                             fmt: str = "md", compress: bool = False,
+                             progress: Optional[ProgressFn] = None) -> str:
+        """Write one session to output_path
+
+        Returns:
+            Path to exported file
+        """
+        if fmt not in _FORMATTERS:
+            raise ValueError(f"Unknown export format: {fmt} (expected one of {', '.join(FORMATS)})")
+        formatter = _FORMATTERS[fmt]()
+        path = Path(output_path) if output_path else self.default_path(session_id, fmt, compress)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        total = (await self.memory.get_message_stats(session_id))["total_messages"]
+        opener = gzip.open if compress else open
+        out = await asyncio.to_thread(opener, path, "wt", encoding="utf-8", newline="")
+        try:
+            buffer: List[str] = [formatter.header(session_id, total)]
+            size = len(buffer[0])
+            written = 0
+            async for msg in self.memory.iter_messages(session_id, batch_size=self.batch_size):
+                chunk = formatter.row(session_id, msg)
+                buffer.append(chunk)
+                size += len(chunk)
+                written += 1
+                if size >= self.chunk_bytes:
+                    await asyncio.to_thread(out.write, "".join(buffer))
+                    buffer.clear()
+                    size = 0
+                    if progress:
+                        progress(session_id, written, total)
+            buffer.append(formatter.footer())
+            await asyncio.to_thread(out.write, "".join(buffer))
+        finally:
+            await asyncio.to_thread(out.close)
+
+        if progress:
+            progress(session_id, written, total)
+        return str(path)
+
+    async def export_sessions(self, session_ids: List[str], directory: str = "storage/exports",
+                              fmt: str = "md", compress: bool = False, concurrency: int = 4,
+                              progress: Optional[ProgressFn] = None) -> List[str]:
+        """Export several sessions in parallel, one file each"""
+        semaphore = asyncio.Semaphore(concurrency)
+        suffix = _FORMATTERS[fmt].suffix + (".gz" if compress else "")
+
+        async def one(session_id: str) -> str:
+            async with semaphore:
+                path = Path(directory) / f"conversation_{session_id}{suffix}"
+                return await self.export_session(session_id, str(path), fmt=fmt,
+                                                 compress=compress, progress=progress)
+
+        return await asyncio.gather(*(one(s) for s in session_ids))
+
+
+def _print_progress(session_id: str, written: int, total: int):
+    print(f"[INFO] {session_id[:8]}: {written}/{total} messages", file=sys.stderr)
+
+
+async def _run(args) -> List[str]:
+    memory = MemoryManager(db_path=args.db)
+    await memory.initialize()
+    session_ids = args.sessions
+    if args.all:
+        sessions = await memory.list_all_sessions(limit=args.limit)
+        session_ids = [s["session_id"] for s in sessions]
+    exporter = ConversationExporter(memory)
+    return await exporter.export_sessions(
+        session_ids, directory=args.output, fmt=args.format, compress=args.gzip,
+        concurrency=args.concurrency, progress=_print_progress
+    )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Export conversations")
+    parser.add_argument("sessions", nargs="*", help="Session ids to export")
+    parser.add_argument("--all", action="store_true", help="Export the most recent sessions")
+    parser.add_argument("--limit", type=int, default=1000, help="Sessions exported by --all")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="md")
+    parser.add_argument("-o", "--output", default="storage/exports", help="Output directory")
+    parser.add_argument("--gzip", action="store_true", help="Compress output files")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Parallel exports")
+    parser.add_argument("--db", default="storage/agent.db", help="Database path")
+    args = parser.parse_args(argv)
+    if not args.sessions and not args.all:
+        parser.error("give session ids or --all")
+
+    paths = asyncio.run(_run(args))
+    print(f"[OK] Exported {len(paths)} session(s) to {args.output}", file=sys.stderr)
+    return paths
+
+
+if __name__ == "__main__":
+    main()
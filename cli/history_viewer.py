@@ -1,9 +1,8 @@
 # ABOUTME: Conversation history management
 # ABOUTME: View, search, export conversation history
 
-from pathlib import Path
-from datetime import datetime
 from typing import List, Dict, Any, Optional
+from .exporter import ConversationExporter
 
 
 class HistoryViewer:
@@ -12,18 +11,19 @@ class HistoryViewer:
     def __init__(self, memory_manager):
         self.memory = memory_manager
 
-    async def get_recent_messages(self, session_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+    async def get_recent_messages(self, session_id: str, limit: int = 10,
+                                  offset: int = 0) -> List[Dict[str, Any]]:
         """Get recent messages from session
 
         Args:
             session_id: Session identifier
             limit: Number of messages to retrieve
+            offset: Number of newer messages to skip (for paging back)
 
         Returns:
             List of message dictionaries with role, content, timestamp
         """
-        messages = await self.memory.get_messages(session_id, limit=limit)
-        return messages
+        return await self.memory.get_messages(session_id, limit=limit, offset=offset)
 
     async def search_messages(self, session_id: str, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search messages in session
@@ -34,74 +34,26 @@ class HistoryViewer:
             limit: Maximum results to return
 
         Returns:
-            List of matching messages
+            List of matching messages, newest first
         """
-        messages = await self.memory.get_messages(session_id, limit=1000)  # Get all messages
+        # Case-insensitive substring match, resolved by the full-text index
+        return await self.memory.search_messages(session_id, query, limit=limit)
 
-        # Simple search - case insensitive substring match
-        query_lower = query.lower()
-        results = []
-
-        for msg in messages:
-            content = msg.get('content', '')
-            if query_lower in content.lower():
-                results.append(msg)
-                if len(results) >= limit:
-                    break
-
-        return results
-
-    async def export_conversation(self, session_id: str, output_path: Optional[str] = None) -> str:
-        """Export conversation to markdown file
+    async def export_conversation(self, session_id: str, output_path: Optional[str] = None,
+                                  fmt: str = "md", compress: bool = False) -> str:
+        """Export conversation to a file, streaming rows as they are read
 
         Args:
             session_id: Session identifier
             output_path: Optional custom output path
+            fmt: md, jsonl or html
+            compress: Gzip the output
 
         Returns:
             Path to exported file
         """
-        messages = await self.memory.get_messages(session_id, limit=10000)  # Get all
-
-        # Generate filename if not provided
-        if not output_path:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = f"storage/exports/conversation_{timestamp}.md"
-
-        output_file = Path(output_path)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-
-        # Build markdown content
-        content = f"# Conversation Export\n\n"
-        content += f"**Session ID:** {session_id}\n"
-        content += f"**Exported:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        content += f"**Total Messages:** {len(messages)}\n\n"
-        content += "---\n\n"
-
-        for msg in messages:
-            role = msg.get('role', 'unknown')
-            text = msg.get('content', '')
-            timestamp = msg.get('timestamp', '')
-
-            if role == 'user':
-                content += f"### 👤 User ({timestamp})\n\n"
-                content += f"{text}\n\n"
-            elif role == 'assistant':
-                content += f"### 🤖 Assistant ({timestamp})\n\n"
-                content += f"{text}\n\n"
-            elif role == 'tool':
-                # Skip tool messages in export (too verbose)
-                continue
-            else:
-                content += f"### {role} ({timestamp})\n\n"
-                content += f"{text}\n\n"
-
-            content += "---\n\n"
-
-        # Write to file
-        output_file.write_text(content, encoding='utf-8')
-
-        return str(output_file)
+        exporter = ConversationExporter(self.memory)
+        return await exporter.export_session(session_id, output_path, fmt=fmt, compress=compress)
 
     async def get_conversation_stats(self, session_id: str) -> Dict[str, Any]:
         """Get statistics about the conversation
@@ -112,18 +64,5 @@ class HistoryViewer:
         Returns:
             Dictionary with conversation stats
         """
-        messages = await self.memory.get_messages(session_id, limit=10000)
-
-        user_msgs = sum(1 for m in messages if m.get('role') == 'user')
-        assistant_msgs = sum(1 for m in messages if m.get('role') == 'assistant')
-        tool_msgs = sum(1 for m in messages if m.get('role') == 'tool')
-
-        total_chars = sum(len(m.get('content', '')) for m in messages if m.get('role') in ['user', 'assistant'])
-
-        return {
-            'total_messages': len(messages),
-            'user_messages': user_msgs,
-            'assistant_messages': assistant_msgs,
-            'tool_messages': tool_msgs,
-            'total_characters': total_chars
-        }
+        # Counts and character sums are aggregated in SQL
+        return await self.memory.get_message_stats(session_id)
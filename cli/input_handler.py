@@ -23,7 +23,7 @@ class InputHandler:
 
         # Command autocomplete
         commands = WordCompleter([
-            '/help', '/stats', '/history', '/search', '/export',
+            '/help', '/stats', '/perf', '/history', '/search', '/export',
             '/clear', '/exit'
         ], ignore_case=True)
 
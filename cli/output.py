@@ -0,0 +1,52 @@
+# ABOUTME: Coalescing terminal writer for streamed output
+# ABOUTME: Merges small chunks into frames flushed on newline, size or a short timer
+
+import asyncio
+import sys
+from typing import List, Optional, TextIO
+
+
+class CoalescingWriter:
+    """Write streamed chunks to a terminal in frames
+
+    Chunks are buffered and written with one write+flush when a chunk
+    contains a newline, when `max_bytes` characters are pending, when
+    `max_delay` seconds have passed since the first pending chunk, or on
+    flush(). Without a running event loop every write is flushed.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, max_delay: float = 0.02,
+                 max_bytes: int = 8192):
+        self.stream = stream or sys.stdout
+        self.max_delay = max_delay
+        self.max_bytes = max_bytes
+        self.frames = 0
+        self._parts: List[str] = []
+        self._size = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def write(self, text: str):
+        if not text:
+            return
+        self._parts.append(text)
+        self._size += len(text)
+        if "\n" in text or self._size >= self.max_bytes:
+            self.flush()
+        elif self._timer is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush()
+                return
+            self._timer = loop.call_later(self.max_delay, self.flush)
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._parts:
+            self.stream.write("".join(self._parts))
+            self.stream.flush()
+            self._parts.clear()
+            self._size = 0
+            self.frames += 1
@@ -0,0 +1,128 @@
+# ABOUTME: Non-interactive pipe mode speaking a JSONL event protocol
+# ABOUTME: Prompts from stdin, typed events (text, tool_use, tool_result, cost, done) to stdout
+
+import asyncio
+import contextlib
+import json
+import sys
+from typing import Any, BinaryIO, Dict, Optional
+from agent.client import AssistantClient
+from agent.events import Event, TEXT, TOOL_USE, TOOL_RESULT, RESULT
+
+
+class JsonlEventWriter:
+    """Buffered, low-latency JSONL writer
+
+    Events are encoded into an in-memory buffer and written with one
+    syscall when the buffer passes `max_bytes`, when `max_delay` seconds
+    have passed since the first unflushed event, or on flush().
+    """
+
+    def __init__(self, stream: BinaryIO, max_delay: float = 0.01, max_bytes: int = 65536):
+        self.stream = stream
+        self.max_delay = max_delay
+        self.max_bytes = max_bytes
+        self._buffer = bytearray()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def write(self, event: Dict[str, Any]):
+        line = json.dumps(event, ensure_ascii=False, separators=(",", ":"), default=str)
+        self._buffer += line.encode("utf-8")
+        self._buffer += b"\n"
+        if len(self._buffer) >= self.max_bytes:
+            self.flush()
+        elif self._timer is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush()
+                return
+            self._timer = loop.call_later(self.max_delay, self.flush)
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffer:
+            self.stream.write(self._buffer)
+            self.stream.flush()
+            self._buffer.clear()
+
+
+def protocol_event(event: Event) -> Optional[Dict[str, Any]]:
+    """Map a stream event onto the pipe protocol"""
+    kind = event.kind
+    if kind == TEXT:
+        return {"type": "text", "text": event.text, "role": event.role}
+    if kind == TOOL_USE:
+        return {"type": "tool_use", "id": event.id, "name": event.name, "input": event.input}
+    if kind == TOOL_RESULT:
+        return {"type": "tool_result", "tool_use_id": event.tool_use_id,
+                "content": event.content, "is_error": event.is_error}
+    if kind == RESULT:
+        return {"type": "cost", "total_cost_usd": event.total_cost_usd}
+    return None
+
+
+def _parse_prompt(line: str) -> Optional[Dict[str, Any]]:
+    """Accept plain text lines or {"id": ..., "prompt": ...} objects"""
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        try:
+            item = json.loads(line)
+            if isinstance(item, dict) and "prompt" in item:
+                return item
+        except ValueError:
+            pass
+    return {"prompt": line}
+
+
+async def run_pipe(client: AssistantClient, stdin=None, stdout: Optional[BinaryIO] = None):
+    """Serve prompts from stdin until EOF"""
+    stdin = stdin or sys.stdin
+    writer = JsonlEventWriter(stdout or sys.stdout.buffer)
+
+    turn = 0
+    while True:
+        line = await asyncio.to_thread(stdin.readline)
+        if not line:
+            break
+        item = _parse_prompt(line)
+        if item is None:
+            continue
+
+        turn += 1
+        ids = {"turn": turn}
+        if "id" in item:
+            ids["id"] = item["id"]
+
+        try:
+            async for event in client.send_message(item["prompt"]):
+                data = protocol_event(event)
+                if data is None:
+                    continue
+                data.update(ids)
+                writer.write(data)
+                if event.kind != TEXT:
+                    writer.flush()
+        except Exception as e:
+            writer.write({"type": "error", "error": f"{type(e).__name__}: {e}", **ids})
+
+        writer.write({"type": "done", **ids})
+        writer.flush()
+
+    writer.flush()
+
+
+async def run_pipe_mode(resume: bool = False):
+    """Pipe entry point: status output goes to stderr, events to stdout"""
+    stdout = sys.stdout.buffer
+    with contextlib.redirect_stdout(sys.stderr):
+        client = AssistantClient(resume=resume, permission_prompt=None)
+        await client.initialize()
+        try:
+            await run_pipe(client, stdout=stdout)
+        finally:
+            await client.close()
@@ -1,16 +1,172 @@
 # ABOUTME: Rich terminal display module
 # ABOUTME: Markdown rendering, panels, syntax highlighting, progress indicators
 
+import asyncio
+import re
+import time
 from rich.console import Console
 from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.live import Live
+from rich.padding import Padding
 from rich.spinner import Spinner
 from rich.syntax import Syntax
 from rich.table import Table
 from rich.text import Text
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+
+_FENCES = ("```", "~~~")
+# Bullet or numbered list item
+_LIST_ITEM = re.compile(r"^\s*([-*+]|\d+[.)])\s")
+
+
+class MarkdownStream:
+    """Incremental Markdown rendering for a streamed reply
+
+    Text is split into blocks at blank lines outside code fences, unless
+    the block holds a list or ends indented and the next non-blank line
+    continues it (a loose list item, a later number, an indented
+    paragraph), since a committed block is never re-rendered. Each
+    finished block is rendered once and printed above a Live region; only
+    the still-open trailing block is re-parsed, at most `max_fps` times a
+    second, so per-token cost does not grow with the reply. Finished blocks
+    and the Live update of one frame go out in a single terminal write.
+    """
+
+    def __init__(self, console: Console, max_fps: float = 12.0):
+        self.console = console
+        self.interval = 1.0 / max_fps
+        self.live = Live(console=console, auto_refresh=False, transient=True)
+        self.frames = 0
+        self._parts: List[str] = []
+        self._block: List[str] = []
+        self._finished: List[str] = []
+        self._line = ""
+        self._in_fence = False
+        # Blank lines held back while a list or indented block may continue
+        self._blanks = 0
+        self._committed = 0
+        self._last_frame = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def start(self):
+        self.live.start()
+
+    def feed(self, text: str):
+        self._parts.append(text)
+        lines = (self._line + text).split("\n")
+        self._line = lines.pop()
+        for line in lines:
+            self._add_line(line)
+        self._schedule()
+
+    def _add_line(self, line: str):
+        if not line.strip() and not self._in_fence:
+            if self._blanks or self._may_continue():
+                self._blanks += 1
+            else:
+                self._commit()
+            return
+        if self._blanks:
+            if self._continues(line):
+                self._block.extend([""] * self._blanks)
+                self._blanks = 0
+            else:
+                self._commit()
+        if line.lstrip().startswith(_FENCES):
+            self._in_fence = not self._in_fence
+        self._block.append(line)
+
+    def _may_continue(self) -> bool:
+        """Whether lines after a blank could still belong to the open block"""
+        if not self._block:
+            return False
+        return self._block[-1][:1] in (" ", "\t") or any(_LIST_ITEM.match(b) for b in self._block)
+
+    def _continues(self, line: str) -> bool:
+        if line[:1] in (" ", "\t"):
+            return True
+        return bool(_LIST_ITEM.match(line)) and any(_LIST_ITEM.match(b) for b in self._block)
+
+    def _trailing(self) -> str:
+        lines = self._block + [""] * self._blanks
+        if self._line:
+            return "\n".join(lines + [self._line])
+        return "\n".join(self._block)
+
+    def _render(self, source: str, markdown: bool = True):
+        return Padding(Markdown(source) if markdown else Text(source), (0, 1))
+
+    def _commit(self):
+        """Close the open block; it is printed with the next frame"""
+        source = "\n".join(self._block)
+        self._block = []
+        self._blanks = 0
+        if source.strip():
+            self._finished.append(source)
+
+    def _print_finished(self, markdown: bool = True):
+        for source in self._finished:
+            if self._committed:
+                self.console.print()
+            self.console.print(self._render(source, markdown))
+            self._committed += 1
+        self._finished.clear()
+
+    def flush_block(self):
+        """Commit the open block including its partial line (e.g. before a tool notice)"""
+        if self._line:
+            self._block.append(self._line)
+            self._line = ""
+        self._commit()
+        self._refresh()
+
+    def _schedule(self):
+        """Redraw now if the frame budget allows, otherwise once the budget frees up"""
+        wait = self.interval - (time.monotonic() - self._last_frame)
+        if wait <= 0:
+            self._refresh()
+        elif self._timer is None:
+            try:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._refresh)
+            except RuntimeError:
+                pass  # No loop: the next feed() or finish() draws the frame
+
+    def _refresh(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Console context buffers the whole frame into one write
+        with self.console:
+            self._print_finished()
+            self.live.update(self._render(self._trailing()), refresh=True)
+        self._last_frame = time.monotonic()
+        self.frames += 1
+
+    def finish(self, markdown: bool = True) -> str:
+        """Print what is left and stop the Live region; returns the full text"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._line:
+            self._block.append(self._line)
+            self._line = ""
+        self._commit()
+        with self.console:
+            # Earlier blocks were complete Markdown; only the tail follows `markdown`
+            last = self._finished.pop() if self._finished else None
+            self._print_finished()
+            if last is not None:
+                self._finished.append(last)
+                self._print_finished(markdown)
+            self.live.update(Text(""))
+        self.live.stop()
+        return self.text
 
 
 class RichDisplay:
@@ -20,6 +176,7 @@ class RichDisplay:
         self.console = Console()
         self.live_display: Optional[Live] = None
         self.current_message = ""
+        self.stream: Optional[MarkdownStream] = None
 
     def print_banner(self):
         """Display welcome banner"""
@@ -42,9 +199,10 @@ class RichDisplay:
 
         help_table.add_row("/help", "Show this help")
         help_table.add_row("/stats", "Show session statistics")
+        help_table.add_row("/perf", "Show latency percentiles (p50/p95/p99)")
         help_table.add_row("/history [N]", "View last N messages (default 10)")
         help_table.add_row("/search <query>", "Search conversation history")
-        help_table.add_row("/export", "Export conversation to markdown")
+        help_table.add_row("/export [md|jsonl|html] [gz]", "Export conversation (default markdown)")
         help_table.add_row("/clear", "Clear screen")
         help_table.add_row("/exit", "Exit assistant")
         help_table.add_row("Ctrl+C", "Interrupt current response")
@@ -106,21 +264,28 @@ class RichDisplay:
     def start_streaming(self):
         """Start live streaming display"""
         self.current_message = ""
+        self.stream = MarkdownStream(self.console)
+        self.live_display = self.stream.live
+        self.stream.start()
 
     def update_stream(self, text: str):
-        """Update streaming message"""
-        self.current_message += text
-        # For now, just accumulate - we'll render at the end
-        # Rich Live() has issues with async, so we accumulate and display at end
+        """Render streamed text as it arrives (throttled, see MarkdownStream)"""
+        if self.stream is None:
+            self.start_streaming()
+        self.stream.feed(text)
 
     def end_stream(self, markdown: bool = True):
-        """Finish streaming and display final message"""
-        if self.current_message:
-            self.show_assistant_message(self.current_message, markdown=markdown)
-            self.current_message = ""
+        """Finish streaming and print the remaining text"""
+        if self.stream is not None:
+            self.current_message = self.stream.finish(markdown=markdown)
+            self.stream = None
+            self.live_display = None
 
     def show_tool_usage(self, tool_name: str):
         """Show tool usage indicator"""
+        if self.stream is not None:
+            # Keep the notice after the text that preceded it
+            self.stream.flush_block()
         self.console.print(
             f"[dim cyan]  ⚙️  Using tool: {tool_name}[/dim cyan]"
         )
@@ -170,6 +335,33 @@ class RichDisplay:
         )
         self.console.print(panel)
 
+    def show_perf(self, rows: list):
+        """Display latency percentiles per traced operation"""
+        perf_table = Table(box=None, padding=(0, 2))
+        perf_table.add_column("Component", style="cyan bold")
+        perf_table.add_column("Operation", style="white")
+        perf_table.add_column("Count", justify="right")
+        perf_table.add_column("p50 ms", justify="right")
+        perf_table.add_column("p95 ms", justify="right")
+        perf_table.add_column("p99 ms", justify="right", style="yellow")
+
+        for row in rows:
+            perf_table.add_row(
+                row['component'],
+                row['name'],
+                str(row['count']),
+                f"{row['p50']:.1f}",
+                f"{row['p95']:.1f}",
+                f"{row['p99']:.1f}"
+            )
+
+        panel = Panel(
+            perf_table,
+            title="[bold cyan]Latency[/bold cyan]",
+            border_style="cyan"
+        )
+        self.console.print(panel)
+
     def show_history(self, messages: list):
         """Display conversation history"""
         if not messages:
@@ -0,0 +1,134 @@
+# ABOUTME: Startup helpers for the CLIs: background imports and import-time profiling
+# ABOUTME: Heavy modules load on a thread while the prompt is already usable
+
+import asyncio
+import importlib
+import re
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# Loaded in the background; agent.client pulls in the SDK and every tool module
+HEAVY_MODULES = (
+    "claude_agent_sdk",
+    "googleapiclient.discovery",
+    "lxml.html",
+    "agent.client",
+)
+
+_IMPORTTIME = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)")
+
+
+class BackgroundImporter:
+    """Import modules on a daemon thread
+
+    Optional third-party modules that are missing are skipped; failures
+    in the agent's own modules are re-raised by wait().
+    """
+
+    def __init__(self, modules: Sequence[str] = HEAVY_MODULES):
+        self.modules = tuple(modules)
+        self.timings: Dict[str, float] = {}
+        self.error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="background-imports", daemon=True)
+
+    def start(self) -> "BackgroundImporter":
+        self._thread.start()
+        return self
+
+    def _run(self):
+        for name in self.modules:
+            start = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                if name.split(".")[0] in ("agent", "cli", "tools"):
+                    self.error = e
+                    return
+            except Exception as e:
+                self.error = e
+                return
+            self.timings[name] = (time.perf_counter() - start) * 1000
+
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def wait(self):
+        """Block until imports finish; re-raise a failed import"""
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    async def wait_async(self):
+        if not self.done:
+            await asyncio.to_thread(self._thread.join)
+        self.wait()
+
+
+def import_profile(entry: str, background: Sequence[str] = HEAVY_MODULES) -> Dict[str, Any]:
+    """Per-module import cost of an entry point, measured in a fresh interpreter
+
+    Returns:
+        {"entry_ms", "background_ms", "modules": [...], "packages": [...]}
+        where modules are (name, self_ms, cumulative_ms, phase) and packages
+        aggregate self time per top-level package
+    """
+    code = f"import {entry}\n" + "".join(f"import {m}\n" for m in background)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=str(Path(__file__).parent.parent)
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+
+    modules = []
+    packages: Dict[str, Dict[str, float]] = {}
+    phase = "prompt"
+    totals = {"prompt": 0.0, "background": 0.0}
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if not match:
+            continue
+        self_ms = int(match.group(1)) / 1000
+        cumulative_ms = int(match.group(2)) / 1000
+        depth = len(match.group(3))
+        name = match.group(4)
+        modules.append({"name": name, "self_ms": self_ms, "cumulative_ms": cumulative_ms, "phase": phase})
+        package = packages.setdefault(name.split(".")[0], {"prompt": 0.0, "background": 0.0})
+        package[phase] += self_ms
+        totals[phase] += self_ms
+        if depth == 1 and name == entry:
+            # Everything after the entry module is the background phase
+            phase = "background"
+
+    return {
+        "entry": entry,
+        "entry_ms": round(totals["prompt"], 1),
+        "background_ms": round(totals["background"], 1),
+        "modules": modules,
+        "packages": sorted(
+            ({"package": name, "prompt_ms": round(p["prompt"], 1), "background_ms": round(p["background"], 1)}
+             for name, p in packages.items()),
+            key=lambda p: p["prompt_ms"] + p["background_ms"], reverse=True
+        ),
+    }
+
+
+def print_import_profile(report: Dict[str, Any], top: int = 20):
+    """Table of the most expensive packages and modules"""
+    print(f"[INFO] Import profile for {report['entry']}")
+    print(f"  Before prompt: {report['entry_ms']:8.1f} ms")
+    print(f"  Background:    {report['background_ms']:8.1f} ms\n")
+
+    print(f"  {'Package':<28} {'prompt ms':>10} {'background ms':>14}")
+    for package in report["packages"][:top]:
+        print(f"  {package['package']:<28} {package['prompt_ms']:>10.1f} {package['background_ms']:>14.1f}")
+
+    print(f"\n  {'Module (cumulative)':<40} {'ms':>9}  phase")
+    slowest = sorted(report["modules"], key=lambda m: m["cumulative_ms"], reverse=True)
+    for module in slowest[:top]:
+        print(f"  {module['name']:<40} {module['cumulative_ms']:>9.1f}  {module['phase']}")
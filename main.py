@@ -5,7 +5,13 @@ import asyncio
 import sys
 import argparse
 from pathlib import Path
-from agent.client import AssistantClient
+from typing import TYPE_CHECKING
+from cli.output import CoalescingWriter
+from cli.startup import BackgroundImporter, import_profile, print_import_profile
+
+# The agent stack (SDK, Google APIs, parsers) loads in the background
+if TYPE_CHECKING:
+    from agent.client import AssistantClient
 
 # ANSI color codes for terminal
 class Colors:
@@ -32,94 +38,67 @@ def print_banner():
     print()
 
 
-def _is_skill_message(text: str) -> bool:
-    """Check if text is a skill-related system message"""
-    if not isinstance(text, str):
-        return False
-
-    # Filter out skill loading messages
-    skill_indicators = [
-        "skill is running",
-        "skill is loading",
-        "ABOUTME:",
-        "# ",  # Markdown headers from skill prompts
-    ]
-
-    text_lower = text.lower().strip()
-
-    # Check for skill indicators
-    for indicator in skill_indicators:
-        if indicator.lower() in text_lower:
-            return True
-
-    # Check if it's a multi-line skill prompt (starts with markdown/headers)
-    if text.strip().startswith("#") and len(text) > 100:
-        return True
-
-    return False
-
-
 def print_help():
     """Display command help"""
     print(f"\n{Colors.SYSTEM}Commands:")
     print(f"  /help     - Show this help")
     print(f"  /stats    - Show session statistics")
+    print(f"  /perf     - Show latency percentiles (p50/p95/p99)")
     print(f"  /clear    - Clear screen")
     print(f"  /exit     - Exit assistant")
     print(f"  Ctrl+C    - Interrupt current response{Colors.RESET}")
     print()
 
 
-async def display_stream(client: AssistantClient, prompt: str):
+def print_perf(rows):
+    """Display latency percentiles per traced operation"""
+    print(f"\n{Colors.SYSTEM}[INFO] Latency (ms):")
+    print(f"  {'component':<8} {'operation':<36} {'count':>6} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for row in rows:
+        print(f"  {row['component']:<8} {row['name']:<36} {row['count']:>6} "
+              f"{row['p50']:>9.1f} {row['p95']:>9.1f} {row['p99']:>9.1f}")
+    print(f"{Colors.RESET}")
+
+
+async def display_stream(client: "AssistantClient", prompt: str):
     """Display streaming response from assistant"""
+    from agent.events import TEXT, TOOL_USE
+    from agent.skill_filter import SkillFilter
+
+    # One write+flush per frame instead of per chunk
+    out = CoalescingWriter(sys.stdout)
     try:
         # Print assistant prefix in color
-        print(f"{Colors.ASSISTANT}", end='', flush=True)
-
-        async for message in client.send_message(prompt):
-            # Handle different message types
-            if hasattr(message, 'type'):
-                if message.type == 'text':
-                    # Filter out skill loading messages
-                    content = message.content
-                    if not _is_skill_message(content):
-                        print(content, end='', flush=True)
-                elif message.type == 'tool_use':
-                    tool_name = getattr(message, 'name', 'unknown')
-                    # Only show non-skill tool usage
-                    if tool_name != 'Skill':
-                        print(f"\n{Colors.SYSTEM}[TOOL] Using: {tool_name}{Colors.ASSISTANT}", flush=True)
-                elif message.type == 'tool_result':
-                    # Tool results are handled internally
-                    pass
-            elif hasattr(message, 'content'):
-                if isinstance(message.content, str):
-                    content = message.content
-                    if not _is_skill_message(content):
-                        print(content, end='', flush=True)
-                elif isinstance(message.content, list):
-                    for block in message.content:
-                        if hasattr(block, 'text'):
-                            text = block.text
-                            if not _is_skill_message(text):
-                                print(text, end='', flush=True)
-                        elif hasattr(block, 'type') and block.type == 'text':
-                            text = block.get('text', '')
-                            if not _is_skill_message(text):
-                                print(text, end='', flush=True)
-
-        print(f"{Colors.RESET}")  # Reset color and newline
+        out.write(Colors.ASSISTANT)
+
+        skill_filter = SkillFilter()
+        async for event in client.send_message(prompt):
+            kind = event.kind
+            if kind == TEXT:
+                # Filter out skill loading messages
+                if skill_filter.accept(event):
+                    out.write(event.text)
+            elif kind == TOOL_USE:
+                # Only show non-skill tool usage
+                if event.name != 'Skill':
+                    out.write(f"\n{Colors.SYSTEM}[TOOL] Using: {event.name}{Colors.ASSISTANT}\n")
+            # Tool results and cost are handled internally
+
+        out.write(f"{Colors.RESET}\n")  # Reset color and newline
 
     except KeyboardInterrupt:
+        out.flush()
         print(f"{Colors.RESET}\n{Colors.ERROR}[INTERRUPTED]{Colors.RESET}")
         if client.client:
             try:
                 await asyncio.wait_for(client.client.interrupt(), timeout=1.0)
             except asyncio.TimeoutError:
                 print(f"{Colors.ERROR}[WARN] Interrupt timeout{Colors.RESET}")
+    finally:
+        out.flush()
 
 
-async def run_interactive(resume: bool = False):
+async def run_interactive(resume: bool = False, record_to: str = None):
     """Run interactive CLI session"""
     print_banner()
 
@@ -128,9 +107,18 @@ async def run_interactive(resume: bool = False):
     else:
         print(f"{Colors.SYSTEM}[INFO] Starting new session...{Colors.RESET}")
 
-    # Initialize client
-    client = AssistantClient(resume=resume)
-    await client.initialize()
+    # Heavy imports run on a thread while the user types the first message
+    importer = BackgroundImporter().start()
+    client = None
+
+    async def get_client():
+        nonlocal client
+        if client is None:
+            await importer.wait_async()
+            from agent.client import AssistantClient
+            client = AssistantClient(resume=resume, record_to=record_to)
+            await client.initialize()
+        return client
 
     print_help()
     print(f"{Colors.SYSTEM}[OK] Ready. Type your message or /help for commands.{Colors.RESET}\n")
@@ -153,7 +141,14 @@ async def run_interactive(resume: bool = False):
                     print_help()
                     continue
 
-                elif user_input == "/stats":
+                elif user_input == "/clear":
+                    print("\033[2J\033[H", end='')  # Clear screen
+                    print_banner()
+                    continue
+
+                client = await get_client()
+
+                if user_input == "/stats":
                     stats = await client.get_session_summary()
                     if stats:
                         print(f"\n{Colors.SYSTEM}[INFO] Session Statistics:")
@@ -164,9 +159,12 @@ async def run_interactive(resume: bool = False):
                         print(f"  Total cost: ${stats['total_cost_usd']:.4f}{Colors.RESET}\n")
                     continue
 
-                elif user_input == "/clear":
-                    print("\033[2J\033[H", end='')  # Clear screen
-                    print_banner()
+                elif user_input == "/perf":
+                    rows = await client.get_perf_summary()
+                    if rows:
+                        print_perf(rows)
+                    else:
+                        print(f"{Colors.SYSTEM}[INFO] No traces recorded yet{Colors.RESET}\n")
                     continue
 
                 elif user_input.startswith("/"):
@@ -187,7 +185,8 @@ async def run_interactive(resume: bool = False):
                 break
 
     finally:
-        await client.close()
+        if client is not None:
+            await client.close()
 
 
 def main():
@@ -198,10 +197,37 @@ def main():
         action="store_true",
         help="Resume last session"
     )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="Record SDK message streams to a replay fixture file"
+    )
+    parser.add_argument(
+        "--pipe",
+        action="store_true",
+        help="Read prompts from stdin, write JSONL events to stdout"
+    )
+    parser.add_argument(
+        "--import-profile",
+        action="store_true",
+        help="Report per-module import cost and exit"
+    )
     args = parser.parse_args()
 
+    if args.import_profile:
+        print_import_profile(import_profile("main"))
+        return
+
+    if args.pipe:
+        from cli.pipe_mode import run_pipe_mode
+        try:
+            asyncio.run(run_pipe_mode(resume=args.resume))
+        except KeyboardInterrupt:
+            sys.exit(130)
+        return
+
     try:
-        asyncio.run(run_interactive(resume=args.resume))
+        asyncio.run(run_interactive(resume=args.resume, record_to=args.record))
     except KeyboardInterrupt:
         print("\n[INFO] Interrupted by user")
         sys.exit(0)
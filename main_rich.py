@@ -5,73 +5,35 @@ import asyncio
 import sys
 import argparse
 from pathlib import Path
-from agent.client import AssistantClient
+from typing import TYPE_CHECKING
 from cli.rich_display import RichDisplay
 from cli.input_handler import InputHandler
-from cli.history_viewer import HistoryViewer
+from cli.startup import BackgroundImporter, import_profile, print_import_profile
 
+# The agent stack (SDK, Google APIs, parsers) loads in the background
+if TYPE_CHECKING:
+    from agent.client import AssistantClient
 
-def _is_skill_message(text: str) -> bool:
-    """Check if text is a skill-related system message"""
-    if not isinstance(text, str):
-        return False
 
-    skill_indicators = [
-        "skill is running",
-        "skill is loading",
-        "ABOUTME:",
-    ]
-
-    text_lower = text.lower().strip()
-
-    for indicator in skill_indicators:
-        if indicator.lower() in text_lower:
-            return True
-
-    if text.strip().startswith("#") and len(text) > 100:
-        return True
-
-    return False
-
-
-async def display_stream(display: RichDisplay, client: AssistantClient, prompt: str):
+async def display_stream(display: RichDisplay, client: "AssistantClient", prompt: str):
     """Display streaming response from assistant"""
+    from agent.events import TEXT, TOOL_USE
+    from agent.skill_filter import SkillFilter
+
     try:
         display.show_assistant_prefix()
         display.start_streaming()
 
-        async for message in client.send_message(prompt):
-            # Handle different message types
-            if hasattr(message, 'type'):
-                if message.type == 'text':
-                    content = message.content
-                    if not _is_skill_message(content):
-                        display.update_stream(content)
-
-                elif message.type == 'tool_use':
-                    tool_name = getattr(message, 'name', 'unknown')
-                    if tool_name != 'Skill':
-                        display.show_tool_usage(tool_name)
-
-                elif message.type == 'tool_result':
-                    pass
-
-            elif hasattr(message, 'content'):
-                if isinstance(message.content, str):
-                    content = message.content
-                    if not _is_skill_message(content):
-                        display.update_stream(content)
-
-                elif isinstance(message.content, list):
-                    for block in message.content:
-                        if hasattr(block, 'text'):
-                            text = block.text
-                            if not _is_skill_message(text):
-                                display.update_stream(text)
-                        elif hasattr(block, 'type') and block.type == 'text':
-                            text = block.get('text', '')
-                            if not _is_skill_message(text):
-                                display.update_stream(text)
+        skill_filter = SkillFilter()
+        async for event in client.send_message(prompt):
+            kind = event.kind
+            if kind == TEXT:
+                if skill_filter.accept(event):
+                    display.update_stream(event.text)
+
+            elif kind == TOOL_USE:
+                if event.name != 'Skill':
+                    display.show_tool_usage(event.name)
 
         display.end_stream(markdown=True)
 
@@ -85,7 +47,7 @@ async def display_stream(display: RichDisplay, client: AssistantClient, prompt:
                 display.show_error("Interrupt timeout")
 
 
-async def run_interactive(resume: bool = False):
+async def run_interactive(resume: bool = False, record_to: str = None):
     """Run rich interactive CLI session"""
     display = RichDisplay()
     input_handler = InputHandler()
@@ -97,12 +59,21 @@ async def run_interactive(resume: bool = False):
     else:
         display.show_info("Starting new session...")
 
-    # Initialize client
-    client = AssistantClient(resume=resume)
-    await client.initialize()
+    # Heavy imports run on a thread while the prompt is already usable;
+    # the client connects as soon as they finish
+    importer = BackgroundImporter().start()
 
-    # Initialize history viewer
-    history_viewer = HistoryViewer(client.memory)
+    async def start_client():
+        await importer.wait_async()
+        from agent.client import AssistantClient
+        client = AssistantClient(resume=resume, record_to=record_to,
+                                 permission_prompt=input_handler.get_input)
+        await client.initialize()
+        return client
+
+    client_task = asyncio.create_task(start_client())
+    client = None
+    history_viewer = None
 
     display.print_help()
     display.show_success("Ready! Type your message or /help for commands.")
@@ -126,12 +97,30 @@ async def run_interactive(resume: bool = False):
                     display.print_help()
                     continue
 
-                elif user_input == "/stats":
+                elif user_input == "/clear":
+                    display.clear_screen()
+                    display.print_banner()
+                    continue
+
+                if client is None:
+                    client = await client_task
+                    from cli.history_viewer import HistoryViewer
+                    history_viewer = HistoryViewer(client.memory)
+
+                if user_input == "/stats":
                     stats = await client.get_session_summary()
                     if stats:
                         display.show_stats(client.session_id, stats)
                     continue
 
+                elif user_input == "/perf":
+                    rows = await client.get_perf_summary()
+                    if rows:
+                        display.show_perf(rows)
+                    else:
+                        display.show_info("No traces recorded yet")
+                    continue
+
                 elif user_input.startswith("/history"):
                     # Parse limit
                     parts = user_input.split()
@@ -157,17 +146,18 @@ async def run_interactive(resume: bool = False):
                         display.show_warning("Usage: /search <query>")
                     continue
 
-                elif user_input == "/export":
+                elif user_input == "/export" or user_input.startswith("/export "):
+                    # /export [md|jsonl|html] [gz]
+                    from cli.exporter import FORMATS
+                    options = user_input.split()[1:]
+                    fmt = next((o for o in options if o in FORMATS), "md")
                     display.show_info("Exporting conversation...")
-                    export_path = await history_viewer.export_conversation(client.session_id)
+                    export_path = await history_viewer.export_conversation(
+                        client.session_id, fmt=fmt, compress="gz" in options
+                    )
                     display.show_success(f"Conversation exported to: {export_path}")
                     continue
 
-                elif user_input == "/clear":
-                    display.clear_screen()
-                    display.print_banner()
-                    continue
-
                 elif user_input.startswith("/"):
                     display.show_warning(f"Unknown command: {user_input}")
                     display.print_help()
@@ -187,7 +177,12 @@ async def run_interactive(resume: bool = False):
                 break
 
     finally:
-        await client.close()
+        if client is None and not client_task.done():
+            client_task.cancel()
+        elif client is None and not client_task.cancelled() and client_task.exception() is None:
+            client = client_task.result()
+        if client is not None:
+            await client.close()
 
 
 def main():
@@ -198,13 +193,27 @@ def main():
         action="store_true",
         help="Resume last session"
     )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="Record SDK message streams to a replay fixture file"
+    )
     parser.add_argument(
         "--simple",
         action="store_true",
         help="Use simple CLI instead of rich UI"
     )
+    parser.add_argument(
+        "--import-profile",
+        action="store_true",
+        help="Report per-module import cost and exit"
+    )
     args = parser.parse_args()
 
+    if args.import_profile:
+        print_import_profile(import_profile("main_rich"))
+        return
+
     if args.simple:
         # Fall back to simple CLI
         import main
@@ -212,7 +221,7 @@ def main():
         return
 
     try:
-        asyncio.run(run_interactive(resume=args.resume))
+        asyncio.run(run_interactive(resume=args.resume, record_to=args.record))
     except KeyboardInterrupt:
         print("\n[INFO] Interrupted by user")
         sys.exit(0)
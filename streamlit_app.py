@@ -2,9 +2,9 @@
 # ABOUTME: Simple chat interface with session management
 
 import streamlit as st
-import asyncio
-from agent.client import AssistantClient
-import nest_asyncio
+import time
+from agent.loop_runner import BackgroundLoop, ClientRegistry
+from agent.skill_filter import SkillFilter
 import os
 
 # Add claude CLI to PATH (needed for Claude Agent SDK)
@@ -12,31 +12,35 @@ npm_bin = r"C:\Users\nitza\AppData\Roaming\npm"
 if npm_bin not in os.environ["PATH"]:
     os.environ["PATH"] = npm_bin + os.pathsep + os.environ["PATH"]
 
-# Allow nested event loops (needed for Streamlit)
-nest_asyncio.apply()
+# Seconds between placeholder redraws while streaming
+RENDER_INTERVAL = 0.05
 
 st.set_page_config(page_title="Personal Assistant", page_icon="🤖", layout="wide")
 
+
+@st.cache_resource
+def get_registry() -> ClientRegistry:
+    """One event loop thread and client registry per server process
+
+    Clients stay connected on this loop across reruns instead of being
+    torn down with a per-rerun asyncio.run().
+    """
+    return ClientRegistry(BackgroundLoop())
+
+
+registry = get_registry()
+
 # Initialize session state
 if "messages" not in st.session_state:
     st.session_state.messages = []
 if "session_id" not in st.session_state:
     st.session_state.session_id = None
-if "client" not in st.session_state:
-    st.session_state.client = None
 
 def initialize_client():
-    """Initialize AssistantClient synchronously"""
-    if st.session_state.client is None:
-        async def _init():
-            client = AssistantClient(session_id=st.session_state.session_id, resume=False)
-            await client.initialize()
-            st.session_state.session_id = client.session_id
-            st.session_state.client = client
-            return client
-
-        return asyncio.run(_init())
-    return st.session_state.client
+    """Connected client for this browser session"""
+    client = registry.get(st.session_state.session_id)
+    st.session_state.session_id = client.session_id
+    return client
 
 # Sidebar
 with st.sidebar:
@@ -46,9 +50,10 @@ with st.sidebar:
         st.success(f"Session: {st.session_state.session_id[:8]}...")
 
     if st.button("New Session"):
+        if st.session_state.session_id:
+            registry.close(st.session_state.session_id)
         st.session_state.messages = []
         st.session_state.session_id = None
-        st.session_state.client = None
         st.rerun()
 
 # Main chat area
@@ -74,20 +79,17 @@ if prompt := st.chat_input("Ask me anything..."):
         try:
             client = initialize_client()
 
-            async def get_response():
-                response_text = ""
-                async for response in client.send_message(prompt):
-                    if hasattr(response, 'type'):
-                        if response.type == 'text' or (hasattr(response, 'content') and isinstance(response.content, str)):
-                            content = response.content if isinstance(response.content, str) else ""
-                            response_text += content
-                        elif hasattr(response, 'content') and isinstance(response.content, list):
-                            for block in response.content:
-                                if hasattr(block, 'text'):
-                                    response_text += block.text
-                return response_text
-
-            full_response = asyncio.run(get_response())
+            skill_filter = SkillFilter()
+            last_render = 0.0
+            for event in registry.runner.stream(client.send_message(prompt)):
+                if skill_filter.accept(event):
+                    full_response += event.text
+                    # Redraw at most every RENDER_INTERVAL to keep websocket traffic bounded
+                    now = time.monotonic()
+                    if now - last_render >= RENDER_INTERVAL:
+                        message_placeholder.markdown(full_response + "▌")
+                        last_render = now
+
             message_placeholder.markdown(full_response)
             st.session_state.messages.append({"role": "assistant", "content": full_response})
 
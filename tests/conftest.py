@@ -11,8 +11,11 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import httpx
 from agent.memory import MemoryManager
 from agent.client import AssistantClient
+from tools.http_cache import HTTPCache
+from tools.research import ResearchTools
 
 
 @pytest.fixture(scope="session")
@@ -49,3 +52,23 @@ async def test_session(memory_manager):
     session_id = "test-session-123"
     await memory_manager.create_session(session_id)
     return session_id
+
+
+@pytest.fixture
+async def research_tools(memory_manager, tmp_path):
+    """Factory for ResearchTools whose network is a MockTransport handler
+
+    Only the network is replaced: requests still pass through the
+    ResilientTransport of tools.client. Every instance is closed afterwards.
+    """
+    created = []
+
+    def make(handler, cache=None, **kwargs):
+        tools = ResearchTools(memory_manager, cache=cache or HTTPCache(str(tmp_path / "cache.db")),
+                              http_transport=httpx.MockTransport(handler), **kwargs)
+        created.append(tools)
+        return tools
+
+    yield make
+    for tools in created:
+        await tools.close()
@@ -0,0 +1,84 @@
+# ABOUTME: Tests for headless batch mode
+# ABOUTME: Verify concurrent runs, streamed results and resume from checkpoint
+
+import pytest
+import json
+from pathlib import Path
+from agent.client import AssistantClient
+from agent.replay import ReplaySDKClient
+from batch import run_batch, completed_ids
+
+FIXTURE = Path(__file__).parent / "fixtures" / "streams" / "research_turn.json"
+
+
+def replay_factory(memory_manager, created):
+    async def factory():
+        client = AssistantClient(permission_prompt=None)
+        client.memory = memory_manager
+        await client.initialize()
+        client.client = ReplaySDKClient(FIXTURE, speed=0)
+        created.append(client)
+        return client
+    return factory
+
+
+def write_prompts(path, count):
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write(json.dumps({"id": f"p{i}", "prompt": f"Question {i}"}) + "\n")
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_all_prompts(memory_manager, tmp_path):
+    prompts = tmp_path / "prompts.jsonl"
+    output = tmp_path / "results.jsonl"
+    write_prompts(prompts, 6)
+    created = []
+
+    summary = await run_batch(str(prompts), str(output), concurrency=3,
+                              client_factory=replay_factory(memory_manager, created))
+
+    assert summary["ok"] == 6
+    assert summary["errors"] == 0
+    assert len(created) <= 3
+    assert summary["cost_usd"] > 0
+
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert {r["id"] for r in results} == {f"p{i}" for i in range(6)}
+    assert all(r["response"] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_batch_resumes_from_results(memory_manager, tmp_path):
+    prompts = tmp_path / "prompts.jsonl"
+    output = tmp_path / "results.jsonl"
+    write_prompts(prompts, 4)
+
+    # Simulate a killed run: two results and a torn final line
+    output.write_text(
+        json.dumps({"id": "p0", "status": "ok"}) + "\n" +
+        json.dumps({"id": "p1", "status": "error"}) + "\n" +
+        '{"id": "p2", "sta'
+    )
+    assert completed_ids(str(output)) == {"p0"}
+
+    created = []
+    summary = await run_batch(str(prompts), str(output), concurrency=2,
+                              client_factory=replay_factory(memory_manager, created))
+
+    assert summary["skipped"] == 1
+    assert summary["ok"] == 3
+    assert completed_ids(str(output)) == {"p0", "p1", "p2", "p3"}
+
+
+@pytest.mark.asyncio
+async def test_batch_recycles_clients(memory_manager, tmp_path):
+    prompts = tmp_path / "prompts.jsonl"
+    output = tmp_path / "results.jsonl"
+    write_prompts(prompts, 4)
+    created = []
+
+    await run_batch(str(prompts), str(output), concurrency=1, recycle_after=2,
+                    client_factory=replay_factory(memory_manager, created))
+
+    assert len(created) == 2
@@ -0,0 +1,164 @@
+# ABOUTME: Tests for the crawl_site breadth-first crawler
+# ABOUTME: Verify scope and depth limits, robots.txt, politeness spacing, dedup and page store feed
+
+import time
+import httpx
+import pytest
+from tools.crawler import RobotsCache
+
+ROBOTS = "User-agent: *\nDisallow: /private\n"
+
+
+def html(title, body, links=()):
+    anchors = "".join(f'<li><a href="{href}">{href}</a></li>' for href in links)
+    return (f"<html><head><title>{title}</title></head><body><nav><ul>{anchors}</ul></nav>"
+            f"<main><p>{body}</p></main></body></html>")
+
+
+SITE = {
+    "/docs/": html("Index", "Welcome to the widget documentation, start with installation.",
+                   ["/docs/install", "install#step-2", "/docs/usage?b=2&a=1", "/private/keys",
+                    "/docs/manual.pdf", "https://elsewhere.example/docs/", "mailto:team@docs.example"]),
+    "/docs/install": html("Install", "Install the widget with pip, then configure the widget daemon.",
+                          ["/docs/", "/docs/usage?a=1&b=2", "/docs/advanced"]),
+    "/docs/usage": html("Usage", "Call widget.run to start processing, with optional retries.",
+                        ["/docs/usage-copy"]),
+    "/docs/usage-copy": html("Usage", "Call widget.run to start processing, with optional retries."),
+    "/docs/advanced": html("Advanced", "Tuning the widget scheduler for heavy workloads.", ["/docs/deep"]),
+    "/docs/deep": html("Deep", "Three hops away from the start page."),
+    "/private/keys": html("Keys", "Secret material."),
+}
+
+
+REDIRECTS = {
+    "/docs": "/docs/",
+    "/docs/moved": "https://elsewhere.example/landing",
+}
+
+
+class Site:
+    def __init__(self, robots=ROBOTS, cache_control=None, pages=SITE):
+        self.robots = robots
+        self.pages = pages
+        self.cache_control = cache_control
+        self.requests = []
+        self.user_agents = set()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((time.monotonic(), request.url.path))
+        self.user_agents.add(request.headers.get("user-agent"))
+        if request.url.host == "elsewhere.example" and request.url.path == "/landing":
+            return httpx.Response(200, headers={"content-type": "text/html"},
+                                  text=html("Elsewhere", "A page on another host entirely."))
+        if request.url.host != "docs.example":
+            return httpx.Response(500)
+        if request.url.path == "/robots.txt":
+            if self.robots is None:
+                return httpx.Response(404)
+            return httpx.Response(200, text=self.robots)
+        if request.url.path in REDIRECTS:
+            return httpx.Response(301, headers={"location": REDIRECTS[request.url.path]})
+        page = self.pages.get(request.url.path)
+        if page is None:
+            return httpx.Response(404)
+        headers = {"content-type": "text/html"}
+        if self.cache_control:
+            headers["cache-control"] = self.cache_control
+        return httpx.Response(200, headers=headers, text=page)
+
+    def paths(self):
+        return [path for _, path in self.requests if path != "/robots.txt"]
+
+
+def make_tools(research_tools, site, crawl_delay=0.0):
+    tools = research_tools(site, crawl_delay=crawl_delay)
+    crawl_site = next(t for t in tools.get_tools() if t.name == "crawl_site")
+    return tools, crawl_site
+
+
+@pytest.mark.asyncio
+async def test_breadth_first_within_scope(research_tools):
+    site = Site()
+    tools, crawl_site = make_tools(research_tools, site)
+
+    result = await crawl_site.handler({"url": "https://docs.example/docs/", "max_depth": 2})
+    text = result["content"][0]["text"]
+
+    # BFS order; query-order variants and fragments collapse to one URL
+    assert site.paths() == ["/docs/", "/docs/install", "/docs/usage", "/docs/advanced", "/docs/usage-copy"]
+    assert text.startswith("[OK] Crawled 4 page(s)")
+    assert "Duplicates: 1" in text
+    assert "Blocked by robots.txt: 1" in text
+    assert sum(1 for _, path in site.requests if path == "/robots.txt") == 1
+
+    found = await tools.pages.search("scheduler workloads")
+    assert found[0]["url"] == "https://docs.example/docs/advanced"
+
+
+@pytest.mark.asyncio
+async def test_page_limit_and_politeness_delay(research_tools):
+    site = Site(robots=None)
+    tools, crawl_site = make_tools(research_tools, site, crawl_delay=0.1)
+
+    result = await crawl_site.handler({"url": "https://docs.example/docs/", "max_pages": 3})
+    assert result["content"][0]["text"].startswith("[OK] Crawled 3 page(s)")
+
+    times = [t for t, path in site.requests if path != "/robots.txt"]
+    assert len(times) == 3
+    assert all(later - earlier >= 0.09 for earlier, later in zip(times, times[1:]))
+
+
+@pytest.mark.asyncio
+async def test_robots_crawl_delay_and_forbidden(memory_manager, tmp_path):
+    site = Site(robots="User-agent: *\nCrawl-delay: 3\n")
+    robots = RobotsCache()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(site))
+    assert await robots.crawl_delay(client, "https://docs.example/docs/") == 3.0
+
+    def forbidden(request):
+        return httpx.Response(403)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(forbidden))
+    assert not await RobotsCache().allowed(client, "https://docs.example/docs/")
+
+
+@pytest.mark.asyncio
+async def test_links_resolve_against_the_redirect_target(research_tools):
+    index = SITE["/docs/"].replace("</ul>", '<li><a href="moved">moved</a></li></ul>')
+    site = Site(pages={**SITE, "/docs/": index})
+    tools, crawl_site = make_tools(research_tools, site)
+    result = await crawl_site.handler({"url": "https://docs.example/docs", "max_depth": 1})
+    text = result["content"][0]["text"]
+
+    # "install#step-2" on /docs (served from /docs/) is /docs/install, not /install
+    assert "/install" not in site.paths()
+    assert "/docs/install" in site.paths()
+    assert "Index - https://docs.example/docs/\n" in text
+    # The off-host redirect target is neither stored nor expanded
+    assert "Elsewhere" not in text
+    assert await tools.pages.get_page("https://elsewhere.example/landing") is None
+    assert await tools.pages.get_page("https://docs.example/docs/") is not None
+    assert site.user_agents == {"ResearchAssistant"}
+
+
+@pytest.mark.asyncio
+async def test_fresh_cache_hits_skip_the_politeness_delay(research_tools):
+    site = Site(robots=None, cache_control="max-age=3600")
+    tools, crawl_site = make_tools(research_tools, site, crawl_delay=0.2)
+    await crawl_site.handler({"url": "https://docs.example/docs/", "max_pages": 3})
+    fetched = len(site.paths())
+
+    start = time.monotonic()
+    result = await crawl_site.handler({"url": "https://docs.example/docs/", "max_pages": 3})
+    assert result["content"][0]["text"].startswith("[OK] Crawled 3 page(s)")
+    assert len(site.paths()) == fetched
+    assert time.monotonic() - start < 0.2
+
+
+@pytest.mark.asyncio
+async def test_unreachable_seed_is_an_error(research_tools):
+    site = Site()
+    tools, crawl_site = make_tools(research_tools, site)
+    result = await crawl_site.handler({"url": "https://docs.example/missing"})
+    assert result["isError"]
+    assert "404" in result["content"][0]["text"]
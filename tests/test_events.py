@@ -0,0 +1,52 @@
+# ABOUTME: Tests for the typed stream event model
+# ABOUTME: Verify SDK messages normalize into compact events
+
+import pytest
+from types import SimpleNamespace
+from claude_agent_sdk import (AssistantMessage, UserMessage, ResultMessage, SystemMessage,
+                              TextBlock, ToolUseBlock, ToolResultBlock)
+from agent.events import (normalize, event_to_dict, TextEvent, ToolUseEvent, ToolResultEvent,
+                          ResultEvent, SystemEvent, TEXT, TOOL_USE, TOOL_RESULT, RESULT)
+
+
+def test_assistant_message_blocks():
+    message = AssistantMessage(
+        content=[TextBlock(text="Searching"), ToolUseBlock(id="t1", name="web_search", input={"query": "x"})],
+        model="m"
+    )
+    events = normalize(message, index=3)
+
+    assert [e.kind for e in events] == [TEXT, TOOL_USE]
+    assert events[0] == TextEvent("Searching", "assistant", 3)
+    assert events[1] == ToolUseEvent("t1", "web_search", {"query": "x"})
+
+
+def test_user_message_tool_result_and_injected_text():
+    message = UserMessage(content=[
+        ToolResultBlock(tool_use_id="t1", content="ok", is_error=None),
+        TextBlock(text="Base directory for this skill: /skills/xlsx"),
+    ])
+    events = normalize(message)
+
+    assert events[0] == ToolResultEvent("t1", "ok", False)
+    assert events[1].role == "user"
+
+
+def test_result_and_system_messages():
+    result = ResultMessage(subtype="success", duration_ms=10, duration_api_ms=8, is_error=False,
+                           num_turns=1, session_id="abc", total_cost_usd=0.5)
+    assert normalize(result) == [ResultEvent(0.5, "abc", False, 10, None)]
+
+    system = SystemMessage(subtype="init", data={"session_id": "abc"})
+    assert normalize(system)[0] == SystemEvent("init", {"session_id": "abc"})
+
+
+def test_duck_typed_fallback():
+    events = normalize(SimpleNamespace(content="hello", total_cost_usd=0.1))
+    assert [e.kind for e in events] == [TEXT, RESULT]
+
+
+def test_events_use_slots():
+    event = TextEvent("x")
+    assert not hasattr(event, "__dict__")
+    assert event_to_dict(event) == {"type": TEXT, "text": "x", "role": "assistant", "message_index": 0}
@@ -0,0 +1,78 @@
+# ABOUTME: Tests for the streaming conversation exporter
+# ABOUTME: Verify Markdown, JSONL, HTML, gzip and parallel export
+
+import gzip
+import json
+import pytest
+from pathlib import Path
+from cli.exporter import ConversationExporter
+from cli.history_viewer import HistoryViewer
+
+
+@pytest.fixture
+async def exporter(memory_manager):
+    for session_id in ("s1", "s2", "s3"):
+        await memory_manager.create_session(session_id)
+        for i in range(40):
+            await memory_manager.save_message(session_id, "user", f"{session_id} question {i} <b>&")
+            await memory_manager.save_message(session_id, "assistant", f"answer {i}")
+        await memory_manager.save_message(session_id, "tool", '{"tool": "web_search"}')
+    # Small chunks and batches so the streaming paths are exercised
+    return ConversationExporter(memory_manager, chunk_bytes=256, batch_size=7)
+
+
+@pytest.mark.asyncio
+async def test_markdown_export_keeps_layout(memory_manager, tmp_path):
+    await memory_manager.create_session("s1")
+    await memory_manager.save_message("s1", "user", "Hello")
+    await memory_manager.save_message("s1", "tool", "{}")
+    await memory_manager.save_message("s1", "assistant", "Hi there")
+
+    path = await HistoryViewer(memory_manager).export_conversation("s1", str(tmp_path / "c.md"))
+    text = Path(path).read_text(encoding="utf-8")
+    assert "**Total Messages:** 3" in text
+    assert text.index("Hello") < text.index("Hi there")
+    assert "{}" not in text
+
+
+@pytest.mark.asyncio
+async def test_jsonl_export_streams_every_row(exporter, tmp_path):
+    progress = []
+    path = await exporter.export_session("s1", str(tmp_path / "s1.jsonl"), fmt="jsonl",
+                                         progress=lambda *p: progress.append(p))
+    rows = [json.loads(line) for line in Path(path).read_text(encoding="utf-8").splitlines()]
+    assert len(rows) == 81
+    assert rows[0]["content"] == "s1 question 0 <b>&"
+    assert [r["id"] for r in rows] == sorted(r["id"] for r in rows)
+    # Several chunk flushes, ending at the full count
+    assert len(progress) > 2
+    assert progress[-1] == ("s1", 81, 81)
+
+
+@pytest.mark.asyncio
+async def test_html_export_is_escaped_and_gzipped(exporter, tmp_path):
+    path = await exporter.export_session("s2", str(tmp_path / "s2.html.gz"), fmt="html", compress=True)
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        page = f.read()
+    assert page.startswith("<!DOCTYPE html>")
+    assert page.rstrip().endswith("</html>")
+    assert "&lt;b&gt;&amp;" in page
+    assert "<b>&" not in page
+    assert "<script" not in page
+
+
+@pytest.mark.asyncio
+async def test_parallel_export_of_many_sessions(exporter, tmp_path):
+    paths = await exporter.export_sessions(["s1", "s2", "s3"], directory=str(tmp_path),
+                                           fmt="md", concurrency=2)
+    assert [Path(p).name for p in paths] == ["conversation_s1.md", "conversation_s2.md", "conversation_s3.md"]
+    for session_id, path in zip(("s1", "s2", "s3"), paths):
+        text = Path(path).read_text(encoding="utf-8")
+        assert f"{session_id} question 39" in text
+        assert text.count("### 👤 User") == 40
+
+
+@pytest.mark.asyncio
+async def test_unknown_format_rejected(exporter):
+    with pytest.raises(ValueError):
+        await exporter.export_session("s1", fmt="pdf")
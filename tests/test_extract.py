@@ -0,0 +1,71 @@
+# ABOUTME: Tests for main-content extraction on the saved page corpus
+# ABOUTME: Verify density scoring beats the fixed selection and both scoring paths agree
+
+import lxml.html
+import pytest
+from bench.extraction import REAL_CORPUS, load_corpus, run_bench, token_f1
+from tools.extract import extract_html, select_main, _Features, _scores_python
+
+PAGES = load_corpus()
+REAL_PAGES = load_corpus(REAL_CORPUS)
+
+
+@pytest.mark.parametrize("page", PAGES, ids=[p["name"] for p in PAGES])
+def test_density_engine_finds_main_content(page):
+    extracted = extract_html(page["html"])
+    assert token_f1(extracted["text"], page["expected"]) >= 0.9
+
+
+@pytest.mark.parametrize("page", REAL_PAGES, ids=[p["name"] for p in REAL_PAGES])
+def test_density_engine_on_real_pages(page):
+    extracted = extract_html(page["html"])
+    assert token_f1(extracted["text"], page["expected"]) >= 0.9
+
+
+def test_density_beats_fixed_selection():
+    """On the hand-written pages, built around layouts the fixed chain gets wrong"""
+    fixed = sum(token_f1(extract_html(p["html"], "fixed")["text"], p["expected"]) for p in PAGES)
+    density = sum(token_f1(extract_html(p["html"])["text"], p["expected"]) for p in PAGES)
+    assert density > fixed
+
+
+def test_article_teasers_do_not_win():
+    page = next(p for p in PAGES if p["name"] == "news_teasers")
+    text = extract_html(page["html"])["text"]
+    assert "eleven kilometres of protected cycle lanes" in text
+    assert "Old bridge to close" not in text
+
+
+def test_landmark_wins_without_its_link_lists():
+    """rustdoc's description outscores its long trait listings; <main> keeps both"""
+    listing = "".join(f"<section><h3>impl Trait{i} for bool</h3><code>fn call_{i}(self)</code></section>"
+                      for i in range(20))
+    related = "".join(f"<li><a href='/r{i}'>Related page {i}</a></li>" for i in range(6))
+    html = (f"<html><body><main><div class='docblock'><p>{'The boolean type, with commas, words. ' * 20}</p>"
+            f"</div>{listing}<ul>{related}</ul></main></body></html>")
+
+    text = extract_html(html)["text"]
+    assert "The boolean type" in text and "impl Trait19 for bool" in text
+    assert "Related page" not in text
+    assert "Related page" in extract_html(html, "fixed")["text"]
+
+
+def test_numpy_and_python_scores_agree():
+    pytest.importorskip("numpy")
+    from tools.extract import _scores_numpy
+    for page in PAGES + REAL_PAGES:
+        features = _Features(lxml.html.document_fromstring(page["html"]))
+        assert _scores_numpy(features) == pytest.approx(_scores_python(features))
+
+
+def test_link_only_page_falls_back_to_body():
+    html = "<html><body><a href='/a'>Home</a> <a href='/b'>About</a></body></html>"
+    assert select_main(lxml.html.document_fromstring(html)) is None
+    assert extract_html(html)["text"] == "Home\nAbout"
+
+
+def test_benchmark_reports_speed_and_quality():
+    report = run_bench(repeat=1)
+    assert report["pages"] == len(PAGES)
+    assert report["density_python"]["f1"] > report["lxml_fixed"]["f1"]
+    assert report["density_python"]["ms_per_page"] > 0
@@ -0,0 +1,114 @@
+# ABOUTME: Tests for the parallel fetch_urls tool
+# ABOUTME: Verify concurrency limits, per-URL status and wall time
+
+import asyncio
+import sqlite3
+import time
+import httpx
+import pytest
+
+
+class SlowServer:
+    """Async handler tracking concurrent requests overall and per host"""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.active = {}
+        self.peak = {}
+        self.peak_total = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.active[host] = self.active.get(host, 0) + 1
+        self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        self.peak_total = max(self.peak_total, sum(self.active.values()))
+        try:
+            await asyncio.sleep(self.delay)
+            if request.url.path == "/missing":
+                return httpx.Response(404)
+            html = f"<html><head><title>{host}</title></head><body><main>Page {request.url.path}</main></body></html>"
+            return httpx.Response(200, headers={"content-type": "text/html", "cache-control": "no-store"},
+                                  content=html.encode())
+        finally:
+            self.active[host] -= 1
+
+
+def make_tools(research_tools, server, **limits):
+    tools = research_tools(server, **limits)
+    fetch_urls = next(t for t in tools.get_tools() if t.name == "fetch_urls")
+    return tools, fetch_urls
+
+
+@pytest.mark.asyncio
+async def test_ten_sources_take_about_one_page_time(research_tools):
+    server = SlowServer(delay=0.2)
+    tools, fetch_urls = make_tools(research_tools, server)
+    urls = [f"https://site{i}.example/page" for i in range(10)]
+
+    start = time.perf_counter()
+    result = await fetch_urls.handler({"urls": urls})
+    elapsed = time.perf_counter() - start
+
+    text = result["content"][0]["text"]
+    assert text.startswith("[OK] Fetched 10/10 URL(s)")
+    assert elapsed < 0.2 * 3  # Ten sequential fetches would take 2s
+
+
+@pytest.mark.asyncio
+async def test_global_and_per_host_limits(research_tools):
+    server = SlowServer(delay=0.05)
+    tools, fetch_urls = make_tools(research_tools, server,
+                                   max_concurrency=3, per_host_concurrency=1)
+    urls = [f"https://{host}.example/{i}" for host in ("a", "b", "c", "d") for i in range(3)]
+
+    await fetch_urls.handler({"urls": urls})
+
+    assert server.peak_total <= 3
+    assert all(peak == 1 for peak in server.peak.values())
+
+
+@pytest.mark.asyncio
+async def test_per_url_status_and_errors(research_tools):
+    server = SlowServer(delay=0)
+    tools, fetch_urls = make_tools(research_tools, server)
+
+    result = await fetch_urls.handler({"urls": ["https://ok.example/doc", "https://ok.example/missing"],
+                                       "max_chars": 5})
+    text = result["content"][0]["text"]
+
+    assert "[OK] Fetched 1/2 URL(s)" in text
+    assert "Status: ok" in text
+    assert "Status: error" in text
+    assert "404" in text
+    assert "Page " in text and "Page /doc" not in text  # Truncated to max_chars
+    assert result["isError"] is False
+
+
+@pytest.mark.asyncio
+async def test_any_per_url_failure_is_reported_not_raised(research_tools, monkeypatch):
+    tools, fetch_urls = make_tools(research_tools, SlowServer(delay=0))
+    put = tools.pages.put
+
+    async def locked_for_one_host(url, *args):
+        if "locked.example" in url:
+            raise sqlite3.OperationalError("database is locked")
+        return await put(url, *args)
+    monkeypatch.setattr(tools.pages, "put", locked_for_one_host)
+
+    result = await fetch_urls.handler({"urls": ["https://ok.example/doc", "http://[::1",
+                                                "https://locked.example/doc"]})
+    text = result["content"][0]["text"]
+
+    assert "[OK] Fetched 1/3 URL(s)" in text
+    assert "Invalid IPv6 URL" in text
+    assert "database is locked" in text
+
+
+@pytest.mark.asyncio
+async def test_urls_must_be_a_list(research_tools):
+    _, fetch_urls = make_tools(research_tools, SlowServer(delay=0))
+
+    result = await fetch_urls.handler({"urls": "https://ok.example/doc"})
+
+    assert result["isError"]
+    assert result["content"][0]["text"].startswith("[ERROR] urls must be a list")
@@ -0,0 +1,72 @@
+# ABOUTME: Tests for SQL-backed history, search and stats
+# ABOUTME: Verify paging, full-text substring search and aggregate counts
+
+import pytest
+import aiosqlite
+from agent.memory import MemoryManager
+from cli.history_viewer import HistoryViewer
+
+
+@pytest.fixture
+async def viewer(memory_manager):
+    await memory_manager.create_session("s1")
+    await memory_manager.create_session("s2")
+    for i in range(30):
+        await memory_manager.save_message("s1", "user", f"question {i} about asyncio")
+        await memory_manager.save_message("s1", "assistant", f"answer {i}")
+    await memory_manager.save_message("s1", "tool", '{"tool": "web_search"}')
+    await memory_manager.save_message("s2", "user", "asyncio in another session")
+    return HistoryViewer(memory_manager)
+
+
+@pytest.mark.asyncio
+async def test_recent_messages_are_paged_oldest_first(viewer):
+    page = await viewer.get_recent_messages("s1", limit=3)
+    assert [m["content"] for m in page] == ["question 29 about asyncio", "answer 29", '{"tool": "web_search"}']
+
+    older = await viewer.get_recent_messages("s1", limit=2, offset=3)
+    assert [m["content"] for m in older] == ["question 28 about asyncio", "answer 28"]
+
+
+@pytest.mark.asyncio
+async def test_search_is_case_insensitive_substring(viewer):
+    assert viewer.memory.fts_enabled
+    results = await viewer.search_messages("s1", "SYNC", limit=5)
+    assert len(results) == 5
+    assert results[0]["content"] == "question 29 about asyncio"
+    assert all("s2" not in r["content"] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_short_query_uses_like_fallback(viewer):
+    results = await viewer.search_messages("s1", "29", limit=10)
+    assert {r["content"] for r in results} == {"question 29 about asyncio", "answer 29"}
+    # LIKE wildcards in the query are literal
+    assert await viewer.search_messages("s1", "%", limit=10) == []
+
+
+@pytest.mark.asyncio
+async def test_conversation_stats_are_aggregated(viewer):
+    stats = await viewer.get_conversation_stats("s1")
+    assert stats["total_messages"] == 61
+    assert stats["user_messages"] == 30
+    assert stats["assistant_messages"] == 30
+    assert stats["tool_messages"] == 1
+    expected = sum(len(f"question {i} about asyncio") + len(f"answer {i}") for i in range(30))
+    assert stats["total_characters"] == expected
+
+
+@pytest.mark.asyncio
+async def test_index_is_built_for_existing_messages(temp_db):
+    async with aiosqlite.connect(temp_db) as db:
+        await db.execute("""CREATE TABLE messages (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            session_id TEXT NOT NULL, timestamp TEXT NOT NULL,
+                            role TEXT NOT NULL, content TEXT NOT NULL)""")
+        await db.execute("INSERT INTO messages (session_id, timestamp, role, content) "
+                         "VALUES ('old', '2025-01-01', 'user', 'legacy budget notes')")
+        await db.commit()
+
+    memory = MemoryManager(db_path=temp_db)
+    await memory.initialize()
+    results = await memory.search_messages("old", "budget")
+    assert [r["content"] for r in results] == ["legacy budget notes"]
@@ -0,0 +1,104 @@
+# ABOUTME: Tests for the persistent HTTP cache behind fetch_url
+# ABOUTME: Verify fresh hits, conditional revalidation, no-store and LRU eviction
+
+import httpx
+import pytest
+from tools.http_cache import HTTPCache, normalize_url, freshness_lifetime
+
+PAGE = b"<html><head><title>Docs</title></head><body><article><p>Task groups</p></article></body></html>"
+
+
+class Server:
+    """MockTransport handler recording requests"""
+
+    def __init__(self, headers=None):
+        self.requests = []
+        self.headers = {"content-type": "text/html; charset=utf-8", **(headers or {})}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        etag = self.headers.get("etag")
+        if etag and request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"cache-control": "max-age=60"})
+        return httpx.Response(200, headers=self.headers, content=PAGE)
+
+
+def fetch_tool(tools):
+    return next(t for t in tools.get_tools() if t.name == "fetch_url")
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://Example.COM:443?b=2&a=1#frag") == "https://example.com/?a=1&b=2"
+    assert normalize_url("http://example.com:8080/x") == "http://example.com:8080/x"
+
+
+def test_freshness_rules():
+    assert freshness_lifetime({"cache-control": "no-store"}, 0) is None
+    assert freshness_lifetime({"cache-control": "public, max-age=300"}, 0) == 300
+    assert freshness_lifetime({"cache-control": "no-cache, max-age=300"}, 0) == 0
+
+
+def test_s_maxage_is_ignored_by_the_private_cache():
+    assert freshness_lifetime({"cache-control": "s-maxage=600"}, 0) == 0
+    assert freshness_lifetime({"cache-control": "s-maxage=600, max-age=30"}, 0) == 30
+    assert freshness_lifetime({"cache-control": "max-age=30, s-maxage=600"}, 0) == 30
+
+
+@pytest.mark.asyncio
+async def test_fresh_hit_skips_network_and_parsing(research_tools, monkeypatch):
+    server = Server({"cache-control": "max-age=3600"})
+    tools = research_tools(server)
+    fetch_url = fetch_tool(tools)
+
+    first = await fetch_url.handler({"url": "https://example.com/docs"})
+    assert "Task groups" in first["content"][0]["text"]
+
+    def no_parse(*args):
+        raise AssertionError("parsed a cached page")
+    monkeypatch.setattr("tools.research.StreamExtractor", no_parse)
+
+    second = await fetch_url.handler({"url": "https://EXAMPLE.com/docs#intro"})
+    assert second["content"][0]["text"].split("\n", 1)[1] == first["content"][0]["text"].split("\n", 1)[1]
+    assert len(server.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_revalidates_with_etag(research_tools):
+    server = Server({"cache-control": "no-cache", "etag": '"v1"'})
+    tools = research_tools(server)
+
+    first = await tools._fetch("https://example.com/docs")
+    second = await tools._fetch("https://example.com/docs")
+
+    assert not first["from_cache"]
+    assert second["from_cache"]
+    assert second["text"] == first["text"]
+    assert server.requests[1].headers["if-none-match"] == '"v1"'
+
+    # The 304 carried max-age=60, so the next call needs no request
+    await tools._fetch("https://example.com/docs")
+    assert len(server.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_no_store_is_not_cached(research_tools):
+    server = Server({"cache-control": "no-store"})
+    tools = research_tools(server)
+    await tools._fetch("https://example.com/a")
+    await tools._fetch("https://example.com/a")
+    assert len(server.requests) == 2
+    assert (await tools.cache.stats())["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_by_size(tmp_path):
+    cache = HTTPCache(str(tmp_path / "cache.db"), max_bytes=2500)
+    headers = {"cache-control": "max-age=60"}
+    for name in ("a", "b"):
+        await cache.put(f"https://example.com/{name}", 200, headers, b"x" * 1000, {"kind": "text", "text": ""})
+    await cache.get("https://example.com/a")  # a is now more recent than b
+    await cache.put("https://example.com/c", 200, headers, b"x" * 1000, {"kind": "text", "text": ""})
+
+    assert await cache.get("https://example.com/b") is None
+    assert await cache.get("https://example.com/a") is not None
+    assert await cache.get("https://example.com/c") is not None
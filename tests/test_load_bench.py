@@ -0,0 +1,24 @@
+# ABOUTME: Smoke test for the synthetic load generator
+# ABOUTME: Verify concurrent sessions complete and the report is populated
+
+import pytest
+import argparse
+from bench.load import run_load
+
+
+@pytest.mark.asyncio
+async def test_load_generator_report():
+    """Small run produces throughput, latency and RSS figures"""
+    args = argparse.Namespace(
+        sessions=3, turns=2, chunks=3, tool_ratio=1.0,
+        token_delay=0.0, think_time=0.0, db=None, seed=7
+    )
+    report = await run_load(args)
+
+    assert report["turns"] == 6
+    assert report["errors"] == []
+    assert report["turns_per_s"] > 0
+    assert report["turn_latency_ms"]["p99"] >= report["turn_latency_ms"]["p50"]
+    assert report["db_write_ms"]["p50"] > 0
+    assert report["db_write_excess_ms"] >= 0
+    assert "rss_growth_mb" in report
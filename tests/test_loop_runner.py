@@ -0,0 +1,144 @@
+# ABOUTME: Tests for the background event loop runner
+# ABOUTME: Verify coroutines, streaming, cancellation and the client registry
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+import pytest
+from agent.loop_runner import BackgroundLoop, ClientRegistry
+
+
+@pytest.fixture
+def runner():
+    runner = BackgroundLoop()
+    yield runner
+    runner.stop()
+
+
+def test_run_uses_one_persistent_loop(runner):
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    assert runner.run(current_loop()) is runner.loop
+    assert runner.run(current_loop()) is runner.loop
+
+
+def test_stream_yields_items_as_produced(runner):
+    released = threading.Event()
+
+    async def produce():
+        yield 1
+        # The consumer must see the first item before the second exists
+        await asyncio.to_thread(released.wait, 5)
+        yield 2
+
+    stream = runner.stream(produce())
+    assert next(stream) == 1
+    released.set()
+    assert list(stream) == [2]
+
+
+def test_stream_propagates_errors(runner):
+    async def fail():
+        yield "partial"
+        raise ValueError("boom")
+
+    stream = runner.stream(fail())
+    assert next(stream) == "partial"
+    with pytest.raises(ValueError):
+        next(stream)
+
+
+def test_closing_stream_cancels_producer(runner):
+    finished = threading.Event()
+
+    async def endless():
+        try:
+            while True:
+                yield "tick"
+                await asyncio.sleep(0.001)
+        finally:
+            finished.set()
+
+    stream = runner.stream(endless())
+    assert next(stream) == "tick"
+    stream.close()
+    assert finished.wait(5)
+
+
+class FakeClient:
+    def __init__(self, session_id):
+        self.session_id = session_id or "generated"
+        self.loop = asyncio.get_running_loop()
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def test_registry_reuses_clients_on_the_runner_loop(runner):
+    async def factory(session_id):
+        return FakeClient(session_id)
+
+    registry = ClientRegistry(runner, factory=factory)
+    client = registry.get(None)
+    assert client.loop is runner.loop
+    assert registry.get(client.session_id) is client
+    assert len(registry) == 1
+
+    registry.close(client.session_id)
+    assert client.closed
+    assert len(registry) == 0
+
+
+def test_registry_evicts_least_recently_used(runner):
+    async def factory(session_id):
+        return FakeClient(session_id)
+
+    registry = ClientRegistry(runner, factory=factory, max_clients=2)
+    a, b = registry.get("a"), registry.get("b")
+    registry.get("a")
+    c = registry.get("c")
+
+    assert b.closed and not a.closed and not c.closed
+    assert len(registry) == 2
+    assert registry.get("b") is not b
+
+
+def test_registry_evicts_idle_clients(runner):
+    async def factory(session_id):
+        return FakeClient(session_id)
+
+    registry = ClientRegistry(runner, factory=factory, idle_timeout=0.05)
+    old = registry.get("old")
+    time.sleep(0.1)
+    fresh = registry.get("fresh")
+
+    assert old.closed and not fresh.closed
+    assert len(registry) == 1
+    assert registry.evict_idle() == 0
+
+
+def test_registry_connects_outside_the_lock(runner):
+    """A slow connect neither blocks other sessions nor runs twice"""
+    release = threading.Event()
+    calls = []
+
+    async def factory(session_id):
+        calls.append(session_id)
+        if session_id == "slow":
+            await asyncio.to_thread(release.wait, 5)
+        return FakeClient(session_id)
+
+    registry = ClientRegistry(runner, factory=factory)
+    with concurrent.futures.ThreadPoolExecutor(3) as pool:
+        first = pool.submit(registry.get, "slow")
+        second = pool.submit(registry.get, "slow")
+        time.sleep(0.05)
+        other = pool.submit(registry.get, "fast")
+        assert other.result(timeout=1).session_id == "fast"
+
+        release.set()
+        assert first.result(timeout=5) is second.result(timeout=5)
+    assert calls.count("slow") == 1
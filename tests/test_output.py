@@ -0,0 +1,60 @@
+# ABOUTME: Tests for the coalescing terminal writer
+# ABOUTME: Verify frames flush on newline, size, timer and end of stream
+
+import asyncio
+import io
+import pytest
+from cli.output import CoalescingWriter
+from bench.terminal_output import run_bench
+
+
+class Stream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+
+
+@pytest.mark.asyncio
+async def test_chunks_coalesce_until_timer():
+    stream = Stream()
+    out = CoalescingWriter(stream, max_delay=0.01)
+    for word in ("one ", "two ", "three"):
+        out.write(word)
+    assert stream.getvalue() == ""
+
+    await asyncio.sleep(0.05)
+    assert stream.getvalue() == "one two three"
+    assert stream.flushes == 1
+
+
+@pytest.mark.asyncio
+async def test_newline_and_size_flush_immediately():
+    stream = Stream()
+    out = CoalescingWriter(stream, max_delay=10, max_bytes=8)
+    out.write("abc")
+    out.write("d\n")
+    assert stream.getvalue() == "abcd\n"
+    out.write("123456789")
+    assert stream.getvalue() == "abcd\n123456789"
+    out.write("tail")
+    out.flush()
+    assert stream.getvalue().endswith("tail")
+    assert out.frames == 3
+
+
+def test_without_loop_writes_through():
+    stream = Stream()
+    out = CoalescingWriter(stream)
+    out.write("x")
+    assert stream.getvalue() == "x"
+
+
+@pytest.mark.asyncio
+async def test_benchmark_reports_fewer_syscalls():
+    report = await run_bench(chunks=300, rate=0)
+    assert report["print"]["syscalls"] >= report["chunks"]
+    assert report["coalesced"]["syscalls"] < report["print"]["syscalls"]
+    assert report["coalesced"]["bytes"] == report["print"]["bytes"]
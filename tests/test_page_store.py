@@ -0,0 +1,105 @@
+# ABOUTME: Tests for the chunked page store and the read_page tool
+# ABOUTME: Verify chunking, stable handles and progressive reading without refetching
+
+import asyncio
+import httpx
+import pytest
+from tools.page_store import PageStore, split_chunks
+
+
+def long_page(sections=30):
+    paragraphs = "".join(
+        f"<h2>Section {i}</h2><p>Paragraph {i} explains topic-{i} in enough words to be read as content, "
+        f"with commas, detail, and examples about item {i}.</p>" * 8
+        for i in range(sections)
+    )
+    return f"<html><head><title>Manual</title></head><body><main>{paragraphs}</main></body></html>"
+
+
+def make_tools(research_tools, html):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=html.encode())
+
+    tools = research_tools(handler)
+    by_name = {t.name: t for t in tools.get_tools()}
+    return tools, by_name, requests
+
+
+def test_split_chunks_keeps_lines_and_limit():
+    text = "\n".join(f"line {i} " + "x" * 40 for i in range(100))
+    chunks = split_chunks(text, 500)
+    assert all(len(c) <= 500 for c in chunks)
+    assert "\n".join(chunks) == text
+    assert split_chunks("y" * 1200, 500) == ["y" * 500, "y" * 500, "y" * 200]
+
+
+@pytest.mark.asyncio
+async def test_handle_is_stable_across_updates(temp_db):
+    store = PageStore(temp_db, chunk_chars=100)
+    first = await store.put("https://Example.com/doc#top", "Doc", "a\n" * 120)
+    same = await store.put("https://example.com/doc", "Doc", "a\n" * 120)
+    changed = await store.put("https://example.com/doc", "Doc v2", "b\n" * 30)
+
+    assert first["page_id"] == same["page_id"] == changed["page_id"]
+    assert first["chunks"] == 3 and changed["chunks"] == 1
+    assert await store.read_chunk(first["page_id"], 1) == "b\n" * 30
+    assert await store.read_chunk(first["page_id"], 2) is None
+    assert (await store.get_page("https://example.com/doc"))["title"] == "Doc v2"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_puts_of_one_url_share_a_page(temp_db):
+    store = PageStore(temp_db, chunk_chars=100)
+    await store.initialize()
+    urls = ["https://ex.com/final", "https://EX.com/final#intro", "https://ex.com:443/final"] * 3
+
+    pages = await asyncio.gather(*(store.put(url, "Doc", f"version {i}\n" * (i + 20))
+                                   for i, url in enumerate(urls)))
+
+    assert len({p["page_id"] for p in pages}) == 1
+    page = await store.get_page("https://ex.com/final")
+    assert await store.read_chunk(page["page_id"], page["chunks"]) is not None
+    assert await store.read_chunk(page["page_id"], page["chunks"] + 1) is None
+    assert (await store.stats())["pages"] == 1
+
+
+@pytest.mark.asyncio
+async def test_long_document_read_progressively_without_refetch(research_tools):
+    tools, by_name, requests = make_tools(research_tools, long_page())
+
+    fetched = await by_name["fetch_url"].handler({"url": "https://docs.example/manual"})
+    text = fetched["content"][0]["text"]
+    assert "[TIP] Full text stored as page 1" in text
+    assert "topic-29" not in text
+
+    page = await tools.pages.get_page(1)
+    assert page["chunks"] > 3
+
+    last = await by_name["read_page"].handler({"page": "1", "chunk": page["chunks"]})
+    assert "topic-29" in last["content"][0]["text"]
+    assert "[TIP] Next" not in last["content"][0]["text"]
+
+    found = await by_name["read_page"].handler({"page": "https://docs.example/manual", "query": "topic-17"})
+    found_text = found["content"][0]["text"]
+    assert found_text.startswith("[OK]")
+    assert "topic-17" in found_text.split("### Chunk", 2)[1]
+
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_read_page_errors(research_tools):
+    tools, by_name, _ = make_tools(research_tools, long_page(2))
+    await tools._fetch("https://docs.example/short")
+
+    missing = await by_name["read_page"].handler({"page": "99"})
+    assert missing["isError"] and "No stored page" in missing["content"][0]["text"]
+
+    beyond = await by_name["read_page"].handler({"page": "1", "chunk": 50})
+    assert beyond["isError"]
+
+    nothing = await by_name["read_page"].handler({"page": "1", "query": "zebra"})
+    assert nothing["content"][0]["text"].startswith("[INFO]")
@@ -0,0 +1,128 @@
+# ABOUTME: Tests for the process-pool parsing stage
+# ABOUTME: Verify size-based routing, identical results to inline parsing and shutdown
+
+import httpx
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from bench.extraction import load_corpus
+from tools.extract import extract_body
+from tools.http_cache import HTTPCache
+from tools.parse_pool import ParsePool, shared_pool
+from tools.research import ResearchTools
+
+PAGE = next(p for p in load_corpus() if p["name"] == "blog_sidebar")["html"]
+
+
+def padded_page(size):
+    """The blog page with a large hidden block, to push it past the inline limit"""
+    filler = "<script>" + "x" * size + "</script>"
+    return PAGE.replace("</head>", filler + "</head>").encode()
+
+
+def make_tools(research_tools, pages, chunked=False, **kwargs):
+    def handler(request):
+        body = pages[request.url.path]
+        if chunked:
+            # No Content-Length: routing has to happen mid-stream
+            return httpx.Response(200, headers={"content-type": "text/html"}, stream=httpx.ByteStream(body))
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=body)
+
+    return research_tools(handler, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_large_pages_go_to_workers_small_stay_inline(research_tools):
+    pages = {"/small": PAGE.encode(), "/large": padded_page(300 * 1024)}
+    tools = make_tools(research_tools, pages, parse_workers=1)
+
+    small = await tools._fetch("https://example.com/small")
+    assert tools.parse_pool.offloaded == 0
+    large = await tools._fetch("https://example.com/large")
+    assert tools.parse_pool.offloaded == 1
+
+    assert large["text"] == small["text"]
+    assert large["title"] == small["title"]
+    await tools.close()
+    assert tools.parse_pool._executor is None
+
+
+@pytest.mark.asyncio
+async def test_body_without_length_is_rerouted_mid_stream(research_tools):
+    pages = {"/large": padded_page(300 * 1024)}
+    tools = make_tools(research_tools, pages, chunked=True, parse_workers=1)
+
+    extracted = await tools._fetch("https://example.com/large")
+    assert tools.parse_pool.offloaded == 1
+    inline = extract_body(pages["/large"], "text/html")
+    assert {key: extracted[key] for key in inline} == inline
+
+
+@pytest.mark.asyncio
+async def test_disabled_pool_parses_inline():
+    pool = ParsePool(workers=0)
+    pool.warm()
+    extracted = await pool.extract(padded_page(300 * 1024), "text/html", truncated=True)
+    assert extracted["truncated"]
+    assert "container gardening" in extracted["title"]
+    assert pool.offloaded == 0
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_benchmark_keeps_loop_responsive():
+    from bench.parse_pool import run_bench
+    report = await run_bench(pages=4, copies=20, workers=1)
+    assert report["pool"]["max_stall_ms"] < report["inline"]["max_stall_ms"]
+
+
+@pytest.mark.asyncio
+async def test_closed_pool_does_not_rewarm():
+    pool = ParsePool(workers=1)
+    await pool.close()
+    extracted = await pool.extract(padded_page(300 * 1024), "text/html")
+    assert "container gardening" in extracted["title"]
+    assert pool._executor is None and pool.offloaded == 0
+    assert not pool.wants(10 ** 9)
+
+
+class BrokenExecutor:
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("worker died")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+@pytest.mark.asyncio
+async def test_broken_executor_is_shut_down():
+    pool = ParsePool(workers=1)
+    broken = pool._executor = BrokenExecutor()
+    extracted = await pool.extract(padded_page(300 * 1024), "text/html")
+    assert "container gardening" in extracted["title"]
+    assert broken.shut_down and pool._executor is None
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_clients_share_one_pool(memory_manager, tmp_path):
+    pool = ParsePool(workers=1)
+    first = ResearchTools(memory_manager, cache=HTTPCache(str(tmp_path / "a.db")), parse_pool=pool)
+    second = ResearchTools(memory_manager, cache=HTTPCache(str(tmp_path / "b.db")), parse_pool=pool)
+    executor = pool._executor
+    assert first.parse_pool is second.parse_pool
+    await first.close()
+    # Closing one client leaves the shared workers running for the others
+    assert pool._executor is executor and not pool.closed
+    await second.close()
+    await pool.close()
+
+
+def test_shared_pool_is_process_wide():
+    pool = shared_pool()
+    assert shared_pool() is pool
+    pool.shutdown()
+    assert shared_pool() is not pool
+    shared_pool().shutdown()
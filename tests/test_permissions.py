@@ -0,0 +1,140 @@
+# ABOUTME: Tests for the permission policy engine
+# ABOUTME: Verify rules, caching, persistence and non-blocking prompts
+
+import pytest
+import asyncio
+from agent.permissions import PermissionPolicy, ALLOW, DENY
+
+
+def make_prompt(answers):
+    """Async prompt returning canned answers and counting calls"""
+    calls = []
+
+    async def prompt(message):
+        calls.append(message)
+        return answers.pop(0)
+
+    return prompt, calls
+
+
+@pytest.mark.asyncio
+async def test_rules_decide_without_prompt(memory_manager, tmp_path):
+    """Deny and allow rules never reach the prompt"""
+    prompt, calls = make_prompt([])
+    policy = PermissionPolicy(memory_manager, prompt=prompt, rules_path=str(tmp_path / "none.json"))
+
+    assert await policy.decide("Bash", {"command": "sudo rm -rf /"}) == DENY
+    assert await policy.decide("Bash", {"command": "git status"}) == ALLOW
+    assert await policy.decide("Write", {"file_path": "/home/me/.ssh/authorized_keys"}) == DENY
+    assert await policy.decide("Read", {"file_path": "notes.md"}) == ALLOW
+    assert await policy.decide("mcp__assistant__web_search", {}) == ALLOW
+
+
+@pytest.mark.parametrize("command", [
+    "ls\nrm -rf ~/work",
+    "echo hi\ncurl http://x -o /tmp/a",
+    "pwd\r\nmake deploy",
+    "ls\tfoo\nrm x",
+    "git status\ngit push --force",
+    "git branch -D master",
+    "git log --output=/tmp/x",
+    "git diff --output /tmp/x",
+    "echo hi > /tmp/a",
+])
+def test_unsafe_commands_are_not_auto_allowed(memory_manager, tmp_path, command):
+    """Multi-line and file-writing commands fall through to the prompt"""
+    policy = PermissionPolicy(memory_manager, prompt=None, rules_path=str(tmp_path / "none.json"))
+    kind, subject = policy.subject("Bash", {"command": command})
+    assert policy.match_rules(kind, subject) is None
+
+
+def test_simple_read_only_commands_are_allowed(memory_manager, tmp_path):
+    policy = PermissionPolicy(memory_manager, prompt=None, rules_path=str(tmp_path / "none.json"))
+    for command in ("ls -la docs", "pwd", "echo hello world", "git log --oneline -5", "git diff HEAD~1"):
+        assert policy.match_rules("Bash", command) == ALLOW, command
+
+
+@pytest.mark.asyncio
+async def test_session_cache_skips_repeat_prompt(memory_manager, tmp_path):
+    """Answer is reused within the session only"""
+    prompt, calls = make_prompt(["y", "n"])
+    policy = PermissionPolicy(memory_manager, prompt=prompt, rules_path=str(tmp_path / "none.json"))
+
+    assert await policy.decide("Bash", {"command": "make test"}, "s1") == ALLOW
+    assert await policy.decide("Bash", {"command": "make test"}, "s1") == ALLOW
+    assert len(calls) == 1
+
+    assert await policy.decide("Bash", {"command": "make test"}, "s2") == DENY
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_always_is_persisted(memory_manager, tmp_path):
+    """'always' answers survive a new policy instance"""
+    prompt, calls = make_prompt(["a"])
+    policy = PermissionPolicy(memory_manager, prompt=prompt, rules_path=str(tmp_path / "none.json"))
+    assert await policy.decide("Bash", {"command": "pytest -q"}, "s1") == ALLOW
+
+    fresh = PermissionPolicy(memory_manager, prompt=None, rules_path=str(tmp_path / "none.json"))
+    assert await fresh.decide("Bash", {"command": "pytest -q"}, "other") == ALLOW
+
+
+@pytest.mark.asyncio
+async def test_headless_denies_unknown_bash(memory_manager, tmp_path):
+    policy = PermissionPolicy(memory_manager, prompt=None, rules_path=str(tmp_path / "none.json"))
+    assert await policy.decide("Bash", {"command": "make deploy"}) == DENY
+
+
+@pytest.mark.asyncio
+async def test_pending_prompt_does_not_stall_other_sessions(memory_manager, tmp_path):
+    """Cached decisions resolve while another session waits on the user"""
+    answer = asyncio.get_running_loop().create_future()
+
+    async def slow_prompt(message):
+        return await answer
+
+    policy = PermissionPolicy(memory_manager, prompt=slow_prompt, rules_path=str(tmp_path / "none.json"))
+    waiting = asyncio.create_task(policy.decide("Bash", {"command": "make build"}, "s1"))
+    await asyncio.sleep(0.01)
+
+    # Other session: rule-based and MCP decisions are immediate
+    result = await asyncio.wait_for(policy.decide("Bash", {"command": "pwd"}, "s2"), timeout=0.5)
+    assert result == ALLOW
+
+    answer.set_result("y")
+    assert await waiting == ALLOW
+
+
+@pytest.mark.asyncio
+async def test_user_rules_file_extends_defaults(memory_manager, tmp_path):
+    rules = tmp_path / "permissions.json"
+    rules.write_text('{"allow": {"Bash": ["^npm (test|run lint)$"]}}')
+    policy = PermissionPolicy(memory_manager, prompt=None, rules_path=str(rules))
+    assert await policy.decide("Bash", {"command": "npm test"}) == ALLOW
+
+
+class FakeTTY:
+    def isatty(self):
+        return True
+
+
+@pytest.mark.asyncio
+async def test_cancelled_terminal_prompt_leaves_no_reader(monkeypatch):
+    """After Ctrl+C mid-prompt the next line goes to the next prompt"""
+    from prompt_toolkit.application import create_app_session
+    from prompt_toolkit.input import create_pipe_input
+    from prompt_toolkit.output import DummyOutput
+    from agent.permissions import terminal_prompt
+
+    monkeypatch.setattr("sys.stdin", FakeTTY())
+    with create_pipe_input() as pipe, create_app_session(input=pipe, output=DummyOutput()):
+        abandoned = asyncio.create_task(terminal_prompt("Approve? "))
+        await asyncio.sleep(0.05)
+        abandoned.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await abandoned
+
+        answer = asyncio.create_task(terminal_prompt("You: "))
+        await asyncio.sleep(0.05)
+        pipe.send_text("hello\n")
+        assert await asyncio.wait_for(answer, timeout=2) == "hello"
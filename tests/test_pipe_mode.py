@@ -0,0 +1,68 @@
+# ABOUTME: Tests for non-interactive pipe mode
+# ABOUTME: Verify JSONL event protocol and buffered writer
+
+import pytest
+import io
+import json
+from pathlib import Path
+from agent.client import AssistantClient
+from agent.replay import ReplaySDKClient
+from cli.pipe_mode import JsonlEventWriter, run_pipe
+
+FIXTURE = Path(__file__).parent / "fixtures" / "streams" / "research_turn.json"
+
+
+class CountingStream(io.BytesIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+
+@pytest.mark.asyncio
+async def test_pipe_emits_typed_events(memory_manager, test_session):
+    client = AssistantClient(session_id=test_session, permission_prompt=None)
+    client.memory = memory_manager
+    client.client = ReplaySDKClient(FIXTURE, speed=0)
+
+    stdin = io.StringIO('What is new in asyncio?\n\n{"id": "q2", "prompt": "Thanks!"}\n')
+    stdout = io.BytesIO()
+    await run_pipe(client, stdin=stdin, stdout=stdout)
+    await client.flush()
+
+    events = [json.loads(line) for line in stdout.getvalue().decode().splitlines()]
+    types = [e["type"] for e in events]
+
+    assert types.count("done") == 2
+    assert "tool_use" in types
+    assert "tool_result" in types
+    assert types.count("cost") == 2
+    tool_use = next(e for e in events if e["type"] == "tool_use")
+    assert tool_use["name"] == "mcp__assistant__web_search"
+    assert events[-1] == {"type": "done", "turn": 2, "id": "q2"}
+
+
+@pytest.mark.asyncio
+async def test_writer_coalesces_text_events():
+    stream = CountingStream()
+    writer = JsonlEventWriter(stream, max_delay=10)
+    for i in range(100):
+        writer.write({"type": "text", "text": f"token{i} "})
+    assert stream.writes == 0
+
+    writer.flush()
+    assert stream.writes == 1
+    assert len(stream.getvalue().splitlines()) == 100
+
+
+@pytest.mark.asyncio
+async def test_writer_flushes_on_byte_budget():
+    stream = CountingStream()
+    writer = JsonlEventWriter(stream, max_delay=10, max_bytes=256)
+    for i in range(50):
+        writer.write({"type": "text", "text": "x" * 20})
+    assert 1 <= stream.writes < 50
+    writer.flush()
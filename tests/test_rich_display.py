@@ -0,0 +1,85 @@
+# ABOUTME: Tests for incremental Markdown streaming in the rich display
+# ABOUTME: Verify block commits, code fences, frame capping and flat re-parse cost
+
+import io
+from rich.console import Console
+from cli.rich_display import MarkdownStream
+
+
+def make_stream(max_fps=12.0):
+    console = Console(file=io.StringIO(), width=60, force_terminal=True)
+    return MarkdownStream(console, max_fps=max_fps), console
+
+
+def test_finished_blocks_leave_the_live_region():
+    stream, console = make_stream()
+    stream.start()
+    stream.feed("# Title\n\nFirst paragraph.\n\nSecond ")
+    assert stream._trailing() == "Second "
+    assert "Title" in console.file.getvalue()
+    assert stream.finish() == "# Title\n\nFirst paragraph.\n\nSecond "
+
+
+def test_blank_lines_inside_code_fences_do_not_split():
+    stream, _ = make_stream()
+    stream.start()
+    stream.feed("```python\nx = 1\n\ny = 2\n")
+    assert stream._trailing() == "```python\nx = 1\n\ny = 2"
+    stream.feed("```\n\n")
+    assert stream._trailing() == ""
+    stream.finish()
+
+
+def test_frame_rate_is_capped():
+    stream, _ = make_stream(max_fps=5)
+    stream.start()
+    for _ in range(2000):
+        stream.feed("tok ")
+    stream.finish()
+    # First token draws immediately; the rest fall inside the frame budget
+    assert stream.frames <= 3
+
+
+def test_reparsed_text_stays_bounded_on_long_replies():
+    stream, _ = make_stream()
+    stream.start()
+    paragraph = "word " * 50 + "\n\n"
+    longest = 0
+    for _ in range(400):
+        for i in range(0, len(paragraph), 7):
+            stream.feed(paragraph[i:i + 7])
+            longest = max(longest, len(stream._trailing()))
+    stream.finish()
+    assert longest <= len(paragraph)
+
+
+def test_loose_lists_stay_in_one_block():
+    stream, console = make_stream()
+    stream.start()
+    stream.feed("1. First\n\n2. Second\n\n   More about the second.\n\n3. Third\n\n")
+    # The list may still continue, so nothing is committed yet
+    assert stream._finished == [] and stream._committed == 0
+    stream.feed("Afterwards.\n\n")
+    assert stream._finished == ["1. First\n\n2. Second\n\n   More about the second.\n\n3. Third",
+                                "Afterwards."]
+    stream.finish()
+    output = console.file.getvalue()
+    assert "Third" in output and "Afterwards" in output
+
+
+def test_indented_continuation_joins_list_item():
+    stream, _ = make_stream()
+    stream.start()
+    stream.feed("- item\n\n    continued paragraph\n")
+    assert stream._trailing() == "- item\n\n    continued paragraph"
+    stream.feed("\n# Heading\n")
+    assert stream._trailing() == "# Heading"
+    stream.finish()
+
+
+def test_numbered_list_after_paragraph_commits_paragraph():
+    stream, _ = make_stream()
+    stream.start()
+    stream.feed("Intro.\n\n1. one\n")
+    assert stream._trailing() == "1. one"
+    stream.finish()
@@ -0,0 +1,91 @@
+# ABOUTME: Tests for BM25 retrieval over fetched page chunks
+# ABOUTME: Verify ranking, index sync on page updates, the LIKE fallback and the search_fetched tool
+
+import aiosqlite
+import pytest
+from bench.extraction import load_corpus
+from tools.extract import extract_html
+from tools.page_store import PageStore
+from tools.research import ResearchTools
+
+
+async def corpus_store(db_path, chunk_chars=400):
+    store = PageStore(db_path, chunk_chars=chunk_chars)
+    for page in load_corpus():
+        extracted = extract_html(page["html"])
+        await store.put(f"https://{page['name']}.example/", extracted["title"], extracted["text"])
+    return store
+
+
+@pytest.mark.asyncio
+async def test_best_passage_comes_from_the_relevant_page(temp_db):
+    store = await corpus_store(temp_db)
+    assert store.fts_enabled
+
+    results = await store.search("sourdough starter yeast bacteria", 3)
+    assert results[0]["url"] == "https://content_wrapper.example/"
+    assert results[0]["score"] <= results[-1]["score"]
+
+    # Porter stemming: "lenses" matches "lens"
+    results = await store.search("fresnel lenses", 1)
+    assert results[0]["url"] == "https://wiki_article.example/"
+
+
+@pytest.mark.asyncio
+async def test_index_survives_vacuum(temp_db):
+    """Chunks keep their explicit id, so VACUUM cannot desync the index"""
+    store = PageStore(temp_db)
+    await store.put("https://example.com/a", "A", "the quick brown fox")
+    await store.put("https://example.com/b", "B", "a lazy dog sleeps")
+    # Replacing a's chunks leaves a gap in the ids before b's
+    await store.put("https://example.com/a", "A", "an owl hoots at night")
+    async with aiosqlite.connect(temp_db) as db:
+        await db.execute("VACUUM")
+        cursor = await db.execute("SELECT sql FROM sqlite_master WHERE name = 'page_chunks_fts'")
+        assert "content_rowid='id'" in (await cursor.fetchone())[0]
+
+    assert [r["text"] for r in await store.search("dog")] == ["a lazy dog sleeps"]
+    assert [r["text"] for r in await store.search("owl")] == ["an owl hoots at night"]
+
+
+@pytest.mark.asyncio
+async def test_index_follows_page_updates(temp_db):
+    store = PageStore(temp_db)
+    await store.put("https://example.com/a", "A", "the quick brown fox")
+    await store.put("https://example.com/a", "A", "a lazy dog sleeps")
+
+    assert await store.search("fox") == []
+    assert [r["text"] for r in await store.search("dog")] == ["a lazy dog sleeps"]
+
+
+@pytest.mark.asyncio
+async def test_fallback_without_fts_ranks_by_matched_terms(temp_db):
+    store = await corpus_store(temp_db)
+    store.fts_enabled = False
+
+    results = await store.search("tonearm belt motor", 2)
+    assert results[0]["url"] == "https://table_layout.example/"
+
+
+@pytest.mark.asyncio
+async def test_search_fetched_tool(memory_manager):
+    tools = ResearchTools(memory_manager, pages=await corpus_store(memory_manager.db_path))
+    search_fetched = next(t for t in tools.get_tools() if t.name == "search_fetched")
+
+    result = await search_fetched.handler({"query": "cycle lanes council", "max_results": 2})
+    text = result["content"][0]["text"]
+    assert text.startswith("[OK]")
+    assert "URL: https://news_teasers.example/" in text
+    assert "cycle lanes" in text
+
+    nothing = await search_fetched.handler({"query": "quantum chromodynamics"})
+    assert nothing["content"][0]["text"].startswith("[INFO] No fetched page matches")
+    await tools.close()
+
+
+@pytest.mark.asyncio
+async def test_benchmark_reports_both_paths():
+    from bench.page_search import run_bench
+    report = await run_bench(copies=2, repeat=1)
+    assert report["pages"] == 2 * len(load_corpus())
+    assert report["fts"]["p50_ms"] > 0 and report["like"]["p50_ms"] > 0
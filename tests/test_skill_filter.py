@@ -0,0 +1,37 @@
+# ABOUTME: Tests for the streaming skill-message filter
+# ABOUTME: Verify skill chatter is hidden per message and Markdown survives
+
+from agent.events import TextEvent, ToolUseEvent
+from agent.skill_filter import SkillFilter
+from bench.skill_filter import run_bench
+
+
+def test_markdown_headers_are_kept():
+    skill_filter = SkillFilter()
+    assert skill_filter.accept(TextEvent("## Task groups\n", "assistant", 0))
+    assert skill_filter.accept(TextEvent("# Summary", "assistant", 1))
+
+
+def test_skill_message_hidden_for_all_its_chunks():
+    skill_filter = SkillFilter()
+    assert not skill_filter.accept(TextEvent('The "xlsx" skill is loading', "assistant", 0))
+    assert not skill_filter.accept(TextEvent(" more of the same message", "assistant", 0))
+    assert skill_filter.accept(TextEvent("Here is your budget.", "assistant", 1))
+
+
+def test_user_role_and_non_text_events_are_hidden():
+    skill_filter = SkillFilter()
+    assert not skill_filter.accept(TextEvent("Base directory for this skill: /skills/xlsx", "user", 0))
+    assert not skill_filter.accept(ToolUseEvent("t1", "Skill", {}))
+
+
+def test_skill_frontmatter_hidden():
+    skill_filter = SkillFilter()
+    assert not skill_filter.accept(TextEvent("---\nname: xlsx\ndescription: Spreadsheets", "assistant", 0))
+
+
+def test_benchmark_runs_on_recorded_stream():
+    report = run_bench(chunks=2000, repeat=1)
+    assert report["chunks"] == 2000
+    # The legacy check drops Markdown headers from the recorded answer
+    assert report["streaming"]["shown"] > report["legacy"]["shown"]
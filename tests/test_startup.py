@@ -0,0 +1,44 @@
+# ABOUTME: Tests for background imports and import-time profiling
+# ABOUTME: Verify modules load off the main thread and costs are split by phase
+
+import sys
+import pytest
+from cli.startup import BackgroundImporter, import_profile
+
+
+@pytest.mark.asyncio
+async def test_background_importer_loads_modules():
+    importer = BackgroundImporter(("colorsys", "json")).start()
+    await importer.wait_async()
+    assert importer.done
+    assert "colorsys" in sys.modules
+    assert set(importer.timings) == {"colorsys", "json"}
+
+
+def test_missing_optional_module_is_skipped():
+    importer = BackgroundImporter(("not_installed_optional_pkg", "json")).start()
+    importer.wait()
+    assert "json" in importer.timings
+
+
+def test_broken_agent_module_is_reported():
+    importer = BackgroundImporter(("agent.does_not_exist",)).start()
+    with pytest.raises(ImportError):
+        importer.wait()
+
+
+def test_import_profile_splits_phases():
+    report = import_profile("cli.output", background=("colorsys",))
+    phases = {m["name"]: m["phase"] for m in report["modules"]}
+    assert phases["cli.output"] == "prompt"
+    assert phases["colorsys"] == "background"
+    assert report["entry_ms"] > 0
+    assert any(p["package"] == "colorsys" for p in report["packages"])
+
+
+def test_entry_points_defer_the_agent_stack():
+    report = import_profile("main_rich", background=())
+    loaded = {m["name"] for m in report["modules"]}
+    assert "main_rich" in loaded
+    assert "claude_agent_sdk" not in loaded
+    assert "agent.client" not in loaded
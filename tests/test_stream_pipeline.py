@@ -0,0 +1,159 @@
+# ABOUTME: Tests for the bounded streaming pipeline
+# ABOUTME: Verify backpressure policies and persistence off the hot path
+
+import pytest
+import asyncio
+from types import SimpleNamespace
+from agent.client import AssistantClient
+from agent.pipeline import StreamPipeline, BLOCK, DROP, SPILL
+
+
+class FakeSDKClient:
+    """Minimal ClaudeSDKClient stand-in emitting canned messages"""
+
+    def __init__(self, messages):
+        self.messages = messages
+
+    async def query(self, prompt):
+        pass
+
+    async def receive_response(self):
+        for message in self.messages:
+            yield message
+
+    async def disconnect(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_spill_preserves_order():
+    """Events beyond the queue bound are spilled and replayed in order"""
+    seen = []
+    gate = asyncio.Event()
+
+    async def handler(event):
+        await gate.wait()
+        seen.append(event)
+
+    pipeline = StreamPipeline()
+    consumer = pipeline.add_consumer("slow", handler, maxsize=2, policy=SPILL)
+    pipeline.start()
+
+    for i in range(10):
+        await pipeline.publish(i)
+    assert consumer.spilled > 0
+
+    await pipeline.close()
+    gate.set()
+    await pipeline.join()
+
+    assert seen == list(range(10))
+    # Overflow stayed in memory: no disk writes on the producer's path
+    assert consumer.spill._file is None
+
+
+@pytest.mark.asyncio
+async def test_spill_goes_to_disk_only_past_the_memory_cap():
+    seen = []
+    gate = asyncio.Event()
+
+    async def handler(event):
+        await gate.wait()
+        seen.append(event)
+
+    pipeline = StreamPipeline()
+    consumer = pipeline.add_consumer("slow", handler, maxsize=2, policy=SPILL, spill_memory_events=3)
+    pipeline.start()
+
+    for i in range(12):
+        await pipeline.publish(i)
+    stats = pipeline.stats()["slow"]
+    assert stats["spill_on_disk"] > 0
+    assert stats["spill_pending"] - stats["spill_on_disk"] == 3
+
+    await pipeline.close()
+    gate.set()
+    await pipeline.join()
+    assert seen == list(range(12))
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_counts_drops():
+    """Drop policy never blocks the producer"""
+    seen = []
+    gate = asyncio.Event()
+
+    async def handler(event):
+        await gate.wait()
+        seen.append(event)
+
+    pipeline = StreamPipeline()
+    pipeline.add_consumer("analytics", handler, maxsize=2, policy=DROP)
+    pipeline.start()
+
+    for i in range(10):
+        await pipeline.publish(i)
+    await pipeline.close()
+    gate.set()
+    await pipeline.join()
+
+    stats = pipeline.stats()["analytics"]
+    assert stats["dropped"] > 0
+    assert len(seen) + stats["dropped"] == 10
+
+
+@pytest.mark.asyncio
+async def test_consumer_error_does_not_break_stream():
+    """Failing consumer records the error and keeps draining"""
+    seen = []
+
+    async def handler(event):
+        if event == 1:
+            raise RuntimeError("disk full")
+        seen.append(event)
+
+    pipeline = StreamPipeline()
+    pipeline.add_consumer("flaky", handler, policy=BLOCK)
+    pipeline.start()
+    for i in range(3):
+        await pipeline.publish(i)
+    await pipeline.close()
+    await pipeline.join()
+
+    assert seen == [0, 2]
+    assert pipeline.stats()["flaky"]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_persistence_does_not_delay_stream(memory_manager, test_session):
+    """All messages reach the caller before slow DB writes finish"""
+    client = AssistantClient(session_id=test_session)
+    client.memory = memory_manager
+    client.client = FakeSDKClient([
+        SimpleNamespace(content=f"chunk {i} ") for i in range(5)
+    ] + [SimpleNamespace(content="", total_cost_usd=0.02)])
+
+    original_save = memory_manager.save_message
+
+    async def slow_save(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        await original_save(*args, **kwargs)
+
+    memory_manager.save_message = slow_save
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    received = [m async for m in client.send_message("Hello")]
+    stream_time = loop.time() - start
+
+    assert len(received) == 6
+    assert stream_time < 0.05
+
+    # Persistence completes in the background
+    await client.flush()
+    history = await memory_manager.get_session_history(test_session)
+    assert [m['role'] for m in history] == ['user', 'assistant']
+    assert history[1]['content'].startswith("chunk 0")
+
+    stats = await memory_manager.get_session_stats(test_session)
+    assert abs(stats['total_cost_usd'] - 0.02) < 1e-9
@@ -0,0 +1,72 @@
+# ABOUTME: Tests for streamed, byte-capped page downloads
+# ABOUTME: Verify the content-type check skips bodies, the cap stops reading and decoding is incremental
+
+import httpx
+import pytest
+from tools.extract import StreamExtractor
+
+
+class ChunkedBody(httpx.AsyncByteStream):
+    """Response body that records how many chunks were pulled"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.sent = 0
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.sent += 1
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_binary_body_is_never_read(research_tools):
+    body = ChunkedBody([b"\0" * 65536] * 100)
+
+    def handler(request):
+        return httpx.Response(200, headers={"content-type": "application/pdf"}, stream=body)
+
+    tools = research_tools(handler)
+    extracted = await tools._fetch("https://example.com/paper.pdf")
+
+    assert extracted["kind"] == "unsupported"
+    assert body.sent == 0
+
+
+@pytest.mark.asyncio
+async def test_download_stops_at_byte_cap(research_tools):
+    head = b"<html><head><title>Huge</title></head><body><main><p>Intro paragraph</p>"
+    body = ChunkedBody([head] + [b"<p>filler text</p>" * 1000] * 500)
+
+    def handler(request):
+        return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"}, stream=body)
+
+    tools = research_tools(handler, max_page_bytes=64 * 1024)
+    extracted = await tools._fetch("https://example.com/huge")
+
+    assert extracted["title"] == "Huge"
+    assert extracted["text"].startswith("Intro paragraph")
+    assert extracted["truncated"]
+    assert body.sent < 10
+
+    fetch_url = next(t for t in tools.get_tools() if t.name == "fetch_url")
+    result = await fetch_url.handler({"url": "https://example.com/huge"})
+    assert "[INFO] Page exceeds the download limit" in result["content"][0]["text"]
+
+
+def test_multibyte_characters_split_across_chunks():
+    html = "<html><head><title>Café</title></head><body><article>naïve résumé</article></body></html>"
+    data = html.encode("utf-8")
+    extractor = StreamExtractor("text/html", "utf-8")
+    for i in range(len(data)):
+        extractor.feed(data[i:i + 1])
+
+    extracted = extractor.close()
+    assert extracted["title"] == "Café"
+    assert extracted["text"] == "naïve résumé"
+
+
+def test_plain_text_uses_declared_charset():
+    extractor = StreamExtractor("text/plain; charset=latin-1", "latin-1")
+    extractor.feed("déjà vu".encode("latin-1"))
+    assert extractor.close() == {"kind": "text", "text": "déjà vu"}
@@ -0,0 +1,78 @@
+# ABOUTME: Tests for latency tracing
+# ABOUTME: Verify spans for DB and tools, percentiles and OTLP export
+
+import pytest
+import json
+from agent.tracing import Tracer, OTLPJsonExporter, tracer, trace_tools, percentile
+from tools.memory import MemoryTools
+
+
+@pytest.mark.asyncio
+async def test_memory_calls_record_db_spans(memory_manager, test_session):
+    """MemoryManager methods are timed as db spans"""
+    tracer.drain()
+    await memory_manager.save_message(test_session, "user", "Hello")
+
+    spans = tracer.drain()
+    assert any(s.name == "db.save_message" and s.component == "db" for s in spans)
+
+
+@pytest.mark.asyncio
+async def test_tool_spans_record_bytes(memory_manager, test_session):
+    """Wrapped tool handlers record duration and bytes returned"""
+    tools = trace_tools(MemoryTools(memory_manager, test_session).get_tools())
+    save_tool = next(t for t in tools if t.name == "save_memory")
+
+    tracer.drain()
+    result = await save_tool.handler({"category": "personal", "key": "tz", "value": "UTC"})
+
+    spans = [s for s in tracer.drain() if s.component == "tool"]
+    assert len(spans) == 1
+    assert spans[0].name == "tool.save_memory"
+    assert spans[0].bytes == len(result["content"][0]["text"].encode("utf-8"))
+
+
+@pytest.mark.asyncio
+async def test_trace_percentiles_from_table(memory_manager):
+    """Percentiles are computed per operation from the traces table"""
+    local = Tracer()
+    for ms in range(1, 101):
+        local.record("tool.fetch_url", "tool", float(ms))
+    await local.flush(memory_manager)
+
+    rows = await memory_manager.get_trace_percentiles()
+    row = next(r for r in rows if r["name"] == "tool.fetch_url")
+    assert row["count"] == 100
+    assert row["p50"] == 50.0
+    assert row["p95"] == 95.0
+    assert row["p99"] == 99.0
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 11)]
+    assert percentile(values, 50) == 5.0
+    assert percentile(values, 99) == 10.0
+    assert percentile([], 50) == 0.0
+
+
+def test_percentile_odd_sample_count():
+    """Nearest rank rounds up: p50 of five samples is the third"""
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 90) == 5.0
+    assert percentile(values, 10) == 1.0
+    assert percentile([float(v) for v in range(1, 101)], 7) == 7.0
+
+
+def test_otlp_json_export(tmp_path):
+    """Exporter writes one OTLP/JSON request per flush"""
+    path = tmp_path / "traces.jsonl"
+    local = Tracer()
+    local.record("db.save_message", "db", 2.5, bytes=10)
+
+    OTLPJsonExporter(str(path)).export(local.drain())
+
+    request = json.loads(path.read_text().strip())
+    spans = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert spans[0]["name"] == "db.save_message"
+    assert int(spans[0]["endTimeUnixNano"]) > int(spans[0]["startTimeUnixNano"])
@@ -0,0 +1,193 @@
+# ABOUTME: Tests for the resilient outbound HTTP transport
+# ABOUTME: Verify retries with backoff, circuit breaking, per-host rate limits and traced metrics
+
+import asyncio
+import time
+import httpx
+import pytest
+from agent.tracing import tracer
+from tools.transport import CircuitOpenError, ResilientTransport, TokenBucket
+
+
+class Flaky:
+    """Inner transport answering from a script of statuses / exceptions"""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = []
+
+    async def __call__(self, request):
+        self.calls.append((time.monotonic(), request.url.host))
+        step = self.script.pop(0) if len(self.script) > 1 else self.script[0]
+        if isinstance(step, type) and issubclass(step, Exception):
+            raise step("scripted failure", request=request)
+        if isinstance(step, tuple):
+            return httpx.Response(step[0], headers=step[1])
+        return httpx.Response(step, text="body")
+
+
+def make_client(inner, **kwargs):
+    kwargs.setdefault("base_backoff", 0.01)
+    transport = ResilientTransport(httpx.MockTransport(inner), **kwargs)
+    return httpx.AsyncClient(transport=transport), transport
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_status_then_succeeds():
+    inner = Flaky(503, 502, 200)
+    client, transport = make_client(inner)
+    tracer.drain()
+
+    response = await client.get("https://api.example/data")
+
+    assert response.status_code == 200
+    assert len(inner.calls) == 3
+    stats = transport.snapshot()["api.example"]
+    assert stats["retries"] == 2 and stats["circuit"] == "closed"
+
+    spans = [s for s in tracer.drain() if s.name == "http.api.example"]
+    assert len(spans) == 1
+    assert spans[0].component == "http"
+    assert spans[0].attributes == {"retries": 2, "status": 200}
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_requests_are_not_retried():
+    inner = Flaky(503)
+    client, _ = make_client(inner)
+    response = await client.post("https://api.example/data", content=b"x")
+    assert response.status_code == 503
+    assert len(inner.calls) == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_honoured():
+    inner = Flaky((429, {"retry-after": "1"}), 200)
+    client, _ = make_client(inner, max_backoff=0.2)
+    await client.get("https://api.example/data")
+    (first, _), (second, _) = inner.calls
+    # Retry-After of 1s, capped at max_backoff
+    assert 0.18 <= second - first < 0.6
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_then_half_open_trial_closes_it():
+    inner = Flaky(httpx.ConnectError)
+    client, transport = make_client(inner, max_retries=1, failure_threshold=3, cooldown=0.1)
+
+    with pytest.raises(httpx.ConnectError):
+        await client.get("https://down.example/")
+    with pytest.raises(httpx.ConnectError):
+        await client.get("https://down.example/")
+    assert transport.breaker("down.example").state == "open"
+    assert len(inner.calls) == 3
+
+    with pytest.raises(CircuitOpenError):
+        await client.get("https://down.example/")
+    assert len(inner.calls) == 3
+
+    # Other hosts are unaffected
+    inner.script = [200]
+    assert (await client.get("https://up.example/")).status_code == 200
+
+    time.sleep(0.12)
+    assert (await client.get("https://down.example/")).status_code == 200
+    assert transport.breaker("down.example").state == "closed"
+    assert transport.snapshot()["down.example"]["rejected"] == 1
+    await client.aclose()
+
+
+async def open_circuit(cooldown=0.05, **kwargs):
+    inner = Flaky(httpx.ConnectError)
+    client, transport = make_client(inner, max_retries=0, failure_threshold=1, cooldown=cooldown, **kwargs)
+    with pytest.raises(httpx.ConnectError):
+        await client.get("https://down.example/")
+    assert transport.breaker("down.example").state == "open"
+    time.sleep(cooldown + 0.02)
+    return inner, client, transport
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_trial_reopens_the_circuit():
+    inner, client, transport = await open_circuit()
+    inner.script = [429]
+    assert (await client.get("https://down.example/")).status_code == 429
+    assert transport.breaker("down.example").state == "open"
+
+    # Not stuck half-open: the next cooldown allows another trial
+    time.sleep(0.07)
+    inner.script = [200]
+    assert (await client.get("https://down.example/")).status_code == 200
+    assert transport.breaker("down.example").state == "closed"
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_trial_ending_in_other_errors_reopens_the_circuit():
+    inner, client, transport = await open_circuit()
+    inner.script = [httpx.UnsupportedProtocol]
+    with pytest.raises(httpx.UnsupportedProtocol):
+        await client.get("https://down.example/")
+    assert transport.breaker("down.example").state == "open"
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_reopens_the_circuit():
+    release = asyncio.Event()
+
+    async def hang(request):
+        await release.wait()
+        return httpx.Response(200)
+
+    inner, client, transport = await open_circuit()
+    transport.transport = httpx.MockTransport(hang)
+    trial = asyncio.create_task(client.get("https://down.example/"))
+    await asyncio.sleep(0.01)
+    assert transport.breaker("down.example").state == "half_open"
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+    assert transport.breaker("down.example").state == "open"
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_research_fetches_go_through_the_resilient_transport(research_tools):
+    """ResearchTools.client retries and traces; only the network is mocked"""
+    inner = Flaky(503, (200, {"content-type": "text/html"}))
+    tools = research_tools(inner)
+    tools.transport.base_backoff = 0.01
+    tracer.drain()
+
+    extracted = await tools._fetch("https://flaky.example/page")
+
+    assert extracted["kind"] == "html"
+    assert len(inner.calls) == 2
+    assert tools.transport.snapshot()["flaky.example"]["retries"] == 1
+    assert any(s.name == "http.flaky.example" for s in tracer.drain())
+
+
+@pytest.mark.asyncio
+async def test_requests_per_host_follow_token_bucket():
+    inner = Flaky(200)
+    client, transport = make_client(inner, rate=20.0, burst=2)
+
+    start = time.monotonic()
+    for _ in range(6):
+        await client.get("https://slow.example/")
+    elapsed = time.monotonic() - start
+
+    # Two from the burst, four more at 20/s
+    assert elapsed >= 0.18
+    assert transport.snapshot()["slow.example"]["throttled_ms"] > 150
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_without_waiting():
+    bucket = TokenBucket(rate=1.0, burst=3)
+    assert [await bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
@@ -0,0 +1,126 @@
+# ABOUTME: Tests for the off-loop web search runner
+# ABOUTME: Verify the loop stays responsive, TTL caching, coalescing and timeouts
+
+import asyncio
+import threading
+import time
+import pytest
+from tools.research import ResearchTools
+from tools.search import SearchRunner
+
+
+class BlockingSearch:
+    """Synchronous search backend that blocks its thread like DDGS does"""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = []
+        self.threads = set()
+
+    def __call__(self, query, max_results):
+        self.calls.append((query, max_results))
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return [{"title": f"{query} {i}", "href": f"https://example.com/{i}", "body": "snippet"}
+                for i in range(max_results)]
+
+
+@pytest.mark.asyncio
+async def test_search_does_not_block_event_loop():
+    backend = BlockingSearch(delay=0.3)
+    runner = SearchRunner(backend)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    results = await runner.search("python asyncio", 3)
+    task.cancel()
+
+    assert len(results) == 3
+    assert ticks > 10  # A blocking call would have starved the ticker
+    assert all(name.startswith("web-search") for name in backend.threads)
+    runner.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_searches_share_one_call():
+    backend = BlockingSearch(delay=0.2)
+    runner = SearchRunner(backend)
+
+    results = await asyncio.gather(*(runner.search("Same  Query", 5) for _ in range(5)),
+                                   runner.search("same query", 5))
+
+    assert len(backend.calls) == 1
+    assert all(r == results[0] for r in results)
+    runner.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_first_caller_does_not_cancel_the_others():
+    backend = BlockingSearch(delay=0.2)
+    runner = SearchRunner(backend)
+
+    first = asyncio.create_task(runner.search("shared", 3))
+    second = asyncio.create_task(runner.search("shared", 3))
+    await asyncio.sleep(0.05)
+    first.cancel()
+
+    assert len(await second) == 3
+    assert first.cancelled()
+    assert len(backend.calls) == 1
+    runner.close()
+
+
+@pytest.mark.asyncio
+async def test_results_cached_per_query_and_max_results_until_ttl():
+    backend = BlockingSearch(delay=0)
+    runner = SearchRunner(backend, ttl=0.2)
+
+    await runner.search("q", 3)
+    await runner.search("q", 3)
+    assert len(backend.calls) == 1
+
+    await runner.search("q", 5)
+    assert len(backend.calls) == 2
+
+    await asyncio.sleep(0.25)
+    await runner.search("q", 3)
+    assert len(backend.calls) == 3
+    runner.close()
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_not_cached():
+    backend = BlockingSearch(delay=0.3)
+    runner = SearchRunner(backend, timeout=0.05)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await runner.search("slow", 2)
+
+    backend.delay = 0
+    runner.timeout = 5
+    assert len(await runner.search("slow", 2)) == 2
+    assert len(backend.calls) == 2
+    runner.close()
+
+
+@pytest.mark.asyncio
+async def test_web_search_tool_output(memory_manager):
+    tools = ResearchTools(memory_manager, search=SearchRunner(BlockingSearch(delay=0), timeout=1))
+    web_search = next(t for t in tools.get_tools() if t.name == "web_search")
+
+    result = await web_search.handler({"query": "asyncio", "max_results": 2})
+    text = result["content"][0]["text"]
+    assert text.startswith("[OK] Found 2 result(s) for: asyncio")
+    assert "URL: https://example.com/1" in text
+
+    tools.search.search_fn = BlockingSearch(delay=0.3)
+    tools.search.timeout = 0.05
+    result = await web_search.handler({"query": "other", "max_results": 2})
+    assert result["content"][0]["text"].startswith("[ERROR] Search timed out")
+    await tools.close()
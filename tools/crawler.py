@@ -0,0 +1,205 @@
+# ABOUTME: Bounded breadth-first site crawler for research
+# ABOUTME: Same-host frontier, robots.txt cache, per-host politeness delay and content-hash dedup
+
+import asyncio
+import hashlib
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from .http_cache import normalize_url
+
+if TYPE_CHECKING:
+    from .research import ResearchTools
+
+USER_AGENT = "ResearchAssistant"
+
+# Links to these are never worth a request
+SKIP_EXTENSIONS = (
+    ".pdf", ".zip", ".gz", ".tar", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".ico",
+    ".mp3", ".mp4", ".webm", ".css", ".js", ".woff", ".woff2", ".exe", ".dmg",
+)
+
+
+class RobotsCache:
+    """robots.txt rules per host, fetched once per `ttl` seconds
+
+    Missing files (4xx) allow everything; 401/403 forbid everything, as
+    urllib.robotparser does; network errors allow everything.
+    """
+
+    def __init__(self, user_agent: str = USER_AGENT, ttl: float = 3600.0):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self._rules: Dict[str, Tuple[float, RobotFileParser]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def get(self, client: httpx.AsyncClient, url: str) -> RobotFileParser:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}".lower()
+        lock = self._locks.setdefault(origin, asyncio.Lock())
+        async with lock:
+            cached = self._rules.get(origin)
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
+            rules = RobotFileParser(f"{origin}/robots.txt")
+            try:
+                response = await client.get(f"{origin}/robots.txt", follow_redirects=True,
+                                            headers={"User-Agent": self.user_agent})
+                if response.status_code in (401, 403):
+                    rules.disallow_all = True
+                elif response.status_code >= 400:
+                    rules.allow_all = True
+                else:
+                    rules.parse(response.text.splitlines())
+            except httpx.HTTPError:
+                rules.allow_all = True
+            self._rules[origin] = (time.monotonic() + self.ttl, rules)
+            return rules
+
+    async def allowed(self, client: httpx.AsyncClient, url: str) -> bool:
+        return (await self.get(client, url)).can_fetch(self.user_agent, url)
+
+    async def crawl_delay(self, client: httpx.AsyncClient, url: str) -> Optional[float]:
+        delay = (await self.get(client, url)).crawl_delay(self.user_agent)
+        return float(delay) if delay is not None else None
+
+
+@dataclass
+class CrawlReport:
+    seed: str
+    pages: List[Dict[str, Any]] = field(default_factory=list)
+    duplicates: int = 0
+    robots_blocked: int = 0
+    skipped: int = 0
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+    frontier_left: int = 0
+    seconds: float = 0.0
+
+
+class SiteCrawler:
+    """Breadth-first crawl of one host, storing each new page in the page store
+
+    URLs are normalized before the seen-check, only links on the seed's
+    host (and under `path_prefix`, if given) are followed, and requests
+    to the host are spaced by at least `delay` seconds (or the robots.txt
+    Crawl-delay, if larger); fresh cache hits do not wait. After a
+    redirect the final URL is checked against the scope and robots.txt
+    again and is used to store the page and resolve its links; a
+    redirecting seed moves the crawl to its target host. Pages whose
+    extracted text was already seen under another URL are counted as
+    duplicates and not expanded.
+    """
+
+    def __init__(self, tools: "ResearchTools", max_pages: int = 20, max_depth: int = 2,
+                 delay: float = 0.5, path_prefix: str = ""):
+        self.tools = tools
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.delay = delay
+        self.path_prefix = path_prefix
+        self._next_request: Dict[str, float] = {}
+
+    def _in_scope(self, url: str, host: str) -> bool:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or (parts.hostname or "").lower() != host:
+            return False
+        if not parts.path.startswith(self.path_prefix or "/"):
+            return False
+        return not parts.path.lower().endswith(SKIP_EXTENSIONS)
+
+    async def _polite_wait(self, url: str):
+        """Sleep until the host may be contacted again"""
+        host = urlsplit(url).netloc.lower()
+        delay = max(self.delay, await self.tools.robots.crawl_delay(self.tools.client, url) or 0.0)
+        now = time.monotonic()
+        ready_at = self._next_request.get(host, now)
+        if ready_at > now:
+            await asyncio.sleep(ready_at - now)
+        self._next_request[host] = max(now, ready_at) + delay
+
+    async def crawl(self, seed: str) -> CrawlReport:
+        start = time.perf_counter()
+        seed = normalize_url(seed)
+        host = (urlsplit(seed).hostname or "").lower()
+        report = CrawlReport(seed=seed)
+        frontier = deque([(seed, 0)])
+        seen = {seed}
+        hashes = set()
+
+        while frontier and len(report.pages) < self.max_pages:
+            url, depth = frontier.popleft()
+            if not await self.tools.robots.allowed(self.tools.client, url):
+                report.robots_blocked += 1
+                continue
+
+            cached = await self.tools.cache.get(url)
+            if cached is None or not cached.is_fresh():
+                await self._polite_wait(url)
+            try:
+                extracted = await self.tools._fetch(url, store=False, headers={"User-Agent": USER_AGENT})
+            except httpx.HTTPError as e:
+                report.errors.append((url, str(e) or type(e).__name__))
+                continue
+
+            final = normalize_url(extracted.get("url") or url)
+            if final != url:
+                if depth == 0:
+                    host = (urlsplit(final).hostname or "").lower()
+                if final in seen and depth > 0:
+                    report.duplicates += 1
+                    continue
+                seen.add(final)
+                if not self._in_scope(final, host):
+                    report.skipped += 1
+                    continue
+                if not await self.tools.robots.allowed(self.tools.client, final):
+                    report.robots_blocked += 1
+                    continue
+
+            if extracted["kind"] not in ("html", "text") or not extracted.get("text"):
+                report.skipped += 1
+                continue
+
+            digest = hashlib.sha1(extracted["text"].encode("utf-8")).hexdigest()
+            if digest in hashes:
+                report.duplicates += 1
+                continue
+            hashes.add(digest)
+
+            page = await self.tools.pages.put(final, extracted.get("title"), extracted["text"])
+            report.pages.append({**page, "depth": depth, "from_cache": extracted["from_cache"]})
+
+            if depth >= self.max_depth:
+                continue
+            for href in extracted.get("hrefs") or [link["url"] for link in extracted.get("links", [])]:
+                link = normalize_url(urljoin(final, href))
+                if link not in seen and self._in_scope(link, host):
+                    seen.add(link)
+                    frontier.append((link, depth + 1))
+
+        report.frontier_left = len(frontier)
+        report.seconds = time.perf_counter() - start
+        return report
+
+
+def format_report(report: CrawlReport, limit: int = 50) -> str:
+    """Progress summary returned by crawl_site"""
+    output = (f"[OK] Crawled {len(report.pages)} page(s) from {report.seed} in {report.seconds:.1f}s\n"
+              f"Duplicates: {report.duplicates}  Blocked by robots.txt: {report.robots_blocked}  "
+              f"Skipped: {report.skipped}  Errors: {len(report.errors)}  "
+              f"Not visited: {report.frontier_left}\n\n")
+    for page in report.pages[:limit]:
+        output += (f"- page {page['page_id']} ({page['chunks']} chunk(s), depth {page['depth']}): "
+                   f"{page['title'] or 'No title'} - {page['url']}\n")
+    if len(report.pages) > limit:
+        output += f"... and {len(report.pages) - limit} more\n"
+    for url, error in report.errors[:5]:
+        output += f"[WARN] {url}: {error}\n"
+    output += "\n[TIP] Use search_fetched to find passages, or read_page to read a page"
+    return output
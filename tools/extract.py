@@ -0,0 +1,372 @@
+# ABOUTME: HTML and text extraction for research fetches
+# ABOUTME: Incremental decoding into an incremental lxml parser, capped at a byte budget
+
+import codecs
+from typing import Any, Dict, List, Optional
+
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Subtrees that never hold page content
+DROP_TAGS = ("script", "style", "nav", "footer", "header")
+MAX_LINKS = 20
+# Every distinct href on the page, navigation included, for crawl_site
+MAX_HREFS = 500
+# Preview kept when no HTML parser is installed
+RAW_PREVIEW_CHARS = 10000
+
+# Nodes whose own text counts as a paragraph of content
+BLOCK_TAGS = frozenset(("p", "pre", "blockquote", "li", "td", "dd", "div", "section"))
+# Shorter blocks are captions, labels and buttons
+MIN_BLOCK_CHARS = 25
+# Below this many elements NumPy's per-call setup costs more than it saves
+NUMPY_MIN_NODES = 250
+
+# Lists inside a landmark with at least this many links, nearly all link text, are navigation
+LINK_LIST_MIN_LINKS = 5
+LINK_LIST_DENSITY = 0.8
+
+# Used when no block scores: the fixed selection fetch_url started with
+_CONTENT_PATHS = (
+    "//article",
+    "//main",
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' content ')]",
+    "//div[@id='content']",
+    "//body",
+)
+
+
+def _lines(node) -> str:
+    """Non-empty stripped text fragments of a subtree, one per line"""
+    return "\n".join(s for s in (t.strip() for t in node.itertext()) if s)
+
+
+class _Features:
+    """Per-element features in document order (parents before children)"""
+
+    __slots__ = ("nodes", "parent", "depth", "chars", "link_chars", "commas", "block")
+
+    def __init__(self, root):
+        self.nodes: List[Any] = []
+        self.parent: List[int] = []
+        self.depth: List[int] = []
+        self.chars: List[int] = []
+        self.link_chars: List[int] = []
+        self.commas: List[int] = []
+        self.block: List[bool] = []
+        index = {}
+        in_link: List[bool] = []
+        for node in root.iter():
+            if not isinstance(node.tag, str):
+                continue
+            parent = index.get(node.getparent(), -1)
+            i = index[node] = len(self.nodes)
+            linked = node.tag == "a" or (parent >= 0 and in_link[parent])
+            text = (node.text or "").strip()
+            self.nodes.append(node)
+            self.parent.append(parent)
+            self.depth.append(self.depth[parent] + 1 if parent >= 0 else 0)
+            self.chars.append(len(text))
+            self.link_chars.append(len(text) if linked else 0)
+            self.commas.append(text.count(","))
+            self.block.append(node.tag in BLOCK_TAGS)
+            in_link.append(linked)
+            tail = (node.tail or "").strip()
+            if tail and parent >= 0:
+                # Tail text belongs to the parent
+                self.chars[parent] += len(tail)
+                self.commas[parent] += tail.count(",")
+                if in_link[parent]:
+                    self.link_chars[parent] += len(tail)
+
+
+def _scores_numpy(f: _Features) -> List[float]:
+    parent = np.asarray(f.parent)
+    depth = np.asarray(f.depth)
+    own = np.asarray(f.chars, dtype=np.float64)
+    # Subtree sums: chars, link chars, element count; one vectorized pass per depth level
+    totals = np.stack([own, np.asarray(f.link_chars, dtype=np.float64), np.ones_like(own)], axis=1)
+    for level in range(int(depth.max()), 0, -1):
+        at = depth == level
+        np.add.at(totals, parent[at], totals[at])
+    chars, links, tags = totals[:, 0], totals[:, 1], totals[:, 2]
+    link_density = links / np.maximum(chars, 1.0)
+
+    own_links = np.asarray(f.link_chars, dtype=np.float64)
+    own_density = own_links / np.maximum(own, 1.0)
+    blocks = np.asarray(f.block) & (own >= MIN_BLOCK_CHARS) & (parent >= 0)
+    weight = (1.0 + np.asarray(f.commas) + np.minimum(own / 100.0, 3.0)) * (1.0 - own_density)
+
+    scores = np.zeros_like(own)
+    np.add.at(scores, parent[blocks], weight[blocks])
+    grand_parent = parent[parent[blocks]]
+    has_grand = grand_parent >= 0
+    np.add.at(scores, grand_parent[has_grand], weight[blocks][has_grand] / 2.0)
+
+    # Text density: characters per element, relative to the whole page
+    density = chars / tags
+    density /= max(float(density[0]), 1.0)
+    return (scores * (1.0 - link_density) * np.sqrt(np.minimum(density, 4.0))).tolist()
+
+
+def _scores_python(f: _Features) -> List[float]:
+    n = len(f.nodes)
+    chars = list(map(float, f.chars))
+    links = list(map(float, f.link_chars))
+    tags = [1.0] * n
+    for i in range(n - 1, 0, -1):
+        p = f.parent[i]
+        chars[p] += chars[i]
+        links[p] += links[i]
+        tags[p] += tags[i]
+
+    scores = [0.0] * n
+    for i in range(1, n):
+        own = f.chars[i]
+        if not f.block[i] or own < MIN_BLOCK_CHARS:
+            continue
+        weight = (1.0 + f.commas[i] + min(own / 100.0, 3.0)) * (1.0 - f.link_chars[i] / own)
+        p = f.parent[i]
+        scores[p] += weight
+        if f.parent[p] >= 0:
+            scores[f.parent[p]] += weight / 2.0
+
+    page_density = max(chars[0] / tags[0], 1.0)
+    return [
+        scores[i] * (1.0 - links[i] / max(chars[i], 1.0)) * min(chars[i] / tags[i] / page_density, 4.0) ** 0.5
+        for i in range(n)
+    ]
+
+
+def select_main(root, use_numpy: Optional[bool] = None):
+    """Main content node by text density, or None when no block scores
+
+    Each block node (paragraph, list item, cell, div with direct text)
+    of at least MIN_BLOCK_CHARS characters scores 1 plus its commas plus
+    one per 100 characters (capped at 3), discounted by its link text.
+    The score goes to its parent and half of it to its grandparent.
+    Candidates are then weighted down by their link density and up by
+    their text density (characters per element) relative to the page.
+
+    Scoring is pure Python unless NumPy is installed and the page has at
+    least NUMPY_MIN_NODES elements (use_numpy forces either path); the
+    per-element feature walk costs more than either scorer.
+    """
+    features = _Features(root)
+    if len(features.nodes) < 2:
+        return None
+    if use_numpy is None:
+        use_numpy = len(features.nodes) >= NUMPY_MIN_NODES
+    scores = _scores_numpy(features) if use_numpy and NUMPY_AVAILABLE else _scores_python(features)
+    best = max(range(len(scores)), key=scores.__getitem__)
+    return features.nodes[best] if scores[best] > 0 else None
+
+
+def select_landmark(root):
+    """The page's only <main>, else its only <article>, or None
+
+    A landmark is the author's own answer, so it beats any score; several
+    articles are usually teasers and are left to select_main.
+    """
+    for path in ("//main", "//article"):
+        found = root.xpath(path)
+        if found:
+            return found[0] if len(found) == 1 else None
+    return None
+
+
+def _drop_link_lists(node):
+    """Remove tables of contents and related-page lists from a landmark"""
+    f = _Features(node)
+    n = len(f.nodes)
+    chars = list(f.chars)
+    links = list(f.link_chars)
+    anchors = [1 if el.tag == "a" else 0 for el in f.nodes]
+    for i in range(n - 1, 0, -1):
+        p = f.parent[i]
+        chars[p] += chars[i]
+        links[p] += links[i]
+        anchors[p] += anchors[i]
+    dropped = [False] * n
+    for i in range(1, n):
+        dropped[i] = dropped[f.parent[i]]
+        if (not dropped[i] and anchors[i] >= LINK_LIST_MIN_LINKS
+                and links[i] >= LINK_LIST_DENSITY * chars[i]):
+            dropped[i] = True
+            f.nodes[i].drop_tree()
+
+
+def _select_fixed(root):
+    for path in _CONTENT_PATHS:
+        found = root.xpath(path)
+        if found:
+            return found[0]
+    return None
+
+
+def extract_tree(root, engine: str = "density", use_numpy: Optional[bool] = None) -> Dict[str, Any]:
+    """Title, main text, the first content links and all hrefs of a parsed HTML document
+
+    engine is "density" (the page's landmark without its link lists,
+    else select_main, falling back to the fixed selection) or "fixed"
+    (first of article, main, div.content, #content, body).
+    """
+    title = root.find(".//title")
+    title_text = title.text_content().strip() if title is not None else ""
+
+    hrefs = {}
+    for a in root.iter("a"):
+        href = (a.get("href") or "").strip()
+        if href and not href.startswith("#"):
+            hrefs[href] = None
+            if len(hrefs) >= MAX_HREFS:
+                break
+
+    for node in list(root.iter(*DROP_TAGS)):
+        node.drop_tree()
+
+    article = None
+    if engine == "density":
+        article = select_landmark(root)
+        if article is not None:
+            _drop_link_lists(article)
+        else:
+            article = select_main(root, use_numpy)
+    if article is None:
+        article = _select_fixed(root)
+
+    links = []
+    for a in root.iter("a"):
+        href = a.get("href")
+        link_text = a.text_content().strip() if href else ""
+        if link_text:
+            links.append({"text": link_text[:100], "url": href})
+            if len(links) >= MAX_LINKS:
+                break
+
+    return {
+        "kind": "html",
+        "title": title_text or "No title",
+        "text": _lines(article if article is not None else root),
+        "links": links,
+        "hrefs": list(hrefs),
+    }
+
+
+def _empty_page() -> Dict[str, Any]:
+    return {"kind": "html", "title": "No title", "text": "", "links": [], "hrefs": []}
+
+
+def _decoder(encoding: Optional[str]):
+    try:
+        codecs.lookup(encoding or "utf-8")
+    except LookupError:
+        encoding = None
+    return codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+
+
+class StreamExtractor:
+    """Extract a response body as it streams in
+
+    Bytes go through an incremental decoder; HTML text is fed straight
+    into lxml's feed parser, so nothing but the parse tree and the
+    accepted bytes is held. feed() returns False once `max_bytes` have
+    been accepted, telling the caller to stop downloading.
+
+    With `inline_limit`, parsing stops once the body reaches that size
+    and `deferred` is set: the caller hands `body` to extract_body
+    elsewhere (see tools.parse_pool) instead of calling close().
+    """
+
+    def __init__(self, content_type: str, encoding: Optional[str] = None,
+                 max_bytes: int = 2 * 1024 * 1024, inline_limit: Optional[int] = None):
+        self.content_type = content_type
+        self.encoding = encoding
+        self.kind = "html" if "text/html" in content_type else "text"
+        self.max_bytes = max_bytes
+        self.inline_limit = inline_limit
+        self.body = bytearray()
+        self.truncated = False
+        self.deferred = False
+        self._decoder = _decoder(encoding)
+        self._parser = None
+        self._parts = []
+        self._chars = 0
+        if self.kind == "html" and LXML_AVAILABLE:
+            self._parser = lxml.html.HTMLParser(remove_comments=True)
+
+    def feed(self, chunk: bytes) -> bool:
+        remaining = self.max_bytes - len(self.body)
+        if len(chunk) > remaining:
+            chunk = chunk[:remaining]
+            self.truncated = True
+        self.body += chunk
+        if not self.deferred and self.inline_limit is not None and len(self.body) >= self.inline_limit:
+            # Drop the partial parse; the whole body is parsed elsewhere
+            self.deferred = True
+            self._parser = None
+            self._parts = []
+        if not self.deferred:
+            self._push(self._decoder.decode(chunk))
+        return not self.truncated
+
+    def _push(self, text: str):
+        if not text:
+            return
+        if self._parser is not None:
+            self._parser.feed(text)
+        elif self.kind == "text" or self._chars < RAW_PREVIEW_CHARS:
+            self._parts.append(text)
+            self._chars += len(text)
+
+    def close(self) -> Dict[str, Any]:
+        """Extracted page dict; see extract_tree for the HTML keys"""
+        if self.deferred:
+            return extract_body(bytes(self.body), self.content_type, self.encoding, self.truncated)
+        self._push(self._decoder.decode(b"", final=True))
+        if self._parser is not None:
+            try:
+                root = self._parser.close()
+            except etree.LxmlError:
+                root = None
+            extracted = extract_tree(root) if root is not None else _empty_page()
+        elif self.kind == "html":
+            extracted = {"kind": "raw_html", "text": "".join(self._parts)[:RAW_PREVIEW_CHARS]}
+        else:
+            extracted = {"kind": "text", "text": "".join(self._parts)}
+        if self.truncated:
+            extracted["truncated"] = True
+        return extracted
+
+
+def extract_body(body: bytes, content_type: str, encoding: Optional[str] = None,
+                 truncated: bool = False) -> Dict[str, Any]:
+    """Extract a complete (possibly already truncated) body
+
+    Module-level so worker processes can run it.
+    """
+    extractor = StreamExtractor(content_type, encoding, max_bytes=len(body))
+    extractor.feed(body)
+    extracted = extractor.close()
+    if truncated:
+        extracted["truncated"] = True
+    return extracted
+
+
+def extract_html(html: str, engine: str = "density") -> Dict[str, Any]:
+    """Extract an HTML document held in memory"""
+    try:
+        root = lxml.html.document_fromstring(html)
+    except etree.LxmlError:
+        return _empty_page()
+    return extract_tree(root, engine)
@@ -0,0 +1,226 @@
+# ABOUTME: Persistent HTTP cache for research fetches
+# ABOUTME: Raw body, headers and extracted text per normalized URL; Cache-Control, revalidation, LRU by size
+
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import aiosqlite
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+# s-maxage applies to shared caches only; this cache is private
+_MAX_AGE = re.compile(r"(?:^|,)\s*max-age\s*=\s*\"?(\d+)", re.IGNORECASE)
+
+# Without explicit freshness, a Last-Modified page stays fresh for this share
+# of its age (RFC 9111 heuristic), capped at a day
+HEURISTIC_FRACTION = 0.1
+HEURISTIC_MAX_S = 86400
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used as cache (and page store) key
+
+    Lowercases scheme and host, drops default ports and fragments, sorts
+    query parameters and gives empty paths a "/".
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: Mapping[str, str], now: float) -> Optional[float]:
+    """Seconds a response may be served without revalidation
+
+    Returns None when it must not be stored at all (no-store).
+    """
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0.0
+    match = _MAX_AGE.search(cache_control)
+    if match:
+        return float(match.group(1))
+    expires = _http_date(headers.get("expires"))
+    if expires is not None:
+        date = _http_date(headers.get("date")) or now
+        return max(0.0, expires - date)
+    last_modified = _http_date(headers.get("last-modified"))
+    if last_modified is not None:
+        return min(HEURISTIC_MAX_S, max(0.0, (now - last_modified) * HEURISTIC_FRACTION))
+    return 0.0
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    extracted: Dict[str, Any]
+    stored_at: float
+    expires_at: float
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidation"""
+        headers = {}
+        if self.headers.get("etag"):
+            headers["If-None-Match"] = self.headers["etag"]
+        if self.headers.get("last-modified"):
+            headers["If-Modified-Since"] = self.headers["last-modified"]
+        return headers
+
+
+class HTTPCache:
+    """SQLite-backed HTTP cache
+
+    One row per normalized URL holding the raw body, response headers and
+    the text extracted from it, so a fresh hit needs neither the network
+    nor the parser. Entries past their lifetime are revalidated with
+    ETag / Last-Modified. The least recently used entries are evicted once
+    the stored size exceeds `max_bytes`.
+    """
+
+    def __init__(self, db_path: str = "storage/http_cache.db", max_bytes: int = 256 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._ready = False
+        self._lock = asyncio.Lock()
+
+    async def initialize(self):
+        async with self._lock:
+            if self._ready:
+                return
+            async with aiosqlite.connect(self.db_path) as db:
+                await db.execute("""
+                    CREATE TABLE IF NOT EXISTS http_cache (
+                        url TEXT PRIMARY KEY,
+                        status INTEGER NOT NULL,
+                        headers TEXT NOT NULL,
+                        body BLOB NOT NULL,
+                        extracted TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        stored_at REAL NOT NULL,
+                        expires_at REAL NOT NULL,
+                        last_access REAL NOT NULL
+                    )
+                """)
+                await db.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_http_cache_access ON http_cache(last_access)
+                """)
+                await db.commit()
+            self._ready = True
+
+    async def get(self, url: str) -> Optional[CacheEntry]:
+        """Entry for url (fresh or stale), marking it recently used"""
+        await self.initialize()
+        key = normalize_url(url)
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                """SELECT url, status, headers, body, extracted, stored_at, expires_at
+                   FROM http_cache WHERE url = ?""",
+                (key,)
+            )
+            row = await cursor.fetchone()
+            if row is None:
+                return None
+            await db.execute("UPDATE http_cache SET last_access = ? WHERE url = ?", (time.time(), key))
+            await db.commit()
+        return CacheEntry(
+            url=row[0], status=row[1], headers=json.loads(row[2]), body=row[3],
+            extracted=json.loads(row[4]), stored_at=row[5], expires_at=row[6]
+        )
+
+    async def put(self, url: str, status: int, headers: Mapping[str, str], body: bytes,
+                  extracted: Dict[str, Any]) -> bool:
+        """Store a response; returns False when Cache-Control forbids it"""
+        now = time.time()
+        headers = {k.lower(): v for k, v in headers.items()}
+        lifetime = freshness_lifetime(headers, now)
+        if lifetime is None:
+            return False
+
+        await self.initialize()
+        extracted_json = json.dumps(extracted, ensure_ascii=False)
+        size = len(body) + len(extracted_json.encode("utf-8"))
+        if size > self.max_bytes:
+            return False
+
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute(
+                """INSERT OR REPLACE INTO http_cache
+                   (url, status, headers, body, extracted, size, stored_at, expires_at, last_access)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (normalize_url(url), status, json.dumps(headers), body, extracted_json,
+                 size, now, now + lifetime, now)
+            )
+            await self._evict(db)
+            await db.commit()
+        return True
+
+    async def revalidated(self, url: str, headers: Mapping[str, str]):
+        """Apply a 304 Not Modified: refresh headers and lifetime, keep the body"""
+        await self.initialize()
+        key = normalize_url(url)
+        now = time.time()
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute("SELECT headers FROM http_cache WHERE url = ?", (key,))
+            row = await cursor.fetchone()
+            if row is None:
+                return
+            merged = json.loads(row[0])
+            merged.update({k.lower(): v for k, v in headers.items()})
+            lifetime = freshness_lifetime(merged, now)
+            if lifetime is None:
+                await db.execute("DELETE FROM http_cache WHERE url = ?", (key,))
+            else:
+                await db.execute(
+                    """UPDATE http_cache SET headers = ?, stored_at = ?, expires_at = ?, last_access = ?
+                       WHERE url = ?""",
+                    (json.dumps(merged), now, now + lifetime, now, key)
+                )
+            await db.commit()
+
+    async def _evict(self, db):
+        cursor = await db.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache")
+        total = (await cursor.fetchone())[0]
+        if total <= self.max_bytes:
+            return
+        cursor = await db.execute("SELECT url, size FROM http_cache ORDER BY last_access")
+        victims = []
+        async for url, size in cursor:
+            if total <= self.max_bytes:
+                break
+            victims.append((url,))
+            total -= size
+        await db.executemany("DELETE FROM http_cache WHERE url = ?", victims)
+
+    async def stats(self) -> Dict[str, int]:
+        await self.initialize()
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache")
+            entries, size = await cursor.fetchone()
+        return {"entries": entries, "bytes": size}
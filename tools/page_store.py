@@ -0,0 +1,285 @@
+# ABOUTME: Persistent store of fetched page text, split into numbered chunks
+# ABOUTME: Pages get a stable integer handle so long documents can be read chunk by chunk
+
+import asyncio
+import hashlib
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import aiosqlite
+
+from .http_cache import normalize_url
+
+_TERM = re.compile(r"\w+")
+
+
+def split_chunks(text: str, chunk_chars: int) -> List[str]:
+    """Split text at line breaks into chunks of at most chunk_chars
+
+    Lines longer than a chunk are cut at the limit.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in text.split("\n"):
+        while len(line) > chunk_chars:
+            if current:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            chunks.append(line[:chunk_chars])
+            line = line[chunk_chars:]
+        if current and size + 1 + len(line) > chunk_chars:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + (1 if size else 0)
+    if current and any(current):
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def passage(text: str, query: str, chars: int = 400) -> str:
+    """Window of about `chars` characters around the first query term in text"""
+    lowered = text.lower()
+    positions = [lowered.find(t) for t in _TERM.findall(query.lower())]
+    positions = [p for p in positions if p >= 0]
+    start = max(0, min(positions) - chars // 4) if positions else 0
+    if start:
+        # Begin at a word boundary
+        space = text.find(" ", start)
+        start = space + 1 if 0 <= space < start + 30 else start
+    end = start + chars
+    window = text[start:end].replace("\n", " ").strip()
+    return ("..." if start else "") + window + ("..." if end < len(text) else "")
+
+
+class PageStore:
+    """SQLite store of extracted page text
+
+    One row per normalized URL with a stable page_id (the handle shown
+    to the agent) and one row per chunk, unique by (page_id, chunk_no)
+    with chunk numbers starting at 1. Storing unchanged text again only
+    refreshes fetched_at. Lives in the agent database by default.
+    """
+
+    def __init__(self, db_path: str = "storage/agent.db", chunk_chars: int = 4000):
+        self.db_path = db_path
+        self.chunk_chars = chunk_chars
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # Set by initialize() when SQLite has FTS5
+        self.fts_enabled = False
+        self._ready = False
+        self._lock = asyncio.Lock()
+
+    async def initialize(self):
+        async with self._lock:
+            if self._ready:
+                return
+            async with aiosqlite.connect(self.db_path) as db:
+                await db.execute("""
+                    CREATE TABLE IF NOT EXISTS pages (
+                        page_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        url TEXT NOT NULL UNIQUE,
+                        title TEXT,
+                        chars INTEGER NOT NULL,
+                        chunks INTEGER NOT NULL,
+                        content_hash TEXT NOT NULL,
+                        fetched_at REAL NOT NULL
+                    )
+                """)
+                # Explicit id: an implicit rowid may be renumbered by VACUUM,
+                # which would desync the external-content FTS index
+                await db.execute("""
+                    CREATE TABLE IF NOT EXISTS page_chunks (
+                        id INTEGER PRIMARY KEY,
+                        page_id INTEGER NOT NULL REFERENCES pages(page_id),
+                        chunk_no INTEGER NOT NULL,
+                        text TEXT NOT NULL,
+                        UNIQUE (page_id, chunk_no)
+                    )
+                """)
+                await self._create_chunk_index(db)
+                await db.commit()
+            self._ready = True
+
+    async def _create_chunk_index(self, db):
+        """BM25 full-text index over chunk text, kept in sync by triggers
+
+        Porter-stemmed unicode61 tokens, so "caching" matches "cached".
+        Without FTS5 searches fall back to LIKE and term counting.
+        """
+        cursor = await db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'page_chunks_fts'"
+        )
+        existed = await cursor.fetchone() is not None
+        try:
+            await db.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS page_chunks_fts USING fts5(
+                    text, content='page_chunks', content_rowid='id', tokenize='porter unicode61'
+                )
+            """)
+        except aiosqlite.OperationalError:
+            self.fts_enabled = False
+            return
+
+        await db.executescript("""
+            CREATE TRIGGER IF NOT EXISTS page_chunks_fts_insert AFTER INSERT ON page_chunks BEGIN
+                INSERT INTO page_chunks_fts(rowid, text) VALUES (new.id, new.text);
+            END;
+            CREATE TRIGGER IF NOT EXISTS page_chunks_fts_delete AFTER DELETE ON page_chunks BEGIN
+                INSERT INTO page_chunks_fts(page_chunks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            END;
+            CREATE TRIGGER IF NOT EXISTS page_chunks_fts_update AFTER UPDATE ON page_chunks BEGIN
+                INSERT INTO page_chunks_fts(page_chunks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+                INSERT INTO page_chunks_fts(rowid, text) VALUES (new.id, new.text);
+            END;
+        """)
+        if not existed:
+            # Index chunks stored before the index existed
+            await db.execute("INSERT INTO page_chunks_fts(page_chunks_fts) VALUES ('rebuild')")
+        self.fts_enabled = True
+
+    @staticmethod
+    def _page(row) -> Dict[str, Any]:
+        return {"page_id": row[0], "url": row[1], "title": row[2], "chars": row[3],
+                "chunks": row[4], "fetched_at": row[5]}
+
+    async def put(self, url: str, title: Optional[str], text: str) -> Dict[str, Any]:
+        """Store a page's text; returns its page info"""
+        await self.initialize()
+        key = normalize_url(url)
+        content_hash = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        now = time.time()
+        async with aiosqlite.connect(self.db_path) as db:
+            # Take the write lock before looking: concurrent puts of one URL
+            # would otherwise both miss and both insert
+            await db.execute("BEGIN IMMEDIATE")
+            cursor = await db.execute("SELECT page_id, content_hash FROM pages WHERE url = ?", (key,))
+            row = await cursor.fetchone()
+            if row is not None and row[1] == content_hash:
+                await db.execute("UPDATE pages SET fetched_at = ?, title = ? WHERE page_id = ?",
+                                 (now, title, row[0]))
+                await db.commit()
+                return await self._get(db, row[0])
+
+            chunks = split_chunks(text, self.chunk_chars)
+            if row is None:
+                cursor = await db.execute(
+                    """INSERT INTO pages (url, title, chars, chunks, content_hash, fetched_at)
+                       VALUES (?, ?, ?, ?, ?, ?)""",
+                    (key, title, len(text), len(chunks), content_hash, now)
+                )
+                page_id = cursor.lastrowid
+            else:
+                page_id = row[0]
+                await db.execute(
+                    """UPDATE pages SET title = ?, chars = ?, chunks = ?, content_hash = ?, fetched_at = ?
+                       WHERE page_id = ?""",
+                    (title, len(text), len(chunks), content_hash, now, page_id)
+                )
+                await db.execute("DELETE FROM page_chunks WHERE page_id = ?", (page_id,))
+            await db.executemany(
+                "INSERT INTO page_chunks (page_id, chunk_no, text) VALUES (?, ?, ?)",
+                [(page_id, i, chunk) for i, chunk in enumerate(chunks, 1)]
+            )
+            await db.commit()
+            return await self._get(db, page_id)
+
+    async def _get(self, db, page_id: int) -> Optional[Dict[str, Any]]:
+        cursor = await db.execute(
+            "SELECT page_id, url, title, chars, chunks, fetched_at FROM pages WHERE page_id = ?",
+            (page_id,)
+        )
+        row = await cursor.fetchone()
+        return self._page(row) if row else None
+
+    async def get_page(self, handle: Union[int, str]) -> Optional[Dict[str, Any]]:
+        """Page info by page_id or URL"""
+        await self.initialize()
+        async with aiosqlite.connect(self.db_path) as db:
+            if isinstance(handle, int) or str(handle).strip().isdigit():
+                return await self._get(db, int(handle))
+            cursor = await db.execute(
+                "SELECT page_id, url, title, chars, chunks, fetched_at FROM pages WHERE url = ?",
+                (normalize_url(str(handle)),)
+            )
+            row = await cursor.fetchone()
+            return self._page(row) if row else None
+
+    async def read_chunk(self, page_id: int, chunk_no: int) -> Optional[str]:
+        await self.initialize()
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                "SELECT text FROM page_chunks WHERE page_id = ? AND chunk_no = ?",
+                (page_id, chunk_no)
+            )
+            row = await cursor.fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _match_query(terms: List[str]) -> str:
+        # Quoted terms cannot be read as FTS5 operators; OR lets BM25 rank partial matches
+        return " OR ".join(f'"{t}"' for t in dict.fromkeys(terms))
+
+    async def find_chunks(self, page_id: int, query: str, limit: int = 3) -> List[Dict[str, Any]]:
+        """Chunks of one page that best match the query"""
+        return await self.search(query, limit, page_id=page_id)
+
+    async def search(self, query: str, limit: int = 5, page_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Best-matching chunks across stored pages (or one page), best first
+
+        Returns:
+            Dicts with page_id, chunk_no, text, url, title and score
+            (BM25 with FTS5, where lower is better; matched term count otherwise)
+        """
+        terms = _TERM.findall(query.lower())
+        if not terms:
+            return []
+        await self.initialize()
+        page_filter = "AND c.page_id = ?" if page_id is not None else ""
+        page_args = (page_id,) if page_id is not None else ()
+        async with aiosqlite.connect(self.db_path) as db:
+            if self.fts_enabled:
+                cursor = await db.execute(
+                    f"""SELECT c.page_id, c.chunk_no, c.text, p.url, p.title, bm25(page_chunks_fts) AS score
+                        FROM page_chunks_fts f
+                        JOIN page_chunks c ON c.id = f.rowid
+                        JOIN pages p ON p.page_id = c.page_id
+                        WHERE page_chunks_fts MATCH ? {page_filter}
+                        ORDER BY score LIMIT ?""",
+                    (self._match_query(terms), *page_args, limit)
+                )
+                return [
+                    {"page_id": r[0], "chunk_no": r[1], "text": r[2], "url": r[3], "title": r[4], "score": r[5]}
+                    for r in await cursor.fetchall()
+                ]
+
+            like = " OR ".join("c.text LIKE ?" for _ in terms)
+            cursor = await db.execute(
+                f"""SELECT c.page_id, c.chunk_no, c.text, p.url, p.title
+                    FROM page_chunks c JOIN pages p ON p.page_id = c.page_id
+                    WHERE ({like}) {page_filter}""",
+                (*(f"%{t}%" for t in terms), *page_args)
+            )
+            rows = await cursor.fetchall()
+
+        wanted = set(terms)
+        matches = []
+        for chunk_page, chunk_no, text, url, title in rows:
+            words = _TERM.findall(text.lower())
+            hits = sum(1 for w in words if w in wanted)
+            if hits:
+                matched = len(wanted.intersection(words))
+                matches.append({"page_id": chunk_page, "chunk_no": chunk_no, "text": text, "url": url,
+                                "title": title, "score": float(matched), "hits": hits})
+        matches.sort(key=lambda m: (-m["score"], -m["hits"], m["page_id"], m["chunk_no"]))
+        return matches[:limit]
+
+    async def stats(self) -> Dict[str, int]:
+        await self.initialize()
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute("SELECT COUNT(*), COALESCE(SUM(chunks), 0) FROM pages")
+            pages, chunks = await cursor.fetchone()
+        return {"pages": pages, "chunks": chunks}
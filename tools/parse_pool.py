@@ -0,0 +1,119 @@
+# ABOUTME: Process pool for CPU-bound page extraction
+# ABOUTME: Large bodies are parsed in warm worker processes; small ones stay on the event loop
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from .extract import extract_body
+
+# Bodies smaller than this parse inline; shipping them to a worker costs more than it saves
+DEFAULT_MIN_BYTES = 128 * 1024
+
+
+def default_workers() -> int:
+    """Leave one core for the event loop; 0 (inline only) on a single core"""
+    return min(4, (os.cpu_count() or 1) - 1)
+
+
+def _warm_worker():
+    # Runs once per worker process: pay lxml / NumPy import cost up front
+    import tools.extract  # noqa: F401
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class ParsePool:
+    """Optional process pool for extract_body
+
+    Workers are spawned (not forked: the parent runs threads) and import
+    the extraction stack at start-up, so the first large page does not
+    pay for interpreter start. If a worker dies the broken executor is
+    shut down, the page is parsed inline and the pool is rebuilt on next
+    use. After close() every page is parsed inline.
+    """
+
+    def __init__(self, workers: Optional[int] = None, min_bytes: int = DEFAULT_MIN_BYTES):
+        self.workers = default_workers() if workers is None else workers
+        self.min_bytes = min_bytes
+        self.offloaded = 0
+        self.closed = False
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0 and not self.closed
+
+    def wants(self, size: int) -> bool:
+        """Whether a body of `size` bytes should go to a worker"""
+        return self.enabled and size >= self.min_bytes
+
+    def warm(self):
+        """Start every worker now without waiting for them"""
+        if not self.enabled or self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+        for _ in range(self.workers):
+            self._executor.submit(_ping)
+
+    async def extract(self, body: bytes, content_type: str, encoding: Optional[str] = None,
+                      truncated: bool = False) -> Dict[str, Any]:
+        """extract_body in a worker process (inline when the pool is off, closed or broken)"""
+        if not self.enabled:
+            return extract_body(body, content_type, encoding, truncated)
+        self.warm()
+        executor = self._executor
+        loop = asyncio.get_running_loop()
+        try:
+            extracted = await loop.run_in_executor(
+                executor, extract_body, body, content_type, encoding, truncated
+            )
+        except BrokenProcessPool:
+            if self._executor is executor:
+                self._executor = None
+            # Reap the surviving workers and the executor's management thread
+            executor.shutdown(wait=False, cancel_futures=True)
+            return extract_body(body, content_type, encoding, truncated)
+        self.offloaded += 1
+        return extracted
+
+    def shutdown(self):
+        """Stop the workers; later extract() calls parse inline"""
+        self.closed = True
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def close(self):
+        await asyncio.to_thread(self.shutdown)
+
+
+_shared: Optional[ParsePool] = None
+_shared_lock = threading.Lock()
+
+
+def shared_pool() -> ParsePool:
+    """The process-wide pool every AssistantClient parses with
+
+    One set of default_workers() processes serves all clients, so batch
+    runs and the Streamlit registry do not spawn a pool per session.
+    Started on first use and stopped at interpreter exit.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None or _shared.closed:
+            _shared = ParsePool()
+            _shared.warm()
+            atexit.register(_shared.shutdown)
+        return _shared
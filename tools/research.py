@@ -2,40 +2,114 @@
 # ABOUTME: Search, fetch, analyze web content with source tracking
 
 from claude_agent_sdk import tool
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+import asyncio
+import contextlib
 import httpx
 import json
+import time
 from datetime import datetime
-
-try:
-    from bs4 import BeautifulSoup
-    BS4_AVAILABLE = True
-except ImportError:
-    BS4_AVAILABLE = False
-
-try:
-    from ddgs import DDGS
-    DDGS_AVAILABLE = True
-except ImportError:
-    try:
-        # Fallback to old package name
-        from duckduckgo_search import DDGS
-        DDGS_AVAILABLE = True
-    except ImportError:
-        DDGS_AVAILABLE = False
+from urllib.parse import urlsplit
+from .crawler import RobotsCache, SiteCrawler, format_report
+from .extract import StreamExtractor
+from .http_cache import HTTPCache
+from .page_store import PageStore, passage
+from .parse_pool import ParsePool
+from .search import SearchRunner
+from .transport import DEFAULT_TIMEOUT, ResilientTransport
+
+
+def _format_page(url: str, extracted: Dict[str, Any], extract_links: bool = False) -> str:
+    """Tool output for one extracted page"""
+    kind = extracted["kind"]
+    if kind == "raw_html":
+        return (f"[WARN] lxml not installed. Raw HTML preview:\n\n{extracted['text']}\n\n"
+                f"Install: pip install lxml")
+    if kind == "text":
+        return f"[OK] Fetched: {url}\n\n{extracted['text'][:10000]}" + _truncation_note(extracted)
+    if kind == "unsupported":
+        return f"[WARN] Unsupported content type: {extracted['content_type']}"
+
+    clean_text = extracted["text"]
+    output = f"[OK] Fetched: {url}\n\n"
+    output += f"**Title:** {extracted['title']}\n\n"
+    output += f"**Content:** ({len(clean_text)} chars)\n\n"
+    output += f"{clean_text[:8000]}\n"  # Limit to 8k chars
+
+    if len(clean_text) > 8000:
+        output += f"\n... (truncated, {len(clean_text) - 8000} more chars)"
+        output += _page_note(extracted)
+
+    if extract_links and extracted["links"]:
+        output += f"\n\n**Links found:** {len(extracted['links'])}\n"
+        for link in extracted["links"][:10]:
+            output += f"- [{link['text']}]({link['url']})\n"
+
+    return output + _truncation_note(extracted)
+
+
+def _page_note(extracted: Dict[str, Any]) -> str:
+    """Where to continue reading a stored page"""
+    if "page_id" not in extracted:
+        return ""
+    return (f"\n[TIP] Full text stored as page {extracted['page_id']} ({extracted['chunks']} chunk(s)); "
+            f"continue with read_page")
+
+
+def _truncation_note(extracted: Dict[str, Any]) -> str:
+    if not extracted.get("truncated"):
+        return ""
+    return "\n\n[INFO] Page exceeds the download limit; only its beginning was read"
+
+
+# fetch_urls accepts at most this many URLs per call
+MAX_FETCH_URLS = 20
+# crawl_site limits per call
+MAX_CRAWL_PAGES = 100
+MAX_CRAWL_DEPTH = 5
 
 
 class ResearchTools:
-    def __init__(self, memory_manager, session_id=None):
+    def __init__(self, memory_manager, session_id=None, cache: Optional[HTTPCache] = None,
+                 max_concurrency: int = 8, per_host_concurrency: int = 2,
+                 search: Optional[SearchRunner] = None, max_page_bytes: int = 2 * 1024 * 1024,
+                 parse_workers: int = 0, pages: Optional[PageStore] = None, crawl_delay: float = 0.5,
+                 parse_pool: Optional[ParsePool] = None,
+                 http_transport: Optional[httpx.AsyncBaseTransport] = None):
         self.memory = memory_manager
         self.session_id = session_id
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # Rate limits, retries and circuit breakers per host; split connect/read timeouts.
+        # http_transport replaces the network underneath (tests pass an httpx.MockTransport)
+        self.transport = ResilientTransport(http_transport)
+        self.client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, transport=self.transport)
+        self.cache = cache or HTTPCache()
+        # Full extracted text, chunked, for read_page
+        self.pages = pages or PageStore(memory_manager.db_path)
+        # crawl_site: robots.txt rules shared across crawls, minimum seconds between requests to a host
+        self.robots = RobotsCache()
+        self.crawl_delay = crawl_delay
+        self.search = search or SearchRunner()
+        # Downloads stop after this many body bytes
+        self.max_page_bytes = max_page_bytes
+        # Large pages are parsed in worker processes: a shared pool (see
+        # parse_pool.shared_pool), or a private one when parse_workers > 0
+        self._owns_parse_pool = parse_pool is None
+        self.parse_pool = parse_pool or ParsePool(parse_workers)
+        self.parse_pool.warm()
+        # Outbound request limits shared by every fetch
+        self.per_host_concurrency = per_host_concurrency
+        self._fetch_slots = asyncio.Semaphore(max_concurrency)
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
 
     def get_tools(self):
         """Return list of research tools"""
         return [
             self._web_search_tool(),
             self._fetch_url_tool(),
+            self._fetch_urls_tool(),
+            self._read_page_tool(),
+            self._search_fetched_tool(),
+            self._crawl_site_tool(),
             self._analyze_research_tool()
         ]
 
@@ -52,7 +126,7 @@ class ResearchTools:
             query = args["query"]
             max_results = args.get("max_results", 5)
 
-            if not DDGS_AVAILABLE:
+            if not self.search.available:
                 return {
                     "content": [{
                         "type": "text",
@@ -63,12 +137,10 @@ class ResearchTools:
                 }
 
             try:
-                # Perform search - using synchronous DDGS
+                # DDGS is synchronous; the runner keeps it off the event loop
                 results = []
-                ddgs = DDGS()
-                search_results = ddgs.text(query, max_results=max_results)
+                search_results = await self.search.search(query, max_results)
 
-                # Convert generator to list
                 for r in search_results:
                     results.append({
                         "title": r.get("title", "No title"),
@@ -100,6 +172,15 @@ class ResearchTools:
                     }]
                 }
 
+            except asyncio.TimeoutError:
+                return {
+                    "content": [{
+                        "type": "text",
+                        "text": f"[ERROR] Search timed out after {self.search.timeout:g}s\n\n"
+                               f"Query: {query}"
+                    }]
+                }
+
             except Exception as e:
                 return {
                     "content": [{
@@ -111,6 +192,82 @@ class ResearchTools:
 
         return web_search
 
+    @contextlib.asynccontextmanager
+    async def _request_slot(self, url: str):
+        """Hold a per-host slot, then a global one (never idle on a global slot)"""
+        host = urlsplit(url).hostname or ""
+        host_slot = self._host_slots.get(host)
+        if host_slot is None:
+            host_slot = self._host_slots[host] = asyncio.Semaphore(self.per_host_concurrency)
+        async with host_slot:
+            async with self._fetch_slots:
+                yield
+
+    async def _fetch(self, url: str, store: bool = True,
+                     headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Fetch and extract a URL through the HTTP cache
+
+        Fresh cache hits skip both the network and the parser; stale
+        entries are revalidated with a conditional GET. Redirects are
+        followed; the page is stored under the URL it was served from.
+
+        Returns:
+            Extracted page dict (see tools.extract) plus "url" (the final
+            URL after redirects), "from_cache", and "page_id" / "chunks"
+            when the text was stored for read_page (callers passing
+            store=False store pages themselves)
+        """
+        entry = await self.cache.get(url)
+        if entry is not None and entry.is_fresh():
+            return await self._store(url, entry.extracted, from_cache=True, store=store)
+
+        request_headers = {**(headers or {}), **(entry.validators() if entry is not None else {})}
+        async with self._request_slot(url):
+            async with self.client.stream("GET", url, headers=request_headers, follow_redirects=True) as response:
+                if response.status_code == 304 and entry is not None:
+                    await self.cache.revalidated(url, response.headers)
+                    return await self._store(url, entry.extracted, from_cache=True, store=store)
+                response.raise_for_status()
+                final_url = str(response.url)
+
+                content_type = response.headers.get("content-type", "")
+                if "text/html" not in content_type and "text/plain" not in content_type:
+                    # Decided from the headers alone; the body is never downloaded
+                    extracted = {"kind": "unsupported", "content_type": content_type, "url": final_url}
+                    await self.cache.put(url, response.status_code, response.headers, b"", extracted)
+                    return {**extracted, "from_cache": False}
+
+                inline_limit = None
+                if self.parse_pool.enabled:
+                    length = response.headers.get("content-length", "")
+                    # A body known to be large skips the inline parser entirely
+                    known_large = length.isdigit() and self.parse_pool.wants(int(length))
+                    inline_limit = 0 if known_large else self.parse_pool.min_bytes
+                extractor = StreamExtractor(content_type, response.charset_encoding,
+                                            self.max_page_bytes, inline_limit)
+                async for chunk in response.aiter_bytes():
+                    if not extractor.feed(chunk):
+                        break
+
+        body = bytes(extractor.body)
+        if extractor.deferred:
+            extracted = await self.parse_pool.extract(body, content_type, extractor.encoding, extractor.truncated)
+        else:
+            extracted = extractor.close()
+        extracted["url"] = final_url
+        await self.cache.put(url, response.status_code, response.headers, body, extracted)
+        return await self._store(url, extracted, from_cache=False, store=store)
+
+    async def _store(self, url: str, extracted: Dict[str, Any], from_cache: bool,
+                     store: bool = True) -> Dict[str, Any]:
+        """Keep the full text in the page store; adds page_id and chunks"""
+        # Entries cached before final URLs were recorded
+        result = {"url": url, **extracted, "from_cache": from_cache}
+        if store and extracted["kind"] in ("html", "text") and extracted.get("text"):
+            page = await self.pages.put(result["url"], extracted.get("title"), extracted["text"])
+            result.update(page_id=page["page_id"], chunks=page["chunks"])
+        return result
+
     def _fetch_url_tool(self):
         @tool(
             "fetch_url",
@@ -125,112 +282,226 @@ class ResearchTools:
             extract_links = args.get("extract_links", False)
 
             try:
-                response = await self.client.get(url, follow_redirects=True)
-                response.raise_for_status()
+                extracted = await self._fetch(url)
+            except httpx.HTTPError as e:
+                return {
+                    "content": [{
+                        "type": "text",
+                        "text": f"[ERROR] Failed to fetch {url}: {str(e)}"
+                    }]
+                }
 
-                content_type = response.headers.get("content-type", "")
+            return {
+                "content": [{
+                    "type": "text",
+                    "text": _format_page(url, extracted, extract_links)
+                }]
+            }
 
-                # Handle HTML content
-                if "text/html" in content_type:
-                    if not BS4_AVAILABLE:
-                        # Fallback to basic extraction
-                        text = response.text[:10000]
-                        return {
-                            "content": [{
-                                "type": "text",
-                                "text": f"[WARN] BeautifulSoup not installed. Raw HTML preview:\n\n{text}\n\n"
-                                       f"Install: pip install beautifulsoup4 lxml"
-                            }]
-                        }
-
-                    # Parse with BeautifulSoup
-                    soup = BeautifulSoup(response.text, 'lxml')
-
-                    # Extract title
-                    title = soup.find('title')
-                    title_text = title.string if title else "No title"
-
-                    # Remove script and style elements
-                    for script in soup(["script", "style", "nav", "footer", "header"]):
-                        script.decompose()
-
-                    # Extract main content
-                    article = (
-                        soup.find('article') or
-                        soup.find('main') or
-                        soup.find('div', class_='content') or
-                        soup.find('div', id='content') or
-                        soup.body
-                    )
-
-                    if article:
-                        text = article.get_text(separator='\n', strip=True)
-                    else:
-                        text = soup.get_text(separator='\n', strip=True)
-
-                    # Clean up whitespace
-                    lines = [line.strip() for line in text.split('\n') if line.strip()]
-                    clean_text = '\n'.join(lines)
-
-                    output = f"[OK] Fetched: {url}\n\n"
-                    output += f"**Title:** {title_text}\n\n"
-                    output += f"**Content:** ({len(clean_text)} chars)\n\n"
-                    output += f"{clean_text[:8000]}\n"  # Limit to 8k chars
-
-                    if len(clean_text) > 8000:
-                        output += f"\n... (truncated, {len(clean_text) - 8000} more chars)"
-
-                    # Extract links if requested
-                    if extract_links:
-                        links = []
-                        for a in soup.find_all('a', href=True, limit=20):
-                            link_text = a.get_text(strip=True)
-                            if link_text and len(link_text) > 0:
-                                links.append({
-                                    "text": link_text[:100],
-                                    "url": a['href']
-                                })
-
-                        if links:
-                            output += f"\n\n**Links found:** {len(links)}\n"
-                            for link in links[:10]:
-                                output += f"- [{link['text']}]({link['url']})\n"
+        return fetch_url
 
-                    return {
-                        "content": [{
-                            "type": "text",
-                            "text": output
-                        }]
-                    }
+    def _fetch_urls_tool(self):
+        @tool(
+            "fetch_urls",
+            f"Fetch several URLs concurrently (up to {MAX_FETCH_URLS}) and extract clean text from each. "
+            "Prefer this over repeated fetch_url calls when reading multiple sources.",
+            {
+                "urls": list,     # URLs to fetch
+                "max_chars": int  # Characters of text per page (default 4000)
+            }
+        )
+        async def fetch_urls(args: Dict[str, Any]) -> Dict[str, Any]:
+            urls = args.get("urls")
+            if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+                return {
+                    "content": [{
+                        "type": "text",
+                        "text": "[ERROR] urls must be a list of URL strings"
+                    }],
+                    "isError": True
+                }
+            urls = list(dict.fromkeys(urls))[:MAX_FETCH_URLS]
+            max_chars = args.get("max_chars", 4000)
+
+            async def fetch_one(url: str) -> Dict[str, Any]:
+                start = time.perf_counter()
+                try:
+                    extracted = await self._fetch(url)
+                    status = "cached" if extracted["from_cache"] else "ok"
+                    return {"url": url, "status": status, "page": extracted,
+                            "seconds": time.perf_counter() - start}
+                except Exception as e:
+                    # One bad URL (invalid, store locked, ...) must not fail the batch
+                    return {"url": url, "status": "error", "error": str(e) or type(e).__name__,
+                            "seconds": time.perf_counter() - start}
+
+            start = time.perf_counter()
+            results = await asyncio.gather(*(fetch_one(url) for url in urls))
+            elapsed = time.perf_counter() - start
+
+            ok = sum(1 for r in results if r["status"] != "error")
+            output = f"[OK] Fetched {ok}/{len(results)} URL(s) in {elapsed:.2f}s\n\n"
+            for i, r in enumerate(results, 1):
+                output += f"### {i}. {r['url']}\n"
+                output += f"Status: {r['status']} ({r['seconds']:.2f}s)\n\n"
+                if r["status"] == "error":
+                    output += f"[ERROR] {r['error']}\n\n"
+                    continue
+                page = r["page"]
+                text = page.get("text", "")
+                if page.get("title"):
+                    output += f"**Title:** {page['title']}\n\n"
+                if page["kind"] == "unsupported":
+                    output += f"[WARN] Unsupported content type: {page['content_type']}\n\n"
+                    continue
+                output += f"{text[:max_chars]}\n"
+                if len(text) > max_chars:
+                    output += f"... (truncated, {len(text) - max_chars} more chars)"
+                    output += f"{_page_note(page)}\n"
+                output += "\n"
 
-                # Handle plain text
-                elif "text/plain" in content_type:
-                    text = response.text[:10000]
-                    return {
-                        "content": [{
-                            "type": "text",
-                            "text": f"[OK] Fetched: {url}\n\n{text}"
-                        }]
-                    }
+            return {
+                "content": [{
+                    "type": "text",
+                    "text": output
+                }],
+                "isError": ok == 0 and bool(results)
+            }
+
+        return fetch_urls
 
-                # Unsupported content type
-                else:
+    def _read_page_tool(self):
+        @tool(
+            "read_page",
+            "Read a page fetched earlier without fetching it again. Returns chunk N of the stored text, "
+            "or the chunks matching a query. Use the page number shown by fetch_url / fetch_urls, or the URL.",
+            {
+                "page": str,   # Page number or URL
+                "chunk": int,  # Chunk number, starting at 1 (default 1)
+                "query": str   # Return the chunks that best match these words instead
+            }
+        )
+        async def read_page(args: Dict[str, Any]) -> Dict[str, Any]:
+            handle = str(args["page"])
+            page = await self.pages.get_page(handle)
+            if page is None:
+                return {
+                    "content": [{
+                        "type": "text",
+                        "text": f"[ERROR] No stored page: {handle}\n\nFetch it first with fetch_url"
+                    }],
+                    "isError": True
+                }
+
+            header = f"**{page['title'] or 'No title'}** ({page['url']})\n"
+            query = args.get("query")
+            if query:
+                matches = await self.pages.find_chunks(page["page_id"], query)
+                if not matches:
                     return {
                         "content": [{
                             "type": "text",
-                            "text": f"[WARN] Unsupported content type: {content_type}"
+                            "text": f"[INFO] No chunk of page {page['page_id']} mentions: {query}"
                         }]
                     }
+                output = f"[OK] {len(matches)} chunk(s) of page {page['page_id']} matching: {query}\n{header}\n"
+                for match in matches:
+                    output += f"### Chunk {match['chunk_no']} of {page['chunks']}\n\n{match['text']}\n\n"
+                return {"content": [{"type": "text", "text": output}]}
+
+            chunk_no = args.get("chunk", 1)
+            text = await self.pages.read_chunk(page["page_id"], chunk_no)
+            if text is None:
+                return {
+                    "content": [{
+                        "type": "text",
+                        "text": f"[ERROR] Page {page['page_id']} has chunks 1-{page['chunks']}, not {chunk_no}"
+                    }],
+                    "isError": True
+                }
 
-            except httpx.HTTPError as e:
+            output = f"[OK] Page {page['page_id']}, chunk {chunk_no} of {page['chunks']}\n{header}\n{text}\n"
+            if chunk_no < page["chunks"]:
+                output += f"\n[TIP] Next: read_page page={page['page_id']} chunk={chunk_no + 1}"
+            return {"content": [{"type": "text", "text": output}]}
+
+        return read_page
+
+    def _search_fetched_tool(self):
+        @tool(
+            "search_fetched",
+            "Search the text of every page fetched so far (BM25 ranking, works offline). "
+            "Try this before web_search when the topic was researched before.",
+            {
+                "query": str,
+                "max_results": int  # Passages to return (default 5)
+            }
+        )
+        async def search_fetched(args: Dict[str, Any]) -> Dict[str, Any]:
+            query = args["query"]
+            max_results = args.get("max_results", 5)
+
+            start = time.perf_counter()
+            matches = await self.pages.search(query, max_results)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            if not matches:
                 return {
                     "content": [{
                         "type": "text",
-                        "text": f"[ERROR] Failed to fetch {url}: {str(e)}"
+                        "text": f"[INFO] No fetched page matches: {query}\n\n"
+                               f"[TIP] Use web_search to find new sources"
                     }]
                 }
 
-        return fetch_url
+            pages = len({m["page_id"] for m in matches})
+            output = (f"[OK] {len(matches)} passage(s) from {pages} fetched page(s) for: {query} "
+                      f"({elapsed_ms:.0f} ms)\n\n")
+            for i, m in enumerate(matches, 1):
+                output += f"**{i}. {m['title'] or 'No title'}** (page {m['page_id']}, chunk {m['chunk_no']})\n"
+                output += f"   URL: {m['url']}\n"
+                output += f"   {passage(m['text'], query)}\n\n"
+
+            output += "[TIP] Use read_page with the page and chunk numbers for the full text"
+            return {"content": [{"type": "text", "text": output}]}
+
+        return search_fetched
+
+    def _crawl_site_tool(self):
+        @tool(
+            "crawl_site",
+            f"Crawl a website breadth-first from a start URL (same host only, up to {MAX_CRAWL_PAGES} pages) "
+            "and store every page for search_fetched / read_page. Respects robots.txt. "
+            "Use for documentation sites instead of many fetch_url calls.",
+            {
+                "url": str,          # Start URL
+                "max_pages": int,    # Pages to store (default 20)
+                "max_depth": int,    # Link hops from the start URL (default 2)
+                "path_prefix": str   # Only follow links under this path, e.g. /docs/
+            }
+        )
+        async def crawl_site(args: Dict[str, Any]) -> Dict[str, Any]:
+            url = args["url"]
+            crawler = SiteCrawler(
+                self,
+                max_pages=max(1, min(args.get("max_pages", 20), MAX_CRAWL_PAGES)),
+                max_depth=max(0, min(args.get("max_depth", 2), MAX_CRAWL_DEPTH)),
+                delay=self.crawl_delay,
+                path_prefix=args.get("path_prefix", ""),
+            )
+            report = await crawler.crawl(url)
+            if not report.pages:
+                reason = report.errors[0][1] if report.errors else "nothing crawlable (robots.txt or content type)"
+                return {
+                    "content": [{
+                        "type": "text",
+                        "text": f"[ERROR] Crawl of {url} stored no pages: {reason}"
+                    }],
+                    "isError": True
+                }
+            return {"content": [{"type": "text", "text": format_report(report)}]}
+
+        return crawl_site
 
     def _analyze_research_tool(self):
         @tool(
@@ -289,3 +560,6 @@ class ResearchTools:
     async def close(self):
         """Clean up resources"""
         await self.client.aclose()
+        self.search.close()
+        if self._owns_parse_pool:
+            await self.parse_pool.close()
@@ -0,0 +1,114 @@
+# ABOUTME: Non-blocking DuckDuckGo search runner
+# ABOUTME: Thread pool with per-thread DDGS clients, TTL result cache and in-flight request coalescing
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from ddgs import DDGS
+    DDGS_AVAILABLE = True
+except ImportError:
+    try:
+        # Fallback to old package name
+        from duckduckgo_search import DDGS
+        DDGS_AVAILABLE = True
+    except ImportError:
+        DDGS_AVAILABLE = False
+
+SearchFn = Callable[[str, int], List[Dict[str, Any]]]
+_Key = Tuple[str, int]
+
+
+class SearchRunner:
+    """Run blocking searches off the event loop
+
+    Searches run on a small thread pool; each worker thread keeps its own
+    DDGS client. Results are cached for `ttl` seconds per (query,
+    max_results), and concurrent identical searches share one upstream call.
+    """
+
+    def __init__(self, search_fn: Optional[SearchFn] = None, max_workers: int = 4,
+                 timeout: float = 20.0, ttl: float = 900.0, max_entries: int = 256):
+        self.search_fn = search_fn or self._ddgs_search
+        self.available = search_fn is not None or DDGS_AVAILABLE
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.upstream_calls = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="web-search")
+        self._local = threading.local()
+        self._cache: "OrderedDict[_Key, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._inflight: Dict[_Key, asyncio.Task] = {}
+
+    def _ddgs_search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """Runs on a worker thread; DDGS clients are reused per thread"""
+        ddgs = getattr(self._local, "ddgs", None)
+        if ddgs is None:
+            ddgs = self._local.ddgs = DDGS()
+        return list(ddgs.text(query, max_results=max_results) or [])
+
+    @staticmethod
+    def _key(query: str, max_results: int) -> _Key:
+        return (" ".join(query.lower().split()), max_results)
+
+    def _cached(self, key: _Key) -> Optional[List[Dict[str, Any]]]:
+        hit = self._cache.get(key)
+        if hit is None:
+            return None
+        expires_at, results = hit
+        if time.monotonic() >= expires_at:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return results
+
+    async def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """Raw result dicts (title, href, body) for a query
+
+        Raises:
+            asyncio.TimeoutError: the search took longer than `timeout`
+        """
+        key = self._key(query, max_results)
+        results = self._cached(key)
+        if results is not None:
+            return results
+
+        task = self._inflight.get(key)
+        if task is None:
+            # No caller owns the upstream call: cancelling one waiter leaves it
+            # running for the others, and the result is cached either way
+            task = asyncio.create_task(self._upstream(key, query, max_results))
+            task.add_done_callback(_retrieve)
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _upstream(self, key: _Key, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """One upstream search, shared by every caller waiting on `key`"""
+        loop = asyncio.get_running_loop()
+        try:
+            self.upstream_calls += 1
+            results = await asyncio.wait_for(
+                loop.run_in_executor(self._executor, self.search_fn, query, max_results),
+                timeout=self.timeout
+            )
+        finally:
+            self._inflight.pop(key, None)
+
+        self._cache[key] = (time.monotonic() + self.ttl, results)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return results
+
+    def close(self):
+        # A timed-out search cannot be interrupted; do not wait for it
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _retrieve(task: asyncio.Task):
+    """Mark a failure retrieved when every waiter has already gone"""
+    if not task.cancelled():
+        task.exception()
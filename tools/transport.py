@@ -0,0 +1,244 @@
+# ABOUTME: Resilient outbound HTTP transport for the research tools
+# ABOUTME: Per-host token buckets, retries with jittered backoff, circuit breakers and traced metrics
+
+import asyncio
+import random
+import time
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import httpx
+
+from agent.tracing import tracer
+
+# A slow host fails fast on connect; reads may stall at most this long per chunk
+DEFAULT_TIMEOUT = httpx.Timeout(connect=5.0, read=15.0, write=10.0, pool=10.0)
+
+RETRY_STATUSES = frozenset((429, 502, 503, 504))
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+# Connection-level failures worth another attempt
+RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadTimeout,
+                httpx.ReadError, httpx.RemoteProtocolError, httpx.PoolTimeout)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without contacting a host whose circuit is open"""
+
+
+class TokenBucket:
+    """`rate` requests per second with bursts of up to `burst`"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take a token, waiting if needed; returns seconds waited"""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures, for `cooldown` seconds
+
+    Once the cooldown passes one trial request is let through (half-open);
+    a success closes the circuit, anything else (failure, 429, other
+    exception, cancellation) opens it for another cooldown.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self._opened_at >= self.cooldown:
+            self.state = "half_open"
+            return True
+        # Open, or half-open with the trial request still in flight
+        return False
+
+    def retry_in(self) -> float:
+        return max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+
+    def success(self):
+        self.state = "closed"
+        self.failures = 0
+
+    def failure(self) -> bool:
+        """Record a failure; returns True when this opened the circuit"""
+        self.failures += 1
+        if self.state == "half_open" or (self.state == "closed" and self.failures >= self.threshold):
+            self.reopen()
+            return True
+        return False
+
+    def reopen(self):
+        """Open for another cooldown, e.g. after a trial that did not succeed"""
+        self.state = "open"
+        self._opened_at = time.monotonic()
+
+
+@dataclass
+class HostMetrics:
+    requests: int = 0
+    attempts: int = 0
+    retries: int = 0
+    failures: int = 0
+    rejected: int = 0
+    circuit_opens: int = 0
+    throttled_ms: float = 0.0
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """Wrap a transport with per-host rate limits, retries and circuit breakers
+
+    Every request waits for a token from its host's bucket. Idempotent
+    requests are retried on connection errors and on 429/502/503/504,
+    sleeping a random time up to base_backoff * 2**attempt (capped at
+    max_backoff, and at least any Retry-After). Failures count towards
+    the host's circuit breaker; while it is open, requests fail at once
+    with CircuitOpenError. Each request records an "http.<host>" span.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None, rate: float = 5.0,
+                 burst: int = 10, max_retries: int = 3, base_backoff: float = 0.5,
+                 max_backoff: float = 10.0, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.metrics: Dict[str, HostMetrics] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.cooldown)
+        return breaker
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        delay = random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        stats = self.metrics.setdefault(host, HostMetrics())
+        breaker = self.breaker(host)
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+
+        stats.requests += 1
+        if not breaker.allow():
+            stats.rejected += 1
+            tracer.record(f"http.{host}", "http", 0.0, error="circuit_open")
+            raise CircuitOpenError(
+                f"Circuit open for {host} after {breaker.failures} failures; "
+                f"retry in {breaker.retry_in():.0f}s", request=request
+            )
+
+        trial = breaker.state == "half_open"
+        try:
+            return await self._attempts(request, host, stats, breaker, bucket)
+        finally:
+            # A trial that ended without success() or failure() must not leave
+            # the circuit half-open, where allow() refuses every later request
+            if trial and breaker.state == "half_open":
+                breaker.reopen()
+                stats.circuit_opens += 1
+
+    async def _attempts(self, request: httpx.Request, host: str, stats: HostMetrics,
+                        breaker: CircuitBreaker, bucket: TokenBucket) -> httpx.Response:
+        retries = self.max_retries if request.method in IDEMPOTENT_METHODS else 0
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            throttled = await bucket.acquire()
+            stats.throttled_ms += throttled * 1000
+            stats.attempts += 1
+            try:
+                response = await self.transport.handle_async_request(request)
+            except RETRY_ERRORS as e:
+                stats.failures += 1
+                if breaker.failure():
+                    stats.circuit_opens += 1
+                if attempt >= retries or breaker.state == "open":
+                    self._trace(host, start, attempt, error=type(e).__name__)
+                    raise
+                delay = self._backoff(attempt, None)
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    if response.status_code >= 500:
+                        stats.failures += 1
+                        if breaker.failure():
+                            stats.circuit_opens += 1
+                    else:
+                        breaker.success()
+                    self._trace(host, start, attempt, status=response.status_code)
+                    return response
+                # 429 is the host pacing us, not failing, except on a half-open trial
+                if response.status_code != 429 or breaker.state == "half_open":
+                    stats.failures += 1
+                    if breaker.failure():
+                        stats.circuit_opens += 1
+                if attempt >= retries or breaker.state == "open":
+                    self._trace(host, start, attempt, status=response.status_code)
+                    return response
+                delay = self._backoff(attempt, _retry_after(response))
+                await response.aclose()
+
+            attempt += 1
+            stats.retries += 1
+            await asyncio.sleep(delay)
+
+    def _trace(self, host: str, start: float, retries: int, **attributes):
+        tracer.record(f"http.{host}", "http", (time.perf_counter() - start) * 1000,
+                      retries=retries, **attributes)
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """Per-host counters plus circuit state"""
+        return {
+            host: {**asdict(stats), "circuit": self.breaker(host).state}
+            for host, stats in self.metrics.items()
+        }
+
+    async def aclose(self):
+        await self.transport.aclose()